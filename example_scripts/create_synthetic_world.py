@@ -0,0 +1,27 @@
+import sys
+import time
+
+from june.hdf5_savers import save_world_to_hdf5
+from june.synthetic_world import SyntheticWorldGenerator
+
+if len(sys.argv) > 1:
+    n_people = int(float(sys.argv[1]))
+else:
+    n_people = 100000
+
+t1 = time.time()
+
+generator = SyntheticWorldGenerator.from_file()
+world = generator.generate(n_people=n_people, seed=0)
+
+t2 = time.time()
+print(f"Took {t2 - t1} seconds to generate a world of {n_people} people.")
+
+# save the world to hdf5, with the files needed to split it in domains
+save_world_to_hdf5(world, "synthetic_world.hdf5")
+generator.save_domain_decomposition_inputs(
+    world,
+    centroids_path="synthetic_super_area_centroids.csv",
+    adjacency_graph_path="synthetic_super_area_adjacency_graph.json",
+)
+print(f"Took {time.time() - t2} seconds to save it.")
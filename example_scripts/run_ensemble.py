@@ -0,0 +1,72 @@
+import sys
+
+from june.hdf5_savers import generate_world_from_hdf5
+from june.interaction import Interaction
+from june.epidemiology.infection import (
+    InfectionSelector,
+    InfectionSelectors,
+    HealthIndexGenerator,
+    ImmunitySetter,
+    Covid19,
+)
+from june.groups.travel import Travel
+from june.groups.leisure import generate_leisure_for_config
+from june.simulator import Simulator
+from june.epidemiology.epidemiology import Epidemiology
+from june.epidemiology.infection_seed import InfectionSeed, InfectionSeeds
+from june.policy import Policies
+from june.event import Events
+from june.ensemble import EnsembleRunner
+
+world_file = "./tests.hdf5"
+config_path = "./config_simulation.yaml"
+
+if len(sys.argv) > 1:
+    n_runs = int(sys.argv[1])
+else:
+    n_runs = 10
+
+
+def generate_simulator(world, record):
+    leisure = generate_leisure_for_config(world, config_path)
+    health_index_generator = HealthIndexGenerator.from_file()
+    selector = InfectionSelector(
+        infection_class=Covid19, health_index_generator=health_index_generator
+    )
+    infection_seed = InfectionSeed.from_uniform_cases(
+        world=world,
+        infection_selector=selector,
+        cases_per_capita=0.001,
+        seed_strength=10,
+        date="2020-02-28",
+    )
+    epidemiology = Epidemiology(
+        infection_selectors=InfectionSelectors([selector]),
+        infection_seeds=InfectionSeeds([infection_seed]),
+        immunity_setter=ImmunitySetter(),
+    )
+    interaction = Interaction.from_file(config_filename="./config_interaction.yaml")
+    return Simulator.from_file(
+        world=world,
+        policies=Policies.from_file(),
+        events=Events.from_file(),
+        interaction=interaction,
+        leisure=leisure,
+        travel=Travel(),
+        epidemiology=epidemiology,
+        config_filename=config_path,
+        record=record,
+    )
+
+
+if __name__ == "__main__":
+    # the world is loaded once and shared by all the runs
+    world = generate_world_from_hdf5(world_file)
+    runner = EnsembleRunner(
+        world=world, simulator_factory=generate_simulator, record_path="results"
+    )
+    results = runner.run(seeds=list(range(n_runs)))
+    print(
+        f"{results['n_runs']} runs in {results['wall_time']:.1f} seconds, "
+        f"{results['runs_per_hour']:.1f} runs per hour"
+    )
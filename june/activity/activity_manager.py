@@ -25,6 +25,7 @@ from june.mpi_setup import (
     mpi_rank,
     MovablePeople,
 )
+from june.utils.tracing import tracer
 
 logger = logging.getLogger("activity_manager")
 mpi_logger = logging.getLogger("mpi")
@@ -194,7 +195,18 @@ class ActivityManager:
     def get_personal_subgroup(self, person: "Person", activity: str):
         return getattr(person, activity)
 
-    def do_timestep(self):
+    def do_timestep(self, non_blocking: bool = False):
+        """
+        Moves people to their subgroups and exchanges the people going to or coming
+        from other domains.
+
+        Parameters
+        ----------
+        non_blocking
+            if True, the exchange of people is only started, and the returned
+            people from abroad is a ``PendingPeopleExchange`` that needs to be
+            waited on before using the visitors' data.
+        """
         # get time data
         tick_interaction_timestep = perf_counter()
         date = self.timer.date
@@ -211,15 +223,26 @@ class ActivityManager:
                 working_hours="primary_activity" in activities,
             )
         # move people to subgroups and get going abroad people
-        to_send_abroad = self.move_people_to_active_subgroups(
-            activities=activities, date=date, days_from_start=self.timer.now
-        )
+        with tracer.span("move_people"):
+            to_send_abroad = self.move_people_to_active_subgroups(
+                activities=activities, date=date, days_from_start=self.timer.now
+            )
         tock_interaction_timestep = perf_counter()
         rank_logger.info(
             f"Rank {mpi_rank} -- move_people -- {tock_interaction_timestep-tick_interaction_timestep}"
         )
+        if non_blocking:
+            with tracer.span("people_comms", category="mpi"):
+                people_exchange = to_send_abroad.start_exchange()
+            return (
+                people_exchange,
+                people_exchange.n_people_from_abroad,
+                people_exchange.n_people_going_abroad,
+                to_send_abroad,
+            )
         tick_waiting = perf_counter()
-        mpi_comm.Barrier()
+        with tracer.span("move_people_waiting", category="mpi"):
+            mpi_comm.Barrier()
         tock_waiting = perf_counter()
         rank_logger.info(
             f"Rank {mpi_rank} -- move_people_waiting -- {tock_waiting-tick_waiting}"
@@ -261,7 +284,10 @@ class ActivityManager:
 
         for person in self.world.people:
             self.policies.vaccine_distribution.apply(
-                person=person, date=date, active_policies=active_vaccine_policies
+                person=person,
+                date=date,
+                active_policies=active_vaccine_policies,
+                people=self.world.people,
             )
             if person.dead or person.busy:
                 continue
@@ -323,39 +349,9 @@ class ActivityManager:
         """
         Deal with the MPI comms.
         """
-        n_people_going_abroad = 0
-        n_people_from_abroad = 0
         tick, tickw = perf_counter(), wall_clock()
-        reqs = []
-
-        for rank in range(mpi_size):
-
-            if mpi_rank == rank:
-                continue
-            keys, data, n_this_rank = movable_people.serialise(rank)
-            if n_this_rank:
-                reqs.append(mpi_comm.isend(keys, dest=rank, tag=100))
-                reqs.append(mpi_comm.isend(data, dest=rank, tag=200))
-                n_people_going_abroad += n_this_rank
-            else:
-                reqs.append(mpi_comm.isend(None, dest=rank, tag=100))
-                reqs.append(mpi_comm.isend(None, dest=rank, tag=200))
-
-        # now it has all been sent, we can start the receiving.
-
-        for rank in range(mpi_size):
-
-            if rank == mpi_rank:
-                continue
-            keys = mpi_comm.recv(source=rank, tag=100)
-            data = mpi_comm.recv(source=rank, tag=200)
-
-            if keys is not None:
-                movable_people.update(rank, keys, data)
-                n_people_from_abroad += data.shape[0]
-
-        for r in reqs:
-            r.wait()
+        with tracer.span("people_comms", category="mpi"):
+            n_people_going_abroad, n_people_from_abroad = movable_people.exchange()
 
         tock, tockw = perf_counter(), wall_clock()
         logger.info(
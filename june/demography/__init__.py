@@ -1,2 +1,3 @@
 from .person import Person, Activities
+from .population_store import PopulationStore
 from .demography import Demography, Population, AgeSexGenerator
@@ -1,3 +1,4 @@
+from collections import defaultdict
 from typing import List, Dict, Optional
 
 import numpy as np
@@ -7,6 +8,7 @@ import yaml
 
 from june import paths
 from june.demography import Person
+from june.demography.population_store import PopulationStore
 from june.geography import Geography
 from june.utils import random_choice_numba
 
@@ -171,6 +173,12 @@ class Population:
             self.people_dict = {person.id: person for person in people}
             self.people_ids = set(self.people_dict.keys())
             self.people = people
+        self.store = None
+        self.infection_table = None
+        self._infected_ids = None
+        self.infected_per_region = None
+        self.infected_per_super_area = None
+        self.changed_ids = None
 
     def __len__(self):
         return len(self.people)
@@ -185,17 +193,28 @@ class Population:
         self.people.extend(population.people)
         self.people_dict = {**self.people_dict, **population.people_dict}
         self.people_ids = set(self.people_dict.keys())
+        for person in population.people:
+            if self.store is not None:
+                self.store.append(person)
+            self._index_infection(person)
         return self
 
     def add(self, person):
         self.people_dict[person.id] = person
         self.people.append(person)
         self.people_ids.add(person.id)
+        if self.store is not None:
+            self.store.append(person)
+        self._index_infection(person)
 
     def remove(self, person):
         del self.people_dict[person.id]
         self.people.remove(person)
         self.people_ids.remove(person.id)
+        if self.store is not None:
+            self.store.delete(person)
+        if self._infected_ids is not None and person.id in self._infected_ids:
+            self._unindex_infection(person)
 
     def extend(self, people):
         for person in people:
@@ -204,6 +223,99 @@ class Population:
     def get_from_id(self, id):
         return self.people_dict[id]
 
+    def build_store(self, infection_ids: Optional[List[int]] = None):
+        """
+        Builds a columnar store of the population state, after which the infected,
+        dead and vaccinated scans are done with boolean masks. State changes must then
+        be reported through ``update_state``.
+
+        Parameters
+        ----------
+        infection_ids
+            ids of the infections to keep a susceptibility column for
+        """
+        self.store = PopulationStore(self.people, infection_ids=infection_ids)
+        self.build_infected_index()
+        return self.store
+
+    def build_infected_index(self):
+        """
+        Builds the index of infected people and the infected counters per region
+        and super area. From then on they are kept up to date by ``update_state``,
+        so that ``infected`` costs O(infected) instead of O(population).
+        """
+        self._infected_ids = {}
+        self.infected_per_region = defaultdict(int)
+        self.infected_per_super_area = defaultdict(int)
+        for person in self.people:
+            self._index_infection(person)
+
+    def _index_infection(self, person):
+        if self._infected_ids is None or not person.infected:
+            return
+        if person.id in self._infected_ids:
+            return
+        self._infected_ids[person.id] = None
+        region, super_area = person.region, person.super_area
+        if region is not None:
+            self.infected_per_region[region.name] += 1
+        if super_area is not None:
+            self.infected_per_super_area[super_area.name] += 1
+
+    def _unindex_infection(self, person):
+        del self._infected_ids[person.id]
+        region, super_area = person.region, person.super_area
+        if region is not None:
+            self.infected_per_region[region.name] -= 1
+        if super_area is not None:
+            self.infected_per_super_area[super_area.name] -= 1
+
+    def update_state(self, person):
+        """
+        Writes the current state (infection, death, vaccination, susceptibility)
+        of a person to the columnar store, the infected index and the infection
+        table, if there are any. Only people of this population are taken into
+        account.
+        """
+        if self.store is not None:
+            self.store.update(person)
+        if self.changed_ids is not None:
+            self.changed_ids.add(person.id)
+        if self.infection_table is not None and person.id in self.people_dict:
+            self.infection_table.update_person(person)
+        if self._infected_ids is not None and person.id in self.people_dict:
+            if person.infected:
+                self._index_infection(person)
+            elif person.id in self._infected_ids:
+                self._unindex_infection(person)
+
+    def track_changes(self):
+        """
+        Starts collecting the ids of the people whose state changes (through
+        ``update_state``), so that a world snapshot can be restored by only
+        resetting them.
+        """
+        self.changed_ids = set()
+
+    def _sorted_infected_ids(self):
+        """
+        Ids of the index of infected people, in the order of the population, so
+        that results do not depend on the order in which people got infected.
+        """
+        if self.store is None:
+            return [person.id for person in self.people if person.infected]
+        row_by_id = self.store.row_by_id
+        return sorted(self._infected_ids, key=row_by_id.__getitem__)
+
+    @property
+    def infected_ids(self):
+        if self._infected_ids is not None:
+            return self._sorted_infected_ids()
+        return [person.id for person in self.people if person.infected]
+
+    def _people_in_mask(self, mask):
+        return [self.people[row] for row in self.store.rows(mask)]
+
     @property
     def members(self):
         return self.people
@@ -214,14 +326,23 @@ class Population:
 
     @property
     def infected(self):
+        if self._infected_ids is not None:
+            return [
+                self.people_dict[person_id]
+                for person_id in self._sorted_infected_ids()
+            ]
         return [person for person in self.people if person.infected]
 
     @property
     def dead(self):
+        if self.store is not None:
+            return self._people_in_mask(self.store.dead)
         return [person for person in self.people if person.dead]
 
     @property
     def vaccinated(self):
+        if self.store is not None:
+            return self._people_in_mask(self.store.vaccinated)
         return [person for person in self.people if person.vaccinated]
 
 class Demography:
@@ -6,6 +6,7 @@ from datetime import datetime
 from typing import Optional
 
 from june.epidemiology.infection import Infection, Immunity
+from june.epoch import Epoch, default_epoch
 
 
 class Activities(dataobject):
@@ -19,6 +20,9 @@ class Activities(dataobject):
     def iter(self):
         return [getattr(self, activity) for activity in self.__fields__]
 
+
+_leisure_index = Activities.__fields__.index("leisure")
+
 person_ids = count()
 
 
@@ -41,8 +45,10 @@ class Person(dataobject):
     comorbidity: str = None
     # commute
     mode_of_transport: "ModeOfTransport" = None
-    # activities
-    busy: bool = False
+    # activities, busy and leisure are only valid during the epoch they were set
+    epoch: Epoch = default_epoch
+    busy_epoch: int = -1
+    leisure_epoch: int = -1
     subgroups: Activities = Activities(None, None, None, None, None, None)
     infection: Infection = None
     immunity: Immunity()
@@ -97,10 +103,35 @@ class Person(dataobject):
     def rail_travel(self):
         return self.subgroups.rail_travel
 
+    @property
+    def busy(self):
+        return self.busy_epoch == self.epoch.value
+
+    @busy.setter
+    def busy(self, value: bool):
+        self.busy_epoch = self.epoch.value if value else -1
+
     @property
     def leisure(self):
+        if self.leisure_epoch != self.epoch.value:
+            return None
         return self.subgroups.leisure
 
+    @leisure.setter
+    def leisure(self, subgroup: "Subgroup"):
+        self.subgroups.leisure = subgroup
+        self.leisure_epoch = self.epoch.value
+
+    def iter_subgroups(self) -> list:
+        """
+        Subgroups of all the activities of the person, as ``Activities.iter``, but
+        without a leisure subgroup set in a past epoch.
+        """
+        subgroups = self.subgroups.iter()
+        if self.leisure_epoch != self.epoch.value:
+            subgroups[_leisure_index] = None
+        return subgroups
+
     @property
     def hospitalised(self):
         try:
@@ -0,0 +1,221 @@
+from typing import List, Optional
+
+import numpy as np
+
+from june.demography import Person
+
+
+def _column(name):
+    def get(self):
+        self._compact()
+        return self._columns[name][: self._n_rows]
+
+    return property(get)
+
+
+class PopulationStore:
+    """
+    Columnar (struct of arrays) view of the state of a population. Row i holds the
+    person at position i of the population list, so boolean masks over the columns
+    can replace attribute walks over millions of ``Person`` objects.
+
+    Static columns (age, sex, area, region) are filled once. Dynamic columns (dead,
+    infected, vaccinated, infection id, transmission probability, susceptibility per
+    infection id) are written through ``update`` whenever the state of a person
+    changes, see ``Population.update_state``.
+
+    Columns have spare capacity that doubles when full, so appending is amortized
+    O(1). Deleting only marks the row, the deleted rows are squeezed out in one
+    pass the next time a column is read.
+
+    Parameters
+    ----------
+    people
+        list of people, in the order of the population
+    infection_ids
+        ids of the infections for which a susceptibility column is kept
+    """
+
+    ids = _column("ids")
+    ages = _column("ages")
+    sexes = _column("sexes")
+    area_ids = _column("area_ids")
+    region_indices = _column("region_indices")
+    dead = _column("dead")
+    infected = _column("infected")
+    vaccinated = _column("vaccinated")
+    infection = _column("infection")
+    transmission_probability = _column("transmission_probability")
+    susceptibility = _column("susceptibility")
+
+    def __init__(self, people: List[Person], infection_ids: Optional[List[int]] = None):
+        self.infection_ids = np.array(sorted(infection_ids or []), dtype=np.int64)
+        self.infection_index = {
+            infection_id: k for k, infection_id in enumerate(self.infection_ids)
+        }
+        self.region_names = []
+        self._region_index = {}
+        self.row_by_id = {}
+        self._columns = self._allocate(len(people))
+        self._deleted = np.zeros(len(people), dtype=bool)
+        self._n_rows = len(people)
+        self._n_deleted = 0
+        for row, person in enumerate(people):
+            self._set_static(row, person)
+            self.update_row(row, person)
+
+    def _allocate(self, n_people):
+        return {
+            "ids": np.zeros(n_people, dtype=np.int64),
+            "ages": np.zeros(n_people, dtype=np.uint8),
+            "sexes": np.zeros(n_people, dtype=np.int8),  # 0 male, 1 female
+            "area_ids": np.full(n_people, -1, dtype=np.int32),
+            "region_indices": np.full(n_people, -1, dtype=np.int16),
+            "dead": np.zeros(n_people, dtype=bool),
+            "infected": np.zeros(n_people, dtype=bool),
+            "vaccinated": np.zeros(n_people, dtype=bool),
+            "infection": np.zeros(n_people, dtype=np.uint32),
+            "transmission_probability": np.zeros(n_people, dtype=np.float32),
+            "susceptibility": np.ones(
+                (n_people, len(self.infection_ids)), dtype=np.float32
+            ),
+        }
+
+    def _grow(self):
+        capacity = max(2 * len(self._deleted), 16)
+        columns = self._allocate(capacity)
+        for name, column in self._columns.items():
+            columns[name][: self._n_rows] = column[: self._n_rows]
+        self._columns = columns
+        deleted = np.zeros(capacity, dtype=bool)
+        deleted[: self._n_rows] = self._deleted[: self._n_rows]
+        self._deleted = deleted
+
+    def _compact(self):
+        """
+        Squeezes out the deleted rows, keeping the order of the others.
+        """
+        if not self._n_deleted:
+            return
+        keep = ~self._deleted[: self._n_rows]
+        n_people = self._n_rows - self._n_deleted
+        for column in self._columns.values():
+            column[:n_people] = column[: self._n_rows][keep]
+        self._deleted[: self._n_rows] = False
+        self._n_rows = n_people
+        self._n_deleted = 0
+        self.row_by_id = {
+            person_id: row
+            for row, person_id in enumerate(self._columns["ids"][:n_people].tolist())
+        }
+
+    def _get_region_index(self, person):
+        region = person.region
+        if region is None:
+            return -1
+        if region.name not in self._region_index:
+            self._region_index[region.name] = len(self.region_names)
+            self.region_names.append(region.name)
+        return self._region_index[region.name]
+
+    def _set_static(self, row, person):
+        columns = self._columns
+        self.row_by_id[person.id] = row
+        columns["ids"][row] = person.id
+        columns["ages"][row] = person.age
+        columns["sexes"][row] = person.sex == "f"
+        if person.area is not None:
+            columns["area_ids"][row] = person.area.id
+        columns["region_indices"][row] = self._get_region_index(person)
+
+    def __len__(self):
+        return self._n_rows - self._n_deleted
+
+    def update_row(self, row: int, person: Person):
+        """
+        Writes the dynamic state of the person into the given row.
+        """
+        columns = self._columns
+        columns["dead"][row] = person.dead
+        columns["vaccinated"][row] = person.vaccinated
+        if person.infection is None:
+            columns["infected"][row] = False
+            columns["infection"][row] = 0
+            columns["transmission_probability"][row] = 0.0
+        else:
+            columns["infected"][row] = True
+            columns["infection"][row] = person.infection.infection_id()
+            columns["transmission_probability"][row] = (
+                person.infection.transmission.probability
+            )
+        susceptibility_dict = person.immunity.susceptibility_dict
+        for infection_id, k in self.infection_index.items():
+            columns["susceptibility"][row, k] = susceptibility_dict.get(
+                infection_id, 1.0
+            )
+
+    def update(self, person: Person):
+        """
+        Writes the dynamic state of the person into their row. People that do not
+        belong to the store are ignored.
+        """
+        row = self.row_by_id.get(person.id)
+        if row is not None:
+            self.update_row(row, person)
+
+    def update_transmission_probabilities(
+        self, people_ids: List[int], probabilities: np.ndarray
+    ):
+        """
+        Writes the transmission probabilities of the given people, eg. after the
+        infection table has updated them.
+        """
+        rows = [self.row_by_id[person_id] for person_id in people_ids]
+        self._columns["transmission_probability"][rows] = probabilities
+
+    def append(self, person: Person):
+        """
+        Adds a row at the end of the store for the given person.
+        """
+        if self._n_rows == len(self._deleted):
+            self._grow()
+        row = self._n_rows
+        self._n_rows += 1
+        self._set_static(row, person)
+        self.update_row(row, person)
+
+    def delete(self, person: Person):
+        """
+        Marks the row of the given person as deleted, it is removed when the
+        columns are next read.
+        """
+        row = self.row_by_id.pop(person.id)
+        self._deleted[row] = True
+        self._n_deleted += 1
+
+    @property
+    def columns(self):
+        self._compact()
+        return {
+            name: column[: self._n_rows] for name, column in self._columns.items()
+        }
+
+    @property
+    def nbytes(self):
+        return sum(column.nbytes for column in self.columns.values())
+
+    def rows(self, mask: np.ndarray) -> np.ndarray:
+        return np.flatnonzero(mask)
+
+    def count_per_region(self, mask: np.ndarray) -> dict:
+        """
+        Counts the people selected by the mask in each region.
+        """
+        region_indices = self.region_indices[mask]
+        counts = np.bincount(
+            region_indices[region_indices >= 0], minlength=len(self.region_names)
+        )
+        return {
+            region_name: int(count)
+            for region_name, count in zip(self.region_names, counts)
+        }
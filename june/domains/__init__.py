@@ -1,2 +1,3 @@
 from .domain import Domain
 from .domain_decomposition import DomainSplitter
+from .load_balancing import SuperAreaCosts, DomainRebalancer
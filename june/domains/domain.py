@@ -3,6 +3,7 @@ from typing import List
 from itertools import count
 
 from june.demography import Population
+from june.epoch import Epoch
 from june.hdf5_savers import generate_domain_from_hdf5
 
 
@@ -24,6 +25,7 @@ class Domain:
         if id is None:
             self.id = next(self._id)
         self.id = id
+        self.epoch = Epoch()
 
     def __iter__(self):
         return iter(self.super_areas)
@@ -34,6 +34,7 @@ class DomainSplitter:
         super_area_centroids_path: str = default_super_area_centroids_path,
         super_area_adjacency_graph_path: str = default_super_area_adjaceny_graph_path,
         weights=default_weights,
+        super_area_scores: dict = None,
     ):
         """
         Parameters
@@ -43,6 +44,9 @@ class DomainSplitter:
         super_area_data
             dictionary specifying the number of people, workers, pupils and commmuters
             per super area
+        super_area_scores
+            dictionary mapping super area name -> score. If given, these scores
+            (eg. measured costs) are used instead of the weighted super area data.
         """
         self.number_of_domains = number_of_domains
         with open(super_area_adjacency_graph_path, "r") as f:
@@ -50,9 +54,17 @@ class DomainSplitter:
         self.super_area_data = super_area_data
         self.super_area_df = pd.read_csv(super_area_centroids_path, index_col=0)
         self.super_area_df = self.super_area_df.loc[super_area_data.keys()]
-        super_area_scores = list(
-            map(lambda x: self.get_score(x, weights=weights), self.super_area_df.index)
-        )
+        if super_area_scores is None:
+            super_area_scores = list(
+                map(
+                    lambda x: self.get_score(x, weights=weights),
+                    self.super_area_df.index,
+                )
+            )
+        else:
+            super_area_scores = [
+                super_area_scores[super_area] for super_area in self.super_area_df.index
+            ]
         self.super_area_df.loc[:, "score"] = super_area_scores
 
     @classmethod
@@ -75,6 +87,28 @@ class DomainSplitter:
         )
         return ds.generate_domain_split(maxiter=maxiter)
 
+    @classmethod
+    def generate_world_split_from_scores(
+        cls,
+        number_of_domains: int,
+        super_area_scores: dict,
+        super_area_centroids_path: str = default_super_area_centroids_path,
+        super_area_adjacency_graph_path: str = default_super_area_adjaceny_graph_path,
+        maxiter=100,
+    ):
+        """
+        Splits the world using the given score of each super area, for instance the
+        interaction cost measured during a run, see ``SuperAreaCosts``.
+        """
+        ds = cls(
+            number_of_domains=number_of_domains,
+            super_area_data=super_area_scores,
+            super_area_centroids_path=super_area_centroids_path,
+            super_area_adjacency_graph_path=super_area_adjacency_graph_path,
+            super_area_scores=super_area_scores,
+        )
+        return ds.generate_domain_split(maxiter=maxiter)
+
     def get_score(self, super_area, weights=default_weights):
         data = self.super_area_data[super_area]
         return (
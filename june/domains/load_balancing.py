@@ -0,0 +1,221 @@
+import logging
+from collections import defaultdict
+from typing import Callable, List, Optional
+
+from june.mpi_setup import mpi_comm, mpi_rank, mpi_size
+from .domain import Domain
+from .domain_decomposition import (
+    DomainSplitter,
+    default_super_area_adjaceny_graph_path,
+    default_super_area_centroids_path,
+)
+
+logger = logging.getLogger("load_balancing")
+
+
+class SuperAreaCosts:
+    """
+    Accumulates the measured interaction time of the super areas of a domain. The
+    time spent on the groups of a supergroup is shared among the super areas of the
+    groups in proportion to their number of people.
+    """
+
+    def __init__(self):
+        self.costs = defaultdict(float)
+        self.super_area_ids = {}
+
+    def add(self, groups: List["Group"], elapsed: float):
+        sizes = defaultdict(int)
+        for group in groups:
+            if group.external:
+                continue
+            try:
+                super_area = group.super_area
+            except AttributeError:
+                continue
+            if super_area is None:
+                continue
+            sizes[super_area] += group.size
+        total = sum(sizes.values())
+        if total == 0:
+            return
+        for super_area, size in sizes.items():
+            self.costs[super_area.name] += elapsed * size / total
+            self.super_area_ids[super_area.name] = super_area.id
+
+    def reset(self):
+        self.costs = defaultdict(float)
+
+    def gather(self, super_areas: List["SuperArea"] = ()):
+        """
+        Sums the costs measured by all ranks.
+
+        Parameters
+        ----------
+        super_areas
+            super areas of this domain, so that super areas that had no interaction
+            still get a score.
+
+        Returns
+        -------
+        costs
+            dictionary super area name -> cost
+        super_area_ids
+            dictionary super area name -> super area id
+        """
+        for super_area in super_areas:
+            self.super_area_ids.setdefault(super_area.name, super_area.id)
+        costs = defaultdict(float)
+        super_area_ids = {}
+        for rank_costs, rank_ids in mpi_comm.allgather(
+            (dict(self.costs), self.super_area_ids)
+        ):
+            for name, cost in rank_costs.items():
+                costs[name] += cost
+            super_area_ids.update(rank_ids)
+        # ScoreClustering needs positive scores
+        min_cost = min((cost for cost in costs.values() if cost > 0), default=1.0)
+        return (
+            {name: costs.get(name) or min_cost for name in super_area_ids},
+            super_area_ids,
+        )
+
+
+class DomainRebalancer:
+    """
+    Moves super areas between ranks at checkpoint dates, so that the measured
+    interaction cost is shared evenly. The state of the simulation is carried over
+    through the checkpoint savers: every rank saves its checkpoint, the domains are
+    split again with ``ScoreClustering`` using the costs measured since the last
+    split, each rank loads its new domain from the world file, and the combined
+    checkpoint is restored on it.
+
+    Parameters
+    ----------
+    world_path
+        path to the world hdf5 file
+    simulator_factory
+        function that builds a simulator for a given domain, with the same
+        configuration as the running one.
+    rebalance_dates
+        checkpoint dates at which to rebalance. If None, rebalance at every
+        checkpoint date.
+    """
+
+    def __init__(
+        self,
+        world_path: str,
+        simulator_factory: Callable[[Domain], "Simulator"],
+        rebalance_dates: Optional[List["datetime.date"]] = None,
+        super_area_centroids_path: str = default_super_area_centroids_path,
+        super_area_adjacency_graph_path: str = default_super_area_adjaceny_graph_path,
+        maxiter: int = 100,
+    ):
+        self.world_path = world_path
+        self.simulator_factory = simulator_factory
+        self.rebalance_dates = rebalance_dates
+        self.super_area_centroids_path = super_area_centroids_path
+        self.super_area_adjacency_graph_path = super_area_adjacency_graph_path
+        self.maxiter = maxiter
+
+    def should_rebalance(self, date: "datetime.date") -> bool:
+        return self.rebalance_dates is None or date in self.rebalance_dates
+
+    def generate_domain_split(self, super_area_costs: SuperAreaCosts, super_areas):
+        """
+        Computes the new super area id -> domain dictionary on rank 0 and broadcasts
+        it to all ranks.
+        """
+        costs, super_area_ids = super_area_costs.gather(super_areas)
+        super_areas_to_domain_dict = None
+        if mpi_rank == 0:
+            super_areas_per_domain, score_per_domain = (
+                DomainSplitter.generate_world_split_from_scores(
+                    number_of_domains=mpi_size,
+                    super_area_scores=costs,
+                    super_area_centroids_path=self.super_area_centroids_path,
+                    super_area_adjacency_graph_path=self.super_area_adjacency_graph_path,
+                    maxiter=self.maxiter,
+                )
+            )
+            logger.info(f"New domain scores {score_per_domain}")
+            super_areas_to_domain_dict = {
+                int(super_area_ids[name]): domain
+                for domain, names in super_areas_per_domain.items()
+                for name in names
+            }
+        return mpi_comm.bcast(super_areas_to_domain_dict, root=0)
+
+    def exchange_vaccine_state(
+        self, simulator: "Simulator", domain: Domain, super_areas_to_domain_dict
+    ):
+        """
+        Sends the vaccine plans of the people of this rank to the ranks that hold
+        them after the split, since the checkpoint does not store them. The
+        vaccinated ids of the vaccine campaigns of the running simulator are
+        updated to the people of the new domain.
+        """
+        policies = simulator.activity_manager.policies
+        campaigns = policies.vaccine_distribution.policies if policies else []
+        campaign_of_person = {
+            person_id: idx
+            for idx, campaign in enumerate(campaigns)
+            for person_id in campaign.vaccinated_ids
+        }
+        to_send = [[] for _ in range(mpi_size)]
+        for person in simulator.world.people:
+            if person.vaccinated:
+                to_send[super_areas_to_domain_dict[person.super_area.id]].append(
+                    (person.id, person.vaccine_plan, campaign_of_person.get(person.id))
+                )
+        for campaign in campaigns:
+            campaign.vaccinated_ids = set()
+        for received in mpi_comm.alltoall(to_send):
+            for person_id, vaccine_plan, campaign_idx in received:
+                person = domain.people.get_from_id(person_id)
+                person.vaccinated = True
+                person.vaccine_plan = vaccine_plan
+                if campaign_idx is not None:
+                    campaigns[campaign_idx].vaccinated_ids.add(person_id)
+                domain.people.update_state(person)
+
+    def rebalance(self, simulator: "Simulator", saving_date) -> "Simulator":
+        """
+        Rebalances the domains after the checkpoint of ``saving_date`` has been
+        saved by all ranks, and returns a simulator built for the new domain of
+        this rank and restored to the checkpoint, whose world the running
+        simulator takes over (see ``Simulator.rebalance``).
+        """
+        from june.hdf5_savers.checkpoint_saver import (
+            combine_checkpoints_for_ranks,
+            restore_simulator_to_checkpoint,
+        )
+
+        super_areas_to_domain_dict = self.generate_domain_split(
+            simulator.super_area_costs, simulator.world.super_areas
+        )
+        checkpoint_root = str(
+            simulator.checkpoint_save_path / f"checkpoint_{saving_date}"
+        )
+        if mpi_size > 1:
+            mpi_comm.Barrier()
+            if mpi_rank == 0:
+                combine_checkpoints_for_ranks(checkpoint_root)
+            mpi_comm.Barrier()
+        domain = Domain.from_hdf5(
+            domain_id=mpi_rank,
+            super_areas_to_domain_dict=super_areas_to_domain_dict,
+            hdf5_file_path=self.world_path,
+        )
+        new_simulator = self.simulator_factory(domain)
+        restore_simulator_to_checkpoint(
+            simulator=new_simulator,
+            world=domain,
+            checkpoint_path=checkpoint_root + ".hdf5",
+        )
+        self.exchange_vaccine_state(simulator, domain, super_areas_to_domain_dict)
+        logger.info(
+            f"Rank {mpi_rank} now has {len(domain.super_areas)} super areas "
+            f"and {len(domain.people)} people"
+        )
+        return new_simulator
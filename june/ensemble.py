@@ -0,0 +1,268 @@
+import gc
+import datetime
+import logging
+import random
+import multiprocessing as mp
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, List, Optional, Union
+
+import numba as nb
+import numpy as np
+
+from june.exc import SimulatorError
+from june.mpi_setup import mpi_size
+from june.records import Record
+from june.utils.random_streams import set_run_seed
+
+logger = logging.getLogger("ensemble")
+
+# the runner is stored here before forking, so that the children inherit it (and
+# the world it holds) instead of receiving a pickled copy.
+_forked_runner = None
+
+
+@nb.njit(cache=True)
+def _set_seed_numba(seed):
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+def set_random_seed(seed: int):
+    """
+    Sets the seeds of numpy, random, numba's numpy and random, and of the random
+    streams (see ``june.utils.random_streams.set_run_seed``).
+    """
+    np.random.seed(seed)
+    random.seed(seed)
+    _set_seed_numba(seed)
+    set_run_seed(seed)
+
+
+def _run_forked(arg):
+    return _forked_runner.run_forked(arg)
+
+
+def _fork_map(runner, args: list, n_processes: int) -> dict:
+    """
+    Calls ``runner.run_forked`` for each argument in a fresh child process forked
+    from this one, ``n_processes`` at a time. Each call returns a (key, value)
+    pair.
+    """
+    global _forked_runner
+    if mpi_size > 1:
+        raise SimulatorError("Forked runs can't be used with MPI.")
+    _forked_runner = runner
+    # keep the garbage collector from touching (and so copying) the world pages
+    gc.collect()
+    gc.freeze()
+    try:
+        context = mp.get_context("fork")
+        with context.Pool(n_processes, maxtasksperchild=1) as pool:
+            return dict(pool.imap_unordered(_run_forked, args))
+    finally:
+        gc.unfreeze()
+        _forked_runner = None
+
+
+class EnsembleRunner:
+    """
+    Runs many stochastic realizations of a simulation on the same world, which is
+    only loaded once. Each realization runs in a child process forked from the
+    parent, so the static world data is shared copy-on-write, while every child has
+    its own seed, ``Record`` and ``Simulator``. A fresh child is forked for every
+    realization, so each one starts from the pristine world.
+
+    Parameters
+    ----------
+    world
+        loaded world (or domain), shared by all the realizations
+    simulator_factory
+        function that takes the world and a record and returns a simulator
+    record_path
+        each realization records to ``record_path / run_{seed}``
+    n_processes
+        number of realizations to run at the same time, by default the number of
+        cpus.
+    """
+
+    def __init__(
+        self,
+        world: "World",
+        simulator_factory: Callable[["World", Record], "Simulator"],
+        record_path: str = "results",
+        n_processes: Optional[int] = None,
+        record_static_data: bool = False,
+    ):
+        self.world = world
+        self.simulator_factory = simulator_factory
+        self.record_path = Path(record_path)
+        self.n_processes = n_processes or mp.cpu_count()
+        self.record_static_data = record_static_data
+
+    def run_forked(self, seed: int):
+        """
+        Runs one realization with the given seed, in the current process.
+
+        Returns
+        -------
+        seed, time it took in seconds
+        """
+        tick = perf_counter()
+        set_random_seed(seed)
+        record = Record(
+            record_path=self.record_path / f"run_{seed:03d}",
+            record_static_data=self.record_static_data,
+        )
+        simulator = self.simulator_factory(self.world, record)
+        simulator.run()
+        return seed, perf_counter() - tick
+
+    def run(self, seeds: List[int]) -> dict:
+        """
+        Runs one realization per seed, forking ``n_processes`` children at a time.
+
+        Returns
+        -------
+        dictionary with the number of runs, the run time of each seed, the total
+        wall time and the throughput in runs per hour.
+        """
+        tick = perf_counter()
+        run_times = _fork_map(self, seeds, self.n_processes)
+        wall_time = perf_counter() - tick
+        runs_per_hour = 3600 * len(seeds) / wall_time
+        logger.info(
+            f"Ran {len(seeds)} realizations in {wall_time:.1f} seconds, "
+            f"{runs_per_hour:.1f} runs per hour"
+        )
+        return {
+            "n_runs": len(seeds),
+            "run_times": run_times,
+            "wall_time": wall_time,
+            "runs_per_hour": runs_per_hour,
+        }
+
+
+class Branch:
+    """
+    A scenario that diverges from the common epidemic at the branching date.
+
+    Parameters
+    ----------
+    name
+        name of the branch, its records are written to ``record_path / name``
+    policies
+        policies of the branch, if None the running ones are kept
+    interaction
+        interaction of the branch, if None the running one is kept
+    """
+
+    def __init__(
+        self,
+        name: str,
+        policies: Optional["Policies"] = None,
+        interaction: Optional["Interaction"] = None,
+    ):
+        self.name = name
+        self.policies = policies
+        self.interaction = interaction
+
+    def apply(self, simulator: "Simulator"):
+        if self.interaction is not None:
+            simulator.interaction = self.interaction
+        if self.policies is not None:
+            self.policies.init_policies(world=simulator.world)
+            simulator.activity_manager.policies = self.policies
+        simulator.bind_random_source()
+
+
+class BranchRunner:
+    """
+    Runs a simulation up to a branching date once, and then continues it under
+    several scenarios (``Branch``) in parallel. Each branch runs in a child forked
+    from the process holding the simulation at the branching date, so the common
+    part is neither recomputed nor re-read. The records of the common part stay in
+    the record of the simulator, and each branch only records from the branching
+    date on; ``prepend_checkpoint_hdf5`` and ``prepend_checkpoint_summary`` can
+    merge them.
+
+    By default all branches continue with the same random state (common random
+    numbers), so that differences between them come from the scenarios.
+
+    Parameters
+    ----------
+    simulator
+        simulator to branch
+    record_path
+        the records of each branch are written to ``record_path / name``
+    n_processes
+        number of branches to run at the same time, by default the number of cpus.
+    seed
+        if given, every branch reseeds the random generators with it.
+    """
+
+    def __init__(
+        self,
+        simulator: "Simulator",
+        record_path: str = "results",
+        n_processes: Optional[int] = None,
+        seed: Optional[int] = None,
+    ):
+        self.simulator = simulator
+        self.record_path = Path(record_path)
+        self.n_processes = n_processes or mp.cpu_count()
+        self.seed = seed
+        self.branches = {}
+        self.branch_date = None
+
+    def run_forked(self, name: str):
+        """
+        Continues the simulation under the branch ``name``, in the current process.
+        Checkpoints of the branch are saved to ``record_path / name / checkpoints``.
+
+        Returns
+        -------
+        name, time it took in seconds
+        """
+        tick = perf_counter()
+        if self.seed is not None:
+            set_random_seed(self.seed)
+        branch = self.branches[name]
+        branch.apply(self.simulator)
+        record = Record(record_path=self.record_path / name)
+        branch_config = {"name": name, "date": self.branch_date.strftime("%Y-%m-%d")}
+        if self.simulator.record is not None:
+            branch_config["pre_branch_record_path"] = str(
+                self.simulator.record.record_path
+            )
+        record.append_dict_to_configs({"scenario_branch": branch_config})
+        self.simulator.record = record
+        if self.simulator.checkpoint_save_dates:
+            self.simulator.checkpoint_save_path = self.record_path / name / "checkpoints"
+            self.simulator.checkpoint_save_path.mkdir(parents=True, exist_ok=True)
+        self.simulator.run()
+        return name, perf_counter() - tick
+
+    def run(
+        self,
+        branch_date: Union[str, datetime.datetime],
+        branches: List[Branch],
+    ) -> dict:
+        """
+        Runs the simulator up to ``branch_date`` and then every branch until the
+        final date.
+
+        Returns
+        -------
+        dictionary with the run time of the common part and of each branch.
+        """
+        if isinstance(branch_date, str):
+            branch_date = datetime.datetime.strptime(branch_date, "%Y-%m-%d")
+        self.branch_date = branch_date
+        self.branches = {branch.name: branch for branch in branches}
+        tick = perf_counter()
+        self.simulator.run(until=branch_date)
+        common_time = perf_counter() - tick
+        logger.info(f"Ran up to the branching date {branch_date} in {common_time}")
+        branch_times = _fork_map(self, list(self.branches), self.n_processes)
+        return {"common_time": common_time, "branch_times": branch_times}
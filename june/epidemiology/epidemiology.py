@@ -3,7 +3,7 @@ from time import perf_counter
 from time import time as wall_clock
 import logging
 
-from .infection import InfectionSelectors, ImmunitySetter
+from .infection import InfectionSelectors, ImmunitySetter, InfectionTable
 from june.demography import Population, Activities
 from june.policy import MedicalCarePolicies
 from june.mpi_setup import mpi_comm, mpi_size, mpi_rank, move_info
@@ -11,6 +11,7 @@ from june.groups import MedicalFacilities
 from june.records import Record
 from june.world import World
 from june.time import Timer
+from june.utils.tracing import tracer
 
 logger = logging.getLogger("epidemiology")
 mpi_logger = logging.getLogger("mpi")
@@ -52,6 +53,21 @@ class Epidemiology:
         self.medical_care_policies = medical_care_policies
         self.medical_facilities = medical_facilities
 
+    def set_population(self, population):
+        """
+        Lets the infection selectors (including those of the infection seeds)
+        report the people they infect to the population, so that its columnar
+        store stays up to date, and gives the population an infection table with
+        which all the infections are updated in one go.
+        """
+        population.infection_table = InfectionTable(population.infected)
+        if self.infection_selectors:
+            for selector in self.infection_selectors.infection_id_to_selector.values():
+                selector.population = population
+        if self.infection_seeds:
+            for infection_seed in self.infection_seeds:
+                infection_seed.infection_selector.population = population
+
     def set_immunity(self, population):
         if self.immunity_setter:
             self.immunity_setter.set_immunity(population)
@@ -82,24 +98,27 @@ class Epidemiology:
     ):
         # infect the people that got exposed
         if self.infection_selectors:
-            infect_in_domains = self.infect_people(
-                world=world,
-                time=timer.now,
-                infected_ids=infected_ids,
-                infection_ids=infection_ids,
-                people_from_abroad_dict=people_from_abroad_dict,
-            )
+            with tracer.span("infect_people"):
+                infect_in_domains = self.infect_people(
+                    world=world,
+                    time=timer.now,
+                    infected_ids=infected_ids,
+                    infection_ids=infection_ids,
+                    people_from_abroad_dict=people_from_abroad_dict,
+                )
             to_infect = self.tell_domains_to_infect(
                 world=world, timer=timer, infect_in_domains=infect_in_domains
             )
 
         # update the health status of the population
-        self.update_health_status(
-            world=world, time=timer.now, duration=timer.duration, record=record
-        )
+        with tracer.span("update_health_status"):
+            self.update_health_status(
+                world=world, time=timer.now, duration=timer.duration, record=record
+            )
         if record:
-            record.summarise_time_step(timestamp=timer.date, world=world)
-            record.time_step(timestamp=timer.date)
+            with tracer.span("record"):
+                record.summarise_time_step(timestamp=timer.date, world=world)
+                record.time_step(timestamp=timer.date)
 
     @staticmethod
     def bury_the_dead(world: World, person: "Person", record: Record = None):
@@ -130,14 +149,14 @@ class Epidemiology:
         cemetery.add(person)
         if person.residence.group.spec == "household":
             household = person.residence.group
-            person.residence.residents = tuple(
+            household.residents = tuple(
                 mate for mate in household.residents if mate != person
             )
         person.subgroups = Activities(None, None, None, None, None, None)
-
+        world.people.update_state(person)
 
     @staticmethod
-    def recover(person: "Person", record: Record = None):
+    def recover(person: "Person", record: Record = None, world: World = None):
         """
         When someone recovers, erase the health information they carry and change their susceptibility.
 
@@ -147,6 +166,8 @@ class Epidemiology:
             person to recover
         time:
             time (in days), at which the person recovers
+        world:
+            if given, the new state of the person is written to world.people
         """
         if record:
             record.accumulate(
@@ -155,6 +176,8 @@ class Epidemiology:
                 infection_id=person.infection.infection_id(),
             )
         person.infection = None
+        if world is not None:
+            world.people.update_state(person)
 
     def update_health_status(
         self, world: World, time: float, duration: float, record: Record = None
@@ -171,11 +194,26 @@ class Epidemiology:
         duration:
             duration of time step
         """
-        for person in world.people.infected:
-            previous_tag = person.infection.tag
-            new_status = person.infection.update_health_status(time, duration)
+        infection_table = world.people.infection_table
+        if infection_table is not None:
+            people, tag_changed = infection_table.update(time + duration)
+            if world.people.store is not None:
+                world.people.store.update_transmission_probabilities(
+                    [person.id for person in people],
+                    infection_table.probabilities[: len(people)],
+                )
+        else:
+            people, tag_changed = world.people.infected, None
+        for i, person in enumerate(people):
+            if tag_changed is None:
+                previous_tag = person.infection.tag
+                new_status = person.infection.update_health_status(time, duration)
+                person_tag_changed = previous_tag != person.infection.tag
+            else:
+                new_status = person.infection.status
+                person_tag_changed = tag_changed[i]
             if record is not None:
-                if previous_tag != person.infection.tag:
+                if person_tag_changed:
                     record.accumulate(
                         table_name="symptoms",
                         infected_id=person.id,
@@ -191,9 +229,11 @@ class Epidemiology:
                     record=record,
                 )
             if new_status == "recovered":
-                self.recover(person, record=record)
+                self.recover(person, record=record, world=world)
             elif new_status == "dead":
                 self.bury_the_dead(world, person, record=record)
+            elif tag_changed is None:
+                world.people.update_state(person)
 
     def infect_people(
         self, world, time, infected_ids, infection_ids, people_from_abroad_dict
@@ -205,52 +245,54 @@ class Epidemiology:
         """
         foreign_ids = []
         foreign_infection_ids = []
+        people_to_infect = []
+        people_infection_ids = []
         for person_id, infection_id in zip(infected_ids, infection_ids):
             if person_id in world.people.people_ids:
-                person = world.people.get_from_id(person_id)
-                self.infection_selectors.infect_person_at_time(
-                    person=person, time=time, infection_id=infection_id
-                )
+                people_to_infect.append(world.people.get_from_id(person_id))
+                people_infection_ids.append(infection_id)
             else:
                 foreign_ids.append(person_id)
                 foreign_infection_ids.append(infection_id)
+        self.infection_selectors.infect_people_at_time(
+            people=people_to_infect, time=time, infection_ids=people_infection_ids
+        )
 
         infect_in_domains = {}
         if foreign_ids:
-            people_ids = []
-            people_domains = []
+            foreign_ids = np.array(foreign_ids, dtype=np.int64)
+            foreign_infection_ids = np.array(foreign_infection_ids, dtype=np.int64)
+            sorter = np.argsort(foreign_ids)
             for spec in people_from_abroad_dict:
                 for group in people_from_abroad_dict[spec]:
                     for subgroup in people_from_abroad_dict[spec][group]:
-                        p_ids = list(
-                            people_from_abroad_dict[spec][group][subgroup].keys()
-                        )
-                        people_ids += p_ids
-                        for id in p_ids:
-                            people_domains.append(
-                                people_from_abroad_dict[spec][group][subgroup][id][
-                                    "dom"
-                                ]
-                            )
-            infection_counter = 0
-            for id, domain in zip(people_ids, people_domains):
-                if id in foreign_ids:
-                    if domain not in infect_in_domains:
-                        infect_in_domains[domain] = {}
-                        infect_in_domains[domain]["id"] = []
-                        infect_in_domains[domain]["inf_id"] = []
-                    infect_in_domains[domain]["id"].append(id)
-                    infect_in_domains[domain]["inf_id"].append(
-                        foreign_infection_ids[infection_counter]
-                    )
-                    infection_counter += 1
+                        data = people_from_abroad_dict[spec][group][subgroup].data
+                        infected = np.isin(data["id"], foreign_ids)
+                        if not infected.any():
+                            continue
+                        ids = data["id"][infected]
+                        positions = sorter[
+                            np.searchsorted(foreign_ids, ids, sorter=sorter)
+                        ]
+                        for id, domain, infection_id in zip(
+                            ids.tolist(),
+                            data["dom"][infected].tolist(),
+                            foreign_infection_ids[positions].tolist(),
+                        ):
+                            if domain not in infect_in_domains:
+                                infect_in_domains[domain] = {}
+                                infect_in_domains[domain]["id"] = []
+                                infect_in_domains[domain]["inf_id"] = []
+                            infect_in_domains[domain]["id"].append(id)
+                            infect_in_domains[domain]["inf_id"].append(infection_id)
         return infect_in_domains
 
     def tell_domains_to_infect(self, world, timer, infect_in_domains):
         """
         Sends information about the people who got infected in this domain to the other domains.
         """
-        mpi_comm.Barrier()
+        with tracer.span("infection_comms_waiting", category="mpi"):
+            mpi_comm.Barrier()
         tick, tickw = perf_counter(), wall_clock()
 
         invalid_id = 4294967295  # largest possible uint32
@@ -274,8 +316,9 @@ class Epidemiology:
                 infect_in_domains[x]["inf_id"], dtype=np.uint32
             )
 
-        people_to_infect, n_sending, n_receiving = move_info(people_ids)
-        infection_to_infect, n_sending, n_receiving = move_info(infection_ids)
+        with tracer.span("infection_comms", category="mpi"):
+            people_to_infect, n_sending, n_receiving = move_info(people_ids)
+            infection_to_infect, n_sending, n_receiving = move_info(infection_ids)
 
         tock, tockw = perf_counter(), wall_clock()
         logger.info(
@@ -284,13 +327,13 @@ class Epidemiology:
         )
         mpi_logger.info(f"{timer.date},{mpi_rank},infection,{tock-tick}")
 
+        people = []
+        people_infection_ids = []
         for person_id, infection_id in zip(people_to_infect, infection_to_infect):
-            try:
-                person = world.people.get_from_id(person_id)
-                self.infection_selectors.infect_person_at_time(
-                    person=person, time=timer.now, infection_id=infection_id
-                )
-            except:
-                if person_id == invalid_id:
-                    continue
-                raise
+            if person_id == invalid_id:
+                continue
+            people.append(world.people.get_from_id(person_id))
+            people_infection_ids.append(infection_id)
+        self.infection_selectors.infect_people_at_time(
+            people=people, time=timer.now, infection_ids=people_infection_ids
+        )
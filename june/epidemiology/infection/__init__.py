@@ -8,4 +8,5 @@ from .symptom_tag import SymptomTag
 from .symptoms import Symptoms
 from .transmission import Transmission, TransmissionConstant, TransmissionGamma
 from .transmission_xnexp import TransmissionXNExp
+from .infection_table import InfectionTable
 from .immunity_setter import ImmunitySetter 
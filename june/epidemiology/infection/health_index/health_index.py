@@ -52,6 +52,7 @@ class HealthIndexGenerator:
         self.rates_df = rates_df
         self.age_bins = self.rates_df.index
         self.probabilities = self._get_probabilities(max_age)
+        self.cumulative_probabilities = self._get_cumulative_probabilities()
         self.max_mild_symptom_tag = {
             value: key for key, value in index_to_maximum_symptoms_tag.items()
         }["severe"]
@@ -90,7 +91,8 @@ class HealthIndexGenerator:
             effective_multiplier = person.immunity.get_effective_multiplier(infection_id)
             if effective_multiplier != 1.:
                 probabilities = self.apply_effective_multiplier(probabilities, effective_multiplier)
-        return np.cumsum(probabilities)
+                return np.cumsum(probabilities)
+        return self.cumulative_probabilities[population][person.sex][person.age]
 
     def apply_effective_multiplier(self, probabilities, effective_multiplier):
         modified_probabilities = np.zeros_like(probabilities)
@@ -152,6 +154,21 @@ class HealthIndexGenerator:
             target_adjust_sum = max(1 - to_keep_sum, 0)
             p[population][sex][age][:5] *= target_adjust_sum / to_adjust_sum
 
+    def _get_cumulative_probabilities(self):
+        """
+        Cumulative outcome probabilities, computed once since they are shared by
+        everyone without an effective multiplier. They are made read-only as the
+        same rows are handed to every caller.
+        """
+        cumulative_probabilities = {}
+        for population, probabilities_per_sex in self.probabilities.items():
+            cumulative_probabilities[population] = {}
+            for sex, probabilities in probabilities_per_sex.items():
+                cumulative = np.cumsum(probabilities, axis=1)
+                cumulative.flags.writeable = False
+                cumulative_probabilities[population][sex] = cumulative
+        return cumulative_probabilities
+
     def _get_probabilities(self, max_age=99):
         n_outcomes = 8
         probabilities = {
@@ -1,13 +1,13 @@
 from typing import Optional
 import numpy as np
 import yaml
-from random import random
 from june.utils import (
     parse_age_probabilities,
     parse_prevalence_comorbidities_in_reference_population,
     read_comorbidity_csv,
     convert_comorbidities_prevalence_to_dict,
 )
+from june.utils.random_streams import RandomSource
 
 from . import Covid19, B117, B16172
 
@@ -24,6 +24,8 @@ default_multiplier_dict = {
 
 
 class ImmunitySetter:
+    random_source = RandomSource()
+
     def __init__(
         self,
         susceptibility_dict: dict = default_susceptibility_dict,
@@ -286,7 +288,12 @@ class ImmunitySetter:
                 if person.age >= len(self.susceptibility_dict[inf_id]):
                     continue
                 fraction = self.susceptibility_dict[inf_id][person.age]
-                if random() > fraction:
+                if (
+                    self.random_source.random(
+                        f"immunity.susceptibility.{inf_id}", person.id
+                    )
+                    > fraction
+                ):
                     person.immunity.susceptibility_dict[inf_id] = 0.0
 
     def set_vaccinations(self, population):
@@ -310,9 +317,19 @@ class ImmunitySetter:
                 ]
             )
             total_vacc_rate = np.sum(vaccination_rates)
-            if random() < total_vacc_rate:
+            if (
+                self.random_source.random("immunity.vaccination", person.id)
+                < total_vacc_rate
+            ):
                 vaccination_rates /= total_vacc_rate
-                vaccine = np.random.choice(vaccines, p=vaccination_rates)
+                if self.random_source.enabled:
+                    vaccine = vaccines[
+                        self.random_source.choice(
+                            "immunity.vaccine", person.id, vaccination_rates
+                        )
+                    ]
+                else:
+                    vaccine = np.random.choice(vaccines, p=vaccination_rates)
                 vdata = self.vaccination_dict[vaccine]
                 for inf_id, inf_data in vdata["infections"].items():
                     person.immunity.add_multiplier(
@@ -343,7 +360,10 @@ class ImmunitySetter:
             ratio = self.previous_infections_dict["ratios"][person.region.name][
                 person.age
             ]
-            if random() < ratio:
+            if (
+                self.random_source.random("immunity.previous_infection", person.id)
+                < ratio
+            ):
                 for inf_id, inf_data in self.previous_infections_dict[
                     "infections"
                 ].items():
@@ -79,6 +79,13 @@ class Infection:
             new status of the person. one of ``['recovered', 'dead', 'infected']``
         """
         self.update_symptoms_and_transmission(time + delta_time)
+        return self.status
+
+    @property
+    def status(self) -> str:
+        """
+        Current status of the person, one of ``['recovered', 'dead', 'infected']``
+        """
         if self.symptoms.recovered:
             status = "recovered"
         elif self.symptoms.dead:
@@ -1,10 +1,15 @@
+import logging
 from enum import IntEnum
+from collections import defaultdict
+from time import perf_counter
+from typing import List
 
 import numpy as np
 from itertools import count
 import yaml
 
 from june import paths
+from june.utils.random_streams import RandomSource
 from .health_index.health_index import HealthIndexGenerator
 from .health_index import Data2Rates
 from . import Infection, Covid19
@@ -22,8 +27,12 @@ default_trajectories_config_path = (
 )
 default_rates_file = paths.data_path / "input/health_index/infection_outcome_rates.csv"
 
+logger = logging.getLogger("infection_selector")
+
 
 class InfectionSelector:
+    random_source = RandomSource()
+
     def __init__(
         self,
         transmission_config_path: str = default_transmission_config_path,
@@ -43,6 +52,7 @@ class InfectionSelector:
         self.transmission_config_path = transmission_config_path
         self.trajectory_maker = trajectory_maker
         self.health_index_generator = health_index_generator
+        self.population = None
         self._load_transmission()
 
     @classmethod
@@ -89,9 +99,76 @@ class InfectionSelector:
         time:
             time at which infection happens
         """
-        infection_id = self.infection_id
         person.infection = self._make_infection(person, time)
         person.immunity.add_immunity(person.infection.immunity_ids())
+        if self.population is not None:
+            self.population.update_state(person)
+
+    def infect_people_at_time(self, people: List["Person"], time: float):
+        """
+        Infects a batch of people at a given time. The health outcomes, symptom
+        trajectories and transmission parameters of the whole batch are drawn
+        as vectors, rather than one infection at a time.
+
+        Parameters
+        ----------
+        people:
+            people that will be infected
+        time:
+            time at which infection happens
+        """
+        if not people:
+            return
+        tick = perf_counter()
+        infections = self._make_infections(people, time)
+        for person, infection in zip(people, infections):
+            person.infection = infection
+            person.immunity.add_immunity(infection.immunity_ids())
+            if self.population is not None:
+                self.population.update_state(person)
+        logger.debug(
+            f"Created {len(people)} {self.infection_class.__name__} infections "
+            f"in {perf_counter() - tick:.4f}s"
+        )
+
+    def _make_infections(self, people: List["Person"], time: float):
+        """
+        Generates the symptoms and infectiousness of a batch of people.
+
+        Parameters
+        ----------
+        people:
+            people that will be infected
+        time:
+            time at which infection happens
+        """
+        symptoms = self._select_symptoms_batch(people)
+        uniforms = None
+        if self.random_source.enabled:
+            uniforms = self.random_source.uniforms(
+                f"{self._random_purpose}.transmission",
+                [person.id for person in people],
+                n_draws=8,
+            )
+        transmissions = self._select_transmissions(
+            times_to_symptoms_onset=np.array(
+                [person_symptoms.time_exposed for person_symptoms in symptoms]
+            ),
+            max_symptoms_tags=[
+                person_symptoms.max_tag.name for person_symptoms in symptoms
+            ],
+            uniforms=uniforms,
+        )
+        return [
+            self.infection_class(
+                transmission=transmission, symptoms=person_symptoms, start_time=time
+            )
+            for transmission, person_symptoms in zip(transmissions, symptoms)
+        ]
+
+    @property
+    def _random_purpose(self):
+        return f"infection_selector.{self.infection_id}"
 
     def _make_infection(self, person: "Person", time: float):
         """
@@ -104,6 +181,10 @@ class InfectionSelector:
         time:
             time at which infection happens
         """
+        if self.random_source.enabled:
+            # keyed draws of the batch version, they don't depend on the infections
+            # drawn before
+            return self._make_infections([person], time)[0]
         symptoms = self._select_symptoms(person)
         time_to_symptoms_onset = symptoms.time_exposed
         transmission = self._select_transmission(
@@ -244,6 +325,169 @@ class InfectionSelector:
         else:
             raise NotImplementedError("This transmission type has not been implemented")
 
+    def _select_transmissions(
+        self,
+        times_to_symptoms_onset: np.ndarray,
+        max_symptoms_tags: List[str],
+        uniforms: np.ndarray = None,
+    ) -> List["Transmission"]:
+        """
+        Vectorized version of ``_select_transmission``, every parameter is
+        sampled once for the whole batch.
+
+        Parameters
+        ----------
+        times_to_symptoms_onset:
+            time of symptoms onset of each person
+        max_symptoms_tags:
+            name of the maximum symptoms tag of each person
+        uniforms:
+            if given, an array with a row per person and a column per sampled
+            parameter (up to 8), the parameters are then taken at these quantiles
+            instead of drawn
+        """
+        n = len(times_to_symptoms_onset)
+
+        def sample(parameter, column):
+            if uniforms is None:
+                return parameter.sample(n)
+            return parameter.ppf(uniforms[:, column])
+
+        if self.transmission_type == "xnexp":
+            times_first_infectious = (
+                sample(self.smearing_time_first_infectious, 0)
+                + times_to_symptoms_onset
+            )
+            peak_positions = (
+                times_to_symptoms_onset
+                - times_first_infectious
+                + sample(self.smearing_peak_position, 1)
+            )
+            exponents = peak_positions / sample(self.alpha, 2)
+            parameters = zip(
+                sample(self.max_probability, 3),
+                times_first_infectious,
+                sample(self.norm_time, 4),
+                exponents,
+                sample(self.alpha, 5),
+                max_symptoms_tags,
+                sample(self.asymptomatic_infectious_factor, 6),
+                sample(self.mild_infectious_factor, 7),
+            )
+            return [
+                TransmissionXNExp(
+                    max_probability=max_probability,
+                    time_first_infectious=time_first_infectious,
+                    norm_time=norm_time,
+                    n=exponent,
+                    alpha=alpha,
+                    max_symptoms=max_symptoms,
+                    asymptomatic_infectious_factor=asymptomatic_infectious_factor,
+                    mild_infectious_factor=mild_infectious_factor,
+                )
+                for (
+                    max_probability,
+                    time_first_infectious,
+                    norm_time,
+                    exponent,
+                    alpha,
+                    max_symptoms,
+                    asymptomatic_infectious_factor,
+                    mild_infectious_factor,
+                ) in parameters
+            ]
+        elif self.transmission_type == "gamma":
+            parameters = zip(
+                sample(self.max_infectiousness, 0),
+                sample(self.shape, 1),
+                sample(self.rate, 2),
+                sample(self.shift, 3) + times_to_symptoms_onset,
+                max_symptoms_tags,
+                sample(self.asymptomatic_infectious_factor, 4),
+                sample(self.mild_infectious_factor, 5),
+            )
+            return [
+                TransmissionGamma(
+                    max_infectiousness=max_infectiousness,
+                    shape=shape,
+                    rate=rate,
+                    shift=shift,
+                    max_symptoms=max_symptoms,
+                    asymptomatic_infectious_factor=asymptomatic_infectious_factor,
+                    mild_infectious_factor=mild_infectious_factor,
+                )
+                for (
+                    max_infectiousness,
+                    shape,
+                    rate,
+                    shift,
+                    max_symptoms,
+                    asymptomatic_infectious_factor,
+                    mild_infectious_factor,
+                ) in parameters
+            ]
+        elif self.transmission_type == "constant":
+            return [
+                TransmissionConstant(probability=probability)
+                for probability in sample(self.probability, 0)
+            ]
+        else:
+            raise NotImplementedError("This transmission type has not been implemented")
+
+    def _select_symptoms_batch(self, people: List["Person"]) -> List["Symptoms"]:
+        """
+        Selects the symptoms of a batch of people. The maximum severities are drawn
+        at once, and the trajectories of all the people sharing the same maximum
+        symptoms tag are generated together.
+
+        Parameters
+        ----------
+        people:
+            people that will be infected
+        """
+        if self.random_source.enabled:
+            person_ids = np.array([person.id for person in people], dtype=np.int64)
+            max_severities = self.random_source.uniforms(
+                f"{self._random_purpose}.severity", person_ids
+            )[:, 0]
+        else:
+            max_severities = np.random.random(len(people))
+        max_tags = [
+            SymptomTag(
+                np.searchsorted(
+                    self.health_index_generator(person, infection_id=self.infection_id),
+                    max_severity,
+                )
+            )
+            for person, max_severity in zip(people, max_severities)
+        ]
+        positions_per_tag = defaultdict(list)
+        for i, max_tag in enumerate(max_tags):
+            positions_per_tag[max_tag].append(i)
+        trajectories = [None] * len(people)
+        for max_tag, positions in positions_per_tag.items():
+            trajectory_maker = self.trajectory_maker.trajectories[max_tag]
+            uniforms = None
+            if self.random_source.enabled:
+                uniforms = self.random_source.uniforms(
+                    f"{self._random_purpose}.trajectory",
+                    person_ids[positions],
+                    n_draws=len(trajectory_maker.stages),
+                )
+            tag_trajectories = trajectory_maker.generate_trajectories(
+                len(positions), uniforms=uniforms
+            )
+            for position, trajectory in zip(positions, tag_trajectories):
+                trajectories[position] = trajectory
+        return [
+            Symptoms.from_trajectory(
+                max_severity=max_severity, max_tag=max_tag, trajectory=trajectory
+            )
+            for max_severity, max_tag, trajectory in zip(
+                max_severities, max_tags, trajectories
+            )
+        ]
+
     def _select_symptoms(self, person: "Person") -> "Symptoms":
         """
         Select the symptoms that a given person has, and how they will evolve
@@ -257,7 +501,9 @@ class InfectionSelector:
             infection id
         """
         health_index = self.health_index_generator(person, infection_id=self.infection_id)
-        return Symptoms(health_index=health_index)
+        return Symptoms(
+            health_index=health_index, trajectory_maker=self.trajectory_maker
+        )
 
 
 class InfectionSelectors:
@@ -297,6 +543,30 @@ class InfectionSelectors:
         selector = self.infection_id_to_selector[infection_id]
         selector.infect_person_at_time(person=person, time=time)
 
+    def infect_people_at_time(
+        self, people: List["Person"], time: float, infection_ids: List[int]
+    ):
+        """
+        Infects a batch of people at a given time, each one with the given
+        infection id. People are grouped by infection and each group is created
+        in one vectorized pass by the corresponding selector.
+
+        Parameters
+        ----------
+        people:
+            people that will be infected
+        time:
+            time at which infection happens
+        infection_ids:
+            infection id for each person
+        """
+        people_per_infection = defaultdict(list)
+        for person, infection_id in zip(people, infection_ids):
+            people_per_infection[infection_id].append(person)
+        for infection_id, infection_people in people_per_infection.items():
+            selector = self.infection_id_to_selector[infection_id]
+            selector.infect_people_at_time(people=infection_people, time=time)
+
     def __iter__(self):
         return iter(self._infection_selectors)
 
@@ -0,0 +1,263 @@
+from typing import List
+
+import numpy as np
+import numba as nb
+
+from .transmission import TransmissionConstant, TransmissionGamma, gamma_pdf
+from .transmission_xnexp import TransmissionXNExp, update_probability
+
+CONSTANT, GAMMA, XNEXP, OTHER = 0, 1, 2, 3
+
+
+@nb.jit(nopython=True)
+def update_infection_table(
+    time,
+    kinds,
+    start_times,
+    norms,
+    shapes,
+    shifts,
+    scales,
+    times_first_infectious,
+    norm_times,
+    ns,
+    alphas,
+    probabilities,
+    stages,
+    n_stages,
+    stage_times,
+    stage_tags,
+):
+    """
+    Updates the transmission probability and symptoms stage of every row of the
+    infection table at the given time. As in ``Symptoms.update_trajectory_stage``,
+    the symptoms advance at most one stage per call.
+
+    Returns
+    -------
+    tag_changed
+        whether the symptoms tag of each row changed.
+    """
+    n_rows = len(kinds)
+    tag_changed = np.zeros(n_rows, dtype=np.bool_)
+    for i in range(n_rows):
+        time_from_infection = time - start_times[i]
+        if kinds[i] == GAMMA:
+            probabilities[i] = norms[i] * gamma_pdf(
+                time_from_infection, shapes[i], shifts[i], scales[i]
+            )
+        elif kinds[i] == XNEXP:
+            probabilities[i] = update_probability(
+                time_from_infection,
+                times_first_infectious[i],
+                norms[i],
+                norm_times[i],
+                alphas[i],
+                ns[i],
+            )
+        stage = stages[i]
+        if stage + 1 < n_stages[i] and time_from_infection > stage_times[i, stage + 1]:
+            stages[i] = stage + 1
+            tag_changed[i] = stage_tags[i, stage + 1] != stage_tags[i, stage]
+    return tag_changed
+
+
+class InfectionTable:
+    """
+    Table with the transmission parameters, start time and symptoms trajectory of
+    every active infection, so that all infections can be updated with one kernel
+    call per time step instead of one ``Infection.update_health_status`` call per
+    person. The infections themselves are still the source of truth, the table
+    writes the updated probabilities and stages back to them.
+
+    Rows are added and removed through ``update_person``, which is called from
+    ``Population.update_state`` whenever the infection of a person changes.
+
+    Parameters
+    ----------
+    people
+        infected people to fill the table with
+    """
+
+    def __init__(self, people: List["Person"] = (), capacity: int = 1024):
+        self.people = []
+        self.row_by_id = {}
+        self.max_stages = 8
+        self._allocate(capacity)
+        for person in people:
+            self.update_person(person)
+
+    def _allocate(self, capacity: int):
+        self.kinds = np.zeros(capacity, dtype=np.int8)
+        self.start_times = np.zeros(capacity, dtype=np.float64)
+        self.norms = np.zeros(capacity, dtype=np.float64)
+        self.shapes = np.zeros(capacity, dtype=np.float64)
+        self.shifts = np.zeros(capacity, dtype=np.float64)
+        self.scales = np.ones(capacity, dtype=np.float64)
+        self.times_first_infectious = np.zeros(capacity, dtype=np.float64)
+        self.norm_times = np.ones(capacity, dtype=np.float64)
+        self.ns = np.zeros(capacity, dtype=np.float64)
+        self.alphas = np.ones(capacity, dtype=np.float64)
+        self.probabilities = np.zeros(capacity, dtype=np.float64)
+        self.stages = np.zeros(capacity, dtype=np.int64)
+        self.n_stages = np.zeros(capacity, dtype=np.int64)
+        self.stage_times = np.full((capacity, self.max_stages), np.inf)
+        self.stage_tags = np.zeros((capacity, self.max_stages), dtype=np.int64)
+
+    @property
+    def _columns(self):
+        return (
+            "kinds",
+            "start_times",
+            "norms",
+            "shapes",
+            "shifts",
+            "scales",
+            "times_first_infectious",
+            "norm_times",
+            "ns",
+            "alphas",
+            "probabilities",
+            "stages",
+            "n_stages",
+            "stage_times",
+            "stage_tags",
+        )
+
+    def _resize(self, capacity: int, max_stages: int):
+        old_columns = {name: getattr(self, name) for name in self._columns}
+        old_max_stages = self.max_stages
+        self.max_stages = max_stages
+        self._allocate(capacity)
+        n_rows = len(self)
+        for name, column in old_columns.items():
+            if column.ndim == 1:
+                getattr(self, name)[:n_rows] = column[:n_rows]
+            else:
+                getattr(self, name)[:n_rows, :old_max_stages] = column[:n_rows]
+
+    def __len__(self):
+        return len(self.people)
+
+    @property
+    def capacity(self):
+        return len(self.kinds)
+
+    def _set_row(self, row: int, person: "Person"):
+        infection = person.infection
+        transmission = infection.transmission
+        self.start_times[row] = infection.start_time
+        self.probabilities[row] = transmission.probability
+        if isinstance(transmission, TransmissionGamma):
+            self.kinds[row] = GAMMA
+            self.norms[row] = transmission.norm
+            self.shapes[row] = transmission.shape
+            self.shifts[row] = transmission.shift
+            self.scales[row] = transmission.scale
+        elif isinstance(transmission, TransmissionXNExp):
+            self.kinds[row] = XNEXP
+            self.norms[row] = transmission.norm
+            self.times_first_infectious[row] = transmission.time_first_infectious
+            self.norm_times[row] = transmission.norm_time
+            self.ns[row] = transmission.n
+            self.alphas[row] = transmission.alpha
+        elif isinstance(transmission, TransmissionConstant):
+            self.kinds[row] = CONSTANT
+        else:
+            self.kinds[row] = OTHER
+        symptoms = infection.symptoms
+        trajectory = symptoms.trajectory
+        if len(trajectory) > self.max_stages:
+            self._resize(self.capacity, len(trajectory))
+        self.stages[row] = symptoms.stage
+        self.n_stages[row] = len(trajectory)
+        self.stage_times[row] = np.inf
+        for stage, (stage_time, tag) in enumerate(trajectory):
+            self.stage_times[row, stage] = stage_time
+            self.stage_tags[row, stage] = tag.value
+
+    def update_person(self, person: "Person"):
+        """
+        Adds, refreshes or removes the row of a person according to their
+        current infection.
+        """
+        if person.infection is None:
+            if person.id in self.row_by_id:
+                self._remove(person)
+            return
+        row = self.row_by_id.get(person.id)
+        if row is None:
+            row = len(self)
+            if row == self.capacity:
+                self._resize(2 * self.capacity, self.max_stages)
+            self.people.append(person)
+            self.row_by_id[person.id] = row
+        self._set_row(row, person)
+
+    def _remove(self, person: "Person"):
+        """
+        Removes the row of a person, moving the last row into its place.
+        """
+        row = self.row_by_id.pop(person.id)
+        last = len(self) - 1
+        last_person = self.people.pop()
+        if row != last:
+            for name in self._columns:
+                column = getattr(self, name)
+                column[row] = column[last]
+            self.people[row] = last_person
+            self.row_by_id[last_person.id] = row
+
+    def update(self, time: float):
+        """
+        Updates the transmission probability and symptoms of every infection at
+        the given time, and writes them back to the infections.
+
+        Parameters
+        ----------
+        time
+            simulation time (in days)
+
+        Returns
+        -------
+        people
+            the people in the table, in row order
+        tag_changed
+            whether the symptoms tag of each of them changed
+        """
+        n_rows = len(self)
+        tag_changed = update_infection_table(
+            time,
+            self.kinds[:n_rows],
+            self.start_times[:n_rows],
+            self.norms[:n_rows],
+            self.shapes[:n_rows],
+            self.shifts[:n_rows],
+            self.scales[:n_rows],
+            self.times_first_infectious[:n_rows],
+            self.norm_times[:n_rows],
+            self.ns[:n_rows],
+            self.alphas[:n_rows],
+            self.probabilities[:n_rows],
+            self.stages[:n_rows],
+            self.n_stages[:n_rows],
+            self.stage_times[:n_rows],
+            self.stage_tags[:n_rows],
+        )
+        people = list(self.people)
+        probabilities = self.probabilities[:n_rows].tolist()
+        stages = self.stages[:n_rows].tolist()
+        for row, person in enumerate(people):
+            infection = person.infection
+            if self.kinds[row] == OTHER:
+                infection.transmission.update_infection_probability(
+                    time_from_infection=time - infection.start_time
+                )
+                self.probabilities[row] = infection.transmission.probability
+            else:
+                infection.transmission.probability = probabilities[row]
+            symptoms = infection.symptoms
+            if symptoms.stage != stages[row]:
+                symptoms.stage = stages[row]
+                symptoms.tag = symptoms.trajectory[symptoms.stage][1]
+        return people, tag_changed
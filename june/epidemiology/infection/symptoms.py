@@ -24,16 +24,33 @@ class Symptoms:
     characteristic timings.
     """
 
-    def __init__(self, health_index=None):
+    def __init__(self, health_index=None, trajectory_maker: TrajectoryMakers = None):
         self.max_tag = None
         self.tag = SymptomTag.exposed
         self.max_severity = random()
         self.trajectory = self._make_symptom_trajectory(
-            health_index
+            health_index, trajectory_maker
         )  # this also sets max_tag
         self.stage = 0
         self.time_of_symptoms_onset = self._compute_time_from_infection_to_symptoms()
 
+    @classmethod
+    def from_trajectory(cls, max_severity: float, max_tag: SymptomTag, trajectory):
+        """
+        Builds the symptoms from an already generated trajectory, used when
+        creating infections in batches.
+        """
+        symptoms = cls.__new__(cls)
+        symptoms.tag = SymptomTag.exposed
+        symptoms.max_severity = max_severity
+        symptoms.max_tag = max_tag
+        symptoms.trajectory = trajectory
+        symptoms.stage = 0
+        symptoms.time_of_symptoms_onset = (
+            symptoms._compute_time_from_infection_to_symptoms()
+        )
+        return symptoms
+
     def _compute_time_from_infection_to_symptoms(self):
         symptoms_onset = 0
         for completion_time, tag in self.trajectory:
@@ -44,10 +61,11 @@ class Symptoms:
                 return None
         return symptoms_onset
 
-    def _make_symptom_trajectory(self, health_index):
+    def _make_symptom_trajectory(self, health_index, trajectory_maker=None):
         if health_index is None:
             return [(0, SymptomTag(0))]
-        trajectory_maker = TrajectoryMakers.from_file()
+        if trajectory_maker is None:
+            trajectory_maker = TrajectoryMakers.from_file()
         index_max_symptoms_tag = np.searchsorted(health_index, self.max_severity)
         self.max_tag = SymptomTag(index_max_symptoms_tag)
         return trajectory_maker[self.max_tag]
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import List, Tuple
 
+import numpy as np
 import yaml
 from scipy.stats import expon, beta, lognorm, norm, expon, exponweib
 
@@ -17,6 +18,21 @@ class CompletionTime(ABC):
         Compute the time a given stage should take to complete
         """
 
+    def sample(self, n: int) -> np.ndarray:
+        """
+        Compute n completion times at once.
+        """
+        return np.array([self() for _ in range(n)], dtype=float)
+
+    def ppf(self, uniforms: np.ndarray) -> np.ndarray:
+        """
+        Completion times at the quantiles ``uniforms``, to turn given uniform
+        numbers into completion times instead of drawing them.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} can't compute completion times from quantiles"
+        )
+
     @staticmethod
     def class_for_type(type_string: str) -> type:
         """
@@ -70,6 +86,12 @@ class ConstantCompletionTime(CompletionTime):
     def __call__(self):
         return self.value
 
+    def sample(self, n: int) -> np.ndarray:
+        return np.full(n, self.value, dtype=float)
+
+    def ppf(self, uniforms: np.ndarray) -> np.ndarray:
+        return np.full(len(uniforms), self.value, dtype=float)
+
 
 class DistributionCompletionTime(CompletionTime, ABC):
     def __init__(
@@ -95,6 +117,12 @@ class DistributionCompletionTime(CompletionTime, ABC):
         # See for example: https://github.com/scipy/scipy/issues/9394.
         return self._distribution.rvs(*self.args, **self.kwargs)
 
+    def sample(self, n: int) -> np.ndarray:
+        return self._distribution.rvs(*self.args, size=n, **self.kwargs)
+
+    def ppf(self, uniforms: np.ndarray) -> np.ndarray:
+        return self._distribution.ppf(uniforms, *self.args, **self.kwargs)
+
     @property
     def distribution(self):
         return self._distribution(*self.args, **self.kwargs)
@@ -271,6 +299,31 @@ class TrajectoryMaker:
             cumulative += time
         return trajectory
 
+    def generate_trajectories(
+        self, n: int, uniforms: np.ndarray = None
+    ) -> List[List[Tuple[float, SymptomTag]]]:
+        """
+        Generate n trajectories at once, drawing the completion times of each
+        stage in a single vectorized call.
+
+        Parameters
+        ----------
+        n
+            number of trajectories
+        uniforms
+            if given, an array of shape (n, number of stages) of uniform numbers,
+            column i giving the completion times of stage i instead of drawing them
+        """
+        completion_times = np.zeros((n, len(self.stages)))
+        for i, stage in enumerate(self.stages[:-1]):
+            if uniforms is None:
+                completion_times[:, i + 1] = stage.completion_time.sample(n)
+            else:
+                completion_times[:, i + 1] = stage.completion_time.ppf(uniforms[:, i])
+        start_times = np.cumsum(completion_times, axis=1).tolist()
+        tags = self._symptoms_tags
+        return [list(zip(times, tags)) for times in start_times]
+
     @classmethod
     def from_dict(
             cls,
@@ -1,6 +1,5 @@
 import numpy as np
 import pandas as pd
-from random import random
 import datetime
 from collections import Counter, defaultdict
 from june import paths
@@ -13,6 +12,7 @@ from june.geography import SuperAreas
 from june.epidemiology.infection import InfectionSelector, HealthIndexGenerator
 from june.epidemiology.epidemiology import Epidemiology
 from june.utils import parse_age_probabilities
+from june.utils.random_streams import RandomSource
 
 
 class InfectionSeed:
@@ -23,6 +23,8 @@ class InfectionSeed:
     seeds for each infection type.
     """
 
+    random_source = RandomSource()
+
     def __init__(
         self,
         world: "World",
@@ -156,12 +158,14 @@ class InfectionSeed:
             n_people_by_age[person.age] += 1
             if person.immunity.get_susceptibility(infection_id) > 0:
                 susceptible_people_by_age[person.age].append(person)
+        # the seeding time tells apart the draws of past days, seeded at once
+        purpose = f"infection_seed.{infection_id}.{round(time * 24 * 60)}"
         for age, susceptible in susceptible_people_by_age.items():
             # Need to rescale to number of susceptible people in the simulation.
             rescaling = n_people_by_age[age] / len(susceptible_people_by_age[age])
             for person in susceptible:
                 prob = cases_per_capita_per_age.loc[age] * rescaling
-                if random() < prob:
+                if self.random_source.random(purpose, person.id) < prob:
                     self.infection_selector.infect_person_at_time(person=person, time=time)
                     if record:
                         record.accumulate(
@@ -190,7 +194,11 @@ class InfectionSeed:
                         if "dead" in symptoms.tag.name:
                             Epidemiology.bury_the_dead(world=self.world, person=person, record=record)
                         elif "recovered" == symptoms.tag.name:
-                            Epidemiology.recover(person=person, record=record)
+                            Epidemiology.recover(
+                                person=person, record=record, world=self.world
+                            )
+                        elif self.infection_selector.population is not None:
+                            self.infection_selector.population.update_state(person)
 
 
     def infect_super_areas(
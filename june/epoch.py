@@ -0,0 +1,23 @@
+class Epoch:
+    """
+    Counter of the group memberships of a world. People moved to a subgroup are
+    tagged with the current epoch of their world (see ``Subgroup.append``,
+    ``Person.busy`` and ``Person.leisure``), and memberships tagged with an older
+    epoch are ignored, so that emptying all the groups at the end of a time step
+    only requires advancing the epoch.
+
+    Each world has its own epoch, which the simulator sets on the people and groups
+    of the world. People and groups that do not belong to a simulated world share
+    ``default_epoch``.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def advance(self):
+        self.value += 1
+
+
+default_epoch = Epoch()
@@ -5,6 +5,7 @@ import logging
 from typing import Union, List
 
 from june.utils import read_date, str_to_class
+from june.utils.random_streams import RandomSource
 from june.paths import configs_path
 from june.mpi_setup import mpi_rank
 
@@ -20,6 +21,8 @@ class Event(ABC):
     that can happen at the beginning of each time step during a defined period of time.
     """
 
+    random_source = RandomSource()
+
     def __init__(
         self,
         start_time: Union[str, datetime.datetime],
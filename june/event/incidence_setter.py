@@ -36,6 +36,7 @@ class IncidenceSetter(Event):
                     to_cure = sample(infected_people, n_to_remove)
                     for person in to_cure:
                         person.infection = None
+                        world.people.update_state(person)
                 elif incidence < target_incidence:
                     n_to_add = int((target_incidence - incidence) * len(people))
                     to_infect = sample(people, k=2 * n_to_add)
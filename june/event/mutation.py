@@ -1,6 +1,5 @@
 import datetime
 from typing import Union, Dict
-from random import random
 
 from june.epidemiology.infection import B117
 from .event import Event
@@ -52,7 +51,10 @@ class Mutation(Event):
         for person in world.people:
             if person.infected:
                 probability = self.regional_probabilities.get(person.region.name, 0)
-                if random() < probability:
+                if (
+                    self.random_source.random(f"mutation.{self.mutation_id}", person.id)
+                    < probability
+                ):
                     new_infection = selector._make_infection(
                         person, time=person.infection.start_time
                     )
@@ -60,3 +62,5 @@ class Mutation(Event):
                     new_infection.start_time = person.infection.start_time
                     new_infection.symptoms = person.infection.symptoms
                     person.infection = new_infection
+                    if selector.population is not None:
+                        selector.population.update_state(person)
@@ -81,7 +81,9 @@ class CareHome(Group):
     def visitors(self):
         return self.subgroups[self.SubgroupType.visitors]
 
-    def quarantine(self, time, quarantine_days, household_compliance):
+    def quarantine(
+        self, time, quarantine_days, household_compliance, person=None, random_source=None
+    ):
         return True
 
     @property
@@ -242,6 +242,10 @@ class InteractiveCompany(InteractiveGroup):
         super().__init__(group=group, people_from_abroad=people_from_abroad)
         self.sector = group.sector
 
+    @property
+    def beta_key(self):
+        return self.spec, self.sector
+
     def get_processed_beta(self, betas, beta_reductions):
         beta_processed = super().get_processed_beta(
             betas=betas,
@@ -1,4 +1,5 @@
 from .abstract import AbstractGroup
+from .infector_index import InfectorIndex
 from .subgroup import Subgroup 
 from .supergroup import Supergroup
 from .external import ExternalSubgroup, ExternalGroup 
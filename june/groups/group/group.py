@@ -7,6 +7,7 @@ from itertools import count
 from typing import List, Tuple
 
 from june.demography.person import Person
+from june.epoch import default_epoch
 from june.exc import GroupException
 from .interactive import InteractiveGroup
 from . import AbstractGroup
@@ -46,7 +47,7 @@ class Group(AbstractGroup):
 
         default = 0
 
-    __slots__ = ("id", "subgroups", "spec")
+    __slots__ = ("id", "subgroups", "spec", "epoch", "infector_index")
 
     __id_generators = defaultdict(count)
 
@@ -69,6 +70,9 @@ class Group(AbstractGroup):
         self.spec = self.get_spec()
         # noinspection PyTypeChecker
         self.subgroups = [Subgroup(self, i) for i in range(len(self.SubgroupType))]
+        # set by the simulator, see ``june.epoch`` and ``InfectorIndex``
+        self.epoch = default_epoch
+        self.infector_index = None
 
     @property
     def name(self) -> str:
@@ -130,7 +134,9 @@ class Group(AbstractGroup):
         """
         # if not dynamic:
         self[subgroup_type].append(person)
-        if activity is not None:
+        if activity == "leisure":
+            person.leisure = self[subgroup_type]
+        elif activity is not None:
             setattr(person.subgroups, activity, self[subgroup_type])
 
     @property
@@ -0,0 +1,30 @@
+from collections import defaultdict
+
+
+class InfectorIndex:
+    """
+    Keeps track, as people are appended to subgroups, of the groups that contain
+    at least one infected person. Early in an epidemic almost no group has an
+    infector, so the simulator only needs to run the interaction on the groups of
+    this index (and on the ones visited by infected people from other domains).
+
+    Each simulator owns an index, which it sets as the ``infector_index`` of the
+    groups of its world, so that ``Subgroup.append`` fills it. The simulator
+    empties it in ``Simulator.clear_world``, when all groups are emptied.
+    """
+
+    __slots__ = ("groups_with_infectors",)
+
+    def __init__(self):
+        # spec -> group id -> group
+        self.groups_with_infectors = defaultdict(dict)
+
+    def add(self, group: "Group", person: "Person"):
+        if person.infection is not None:
+            self.groups_with_infectors[group.spec][group.id] = group
+
+    def clear(self):
+        self.groups_with_infectors.clear()
+
+    def get_groups_with_infectors(self, spec: str) -> list:
+        return list(self.groups_with_infectors.get(spec, {}).values())
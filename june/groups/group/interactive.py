@@ -59,11 +59,9 @@ class InteractiveGroup:
             subgroup_size = len(subgroup.people)
             if subgroup.subgroup_type in people_from_abroad:
                 people_abroad_data = people_from_abroad[subgroup.subgroup_type]
-                people_abroad_ids = people_abroad_data.keys()
-                subgroup_size += len(people_abroad_ids)
+                subgroup_size += len(people_abroad_data)
             else:
                 people_abroad_data = None
-                people_abroad_ids = []
             if subgroup_size == 0:
                 continue
             self.subgroup_sizes[subgroup_index] = subgroup_size
@@ -77,16 +75,12 @@ class InteractiveGroup:
                         person.id
                     ] = person.immunity.susceptibility_dict
             # from abroad
-            for id in people_abroad_ids:
-                if people_abroad_data[id]["susc"]:
-                    dd = {
-                        key: value
-                        for key, value in zip(
-                            people_abroad_data[id]["immunity_inf_ids"],
-                            people_abroad_data[id]["immunity_suscs"],
-                        )
-                    }
-                    self.susceptibles_per_subgroup[subgroup_index][id] = dd
+            if people_abroad_data is not None:
+                abroad_ids = people_abroad_data.ids.tolist()
+                for index in np.flatnonzero(people_abroad_data.data["susc"]):
+                    self.susceptibles_per_subgroup[subgroup_index][
+                        abroad_ids[index]
+                    ] = people_abroad_data.susceptibility_dict(index)
 
             # Get infectors
             for person in subgroup:
@@ -98,15 +92,16 @@ class InteractiveGroup:
                     self.infectors_per_infection_per_subgroup[infection_id][
                         subgroup_index
                     ]["trans_probs"].append(person.infection.transmission.probability)
-            for id in people_abroad_ids:
-                if people_abroad_data[id]["inf_id"] != 0:
-                    infection_id = people_abroad_data[id]["inf_id"]
+            if people_abroad_data is not None:
+                data = people_abroad_data.data
+                for index in np.flatnonzero(data["inf_id"] != 0):
+                    infection_id = int(data["inf_id"][index])
                     self.infectors_per_infection_per_subgroup[infection_id][
                         subgroup_index
-                    ]["ids"].append(id)
+                    ]["ids"].append(int(data["id"][index]))
                     self.infectors_per_infection_per_subgroup[infection_id][
                         subgroup_index
-                    ]["trans_probs"].append(people_abroad_data[id]["inf_prob"])
+                    ]["trans_probs"].append(float(data["inf_prob"][index]))
         self.must_timestep = self.has_susceptible and self.has_infectors
         self.size = group_size
 
@@ -152,14 +147,39 @@ class InteractiveGroup:
     def get_processed_contact_matrix(self, contact_matrix):
         return contact_matrix
 
+    @property
+    def contact_matrix_key(self):
+        """
+        Hashable description of what the processed contact matrix depends on
+        besides the raw contact matrix of the spec, used to cache it. Groups whose
+        processed matrix is the raw one share a single entry.
+        """
+        return None
+
     @property
     def spec(self):
         return self.group.spec
 
+    @property
+    def beta_key(self):
+        """
+        Hashable description of what the processed beta depends on besides the
+        region, so that it can be computed once per time step for all the groups
+        sharing it (see ``Interaction.get_beta``).
+        """
+        return self.spec
+
     @property
     def super_area(self):
         return self.group.super_area
 
+    @property
+    def region(self):
+        super_area = getattr(self.group, "super_area", None)
+        if super_area is None:
+            return None
+        return super_area.region
+
     @property
     def regional_compliance(self):
         return self.group.super_area.region.regional_compliance
@@ -171,3 +191,18 @@ class InteractiveGroup:
     @property
     def has_infectors(self):
         return bool(self.infectors_per_infection_per_subgroup)
+
+    @property
+    def n_infectious_pairs(self):
+        """
+        Number of (infector, susceptible) pairs whose transmission is evaluated.
+        """
+        n_infectors = sum(
+            len(infectors["ids"])
+            for infectors_per_subgroup in self.infectors_per_infection_per_subgroup.values()
+            for infectors in infectors_per_subgroup.values()
+        )
+        n_susceptibles = sum(
+            len(susceptibles) for susceptibles in self.susceptibles_per_subgroup.values()
+        )
+        return n_infectors * n_susceptibles
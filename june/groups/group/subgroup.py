@@ -9,16 +9,31 @@ class Subgroup(AbstractGroup):
     __slots__ = (
         "group",
         "subgroup_type",
-        "people",
+        "_people",
+        "_epoch",
     )
 
     def __init__(self, group, subgroup_type: int):
         """
         A group within a group. For example, children in a household.
+        People appended are members until the epoch advances (see ``june.epoch``),
+        subgroups no one was appended to keep their people.
         """
         self.group = group
         self.subgroup_type = subgroup_type
-        self.people = []
+        self._people = []
+        self._epoch = None
+
+    @property
+    def people(self) -> List[Person]:
+        if self._epoch is not None and self._epoch != self.group.epoch.value:
+            self._people = []
+            self._epoch = None
+        return self._people
+
+    @people.setter
+    def people(self, people: List[Person]):
+        self._people = people
 
     def _collate(self, attribute: str) -> List[Person]:
         return [person for person in self.people if getattr(person, attribute)]
@@ -61,7 +76,8 @@ class Subgroup(AbstractGroup):
         return len(self.people)
 
     def clear(self):
-        self.people = []
+        self._people = []
+        self._epoch = None
 
     @property
     def contains_people(self) -> bool:
@@ -75,7 +91,11 @@ class Subgroup(AbstractGroup):
         Add a person to this group
         """
         self.people.append(person)
+        self._epoch = self.group.epoch.value
         person.busy = True
+        infector_index = self.group.infector_index
+        if infector_index is not None:
+            infector_index.add(self.group, person)
 
     def remove(self, person: Person):
         self.people.remove(person)
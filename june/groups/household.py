@@ -6,6 +6,7 @@ import h5py
 
 from june.groups import Group, Supergroup, ExternalSubgroup, ExternalGroup
 from june.groups.group.interactive import InteractiveGroup
+from june.utils.random_streams import RandomSource
 
 from enum import IntEnum
 from typing import List
@@ -31,9 +32,9 @@ class Household(Group):
         "residents",
         "quarantine_starting_date",
         "residences_to_visit",
-        "being_visited",
+        "being_visited_epoch",
         "household_to_care",
-        "receiving_care"
+        "receiving_care_epoch",
     )
 
     class SubgroupType(IntEnum):
@@ -55,8 +56,40 @@ class Household(Group):
         self.residents = ()
         self.residences_to_visit = defaultdict(tuple)
         self.household_to_care = None
-        self.being_visited = False  # this is True when people from other households have been added to the group
-        self.receiving_care = False
+        # epochs in which people from other households visit, or carers come
+        self.being_visited_epoch = -1
+        self.receiving_care_epoch = -1
+
+    @property
+    def being_visited(self):
+        """
+        True when people from other households have been added to the group.
+        """
+        return self.being_visited_epoch == self.epoch.value
+
+    @being_visited.setter
+    def being_visited(self, value: bool):
+        self.being_visited_epoch = self.epoch.value if value else -1
+
+    @property
+    def receiving_care(self):
+        return self.receiving_care_epoch == self.epoch.value
+
+    @receiving_care.setter
+    def receiving_care(self, value: bool):
+        self.receiving_care_epoch = self.epoch.value if value else -1
+
+    @property
+    def beta_key(self):
+        """
+        Key of the beta of the household this time step, care visits take
+        precedence over household visits.
+        """
+        if self.receiving_care:
+            return "care_visits"
+        elif self.being_visited:
+            return "household_visits"
+        return "household"
 
     def _get_leisure_subgroup_for_person(self, person):
         if person.age < 18:
@@ -72,7 +105,7 @@ class Household(Group):
     def add(self, person, subgroup_type=SubgroupType.adults, activity="residence"):
         if activity == "leisure":
             subgroup_type = self.get_leisure_subgroup_type(person)
-            person.subgroups.leisure = self[subgroup_type]
+            person.leisure = self[subgroup_type]
             self[subgroup_type].append(person)
             self.being_visited = True
         elif activity == "residence":
@@ -118,10 +151,10 @@ class Household(Group):
                         if ret:
                             # person active somewhere else, let's not disturb them
                             continue
-                    mate.subgroups.leisure = mate.residence
+                    mate.leisure = mate.residence
                     mate.residence.append(mate)
             else:
-                mate.subgroups.leisure = (
+                mate.leisure = (
                     mate.residence  # person will be added later in the simulator.
                 )
 
@@ -149,7 +182,18 @@ class Household(Group):
     def n_residents(self):
         return len(self.residents)
 
-    def quarantine(self, time, quarantine_days, household_compliance):
+    def quarantine(
+        self,
+        time,
+        quarantine_days,
+        household_compliance,
+        person=None,
+        random_source: RandomSource = None,
+    ):
+        """
+        Whether a resident, ``person`` if given, complies with the quarantine of the
+        household. The number is drawn from ``random_source`` if given.
+        """
         if self.type == "communal":
             return False
         if self.quarantine_starting_date:
@@ -158,7 +202,13 @@ class Household(Group):
                 < time
                 < self.quarantine_starting_date + quarantine_days
             ):
-                return random() < household_compliance
+                if random_source is None:
+                    return random() < household_compliance
+                key = self.id if person is None else person.id
+                return (
+                    random_source.random("household.quarantine", key)
+                    < household_compliance
+                )
         return False
 
     @property
@@ -192,6 +242,10 @@ class Households(Supergroup):
 
 
 class InteractiveHousehold(InteractiveGroup):
+    @property
+    def beta_key(self):
+        return self.group.beta_key
+
     def get_processed_beta(self, betas, beta_reductions):
         """
         In the case of households, we need to apply the beta reduction of household visits
@@ -17,6 +17,7 @@ from june.groups.leisure import (
 from june.groups.leisure import Pubs, Cinemas, Groceries
 from june.groups import Household, ExternalSubgroup, Households
 from june.utils import random_choice_numba
+from june.utils.random_streams import RandomSource
 from june import paths
 
 
@@ -25,6 +26,19 @@ default_config_filename = paths.configs_path / "config_example.yaml"
 logger = logging.getLogger("leisure")
 
 
+def _can_visit(world, social_venues, spec):
+    """
+    Whether the people of the world can go to social venues of this spec. The
+    venues visited by the people of a domain may all be in other domains, then
+    the people still need the distributor to go to them.
+    """
+    if len(social_venues) > 0:
+        return True
+    return any(
+        area.social_venues.get(spec) for area in getattr(world, "areas", None) or ()
+    )
+
+
 def generate_leisure_for_world(list_of_leisure_groups, world):
     """
     Generates an instance of the leisure class for the specified geography and leisure groups.
@@ -35,38 +49,19 @@ def generate_leisure_for_world(list_of_leisure_groups, world):
         list of names of the lesire groups desired. Ex: ["pubs", "cinemas"]
     """
     leisure_distributors = {}
-    if "pubs" in list_of_leisure_groups:
-        if not hasattr(world, "pubs") or world.pubs is None or len(world.pubs) == 0:
-            logger.warning("No pubs in this world/domain")
-        else:
-            leisure_distributors["pub"] = PubDistributor.from_config(world.pubs)
-    if "gyms" in list_of_leisure_groups:
-        if not hasattr(world, "gyms") or world.gyms is None or len(world.gyms) == 0:
-            logger.warning("No gyms in this world/domain")
-        else:
-            leisure_distributors["gym"] = GymDistributor.from_config(world.gyms)
-    if "cinemas" in list_of_leisure_groups:
-        if (
-            not hasattr(world, "cinemas")
-            or world.cinemas is None
-            or len(world.cinemas) == 0
-        ):
-            logger.warning("No cinemas in this world/domain")
-        else:
-            leisure_distributors["cinema"] = CinemaDistributor.from_config(
-                world.cinemas
-            )
-    if "groceries" in list_of_leisure_groups:
-        if (
-            not hasattr(world, "groceries")
-            or world.groceries is None
-            or len(world.groceries) == 0
-        ):
-            logger.warning("No groceries in this world/domain")
+    for super_group_name, spec, distributor_class in (
+        ("pubs", "pub", PubDistributor),
+        ("gyms", "gym", GymDistributor),
+        ("cinemas", "cinema", CinemaDistributor),
+        ("groceries", "grocery", GroceryDistributor),
+    ):
+        if super_group_name not in list_of_leisure_groups:
+            continue
+        social_venues = getattr(world, super_group_name, None)
+        if social_venues is None or not _can_visit(world, social_venues, spec):
+            logger.warning(f"No {super_group_name} in this world/domain")
         else:
-            leisure_distributors["grocery"] = GroceryDistributor.from_config(
-                world.groceries
-            )
+            leisure_distributors[spec] = distributor_class.from_config(social_venues)
     if (
         "household_visits" in list_of_leisure_groups
         or "care_home_visits" in list_of_leisure_groups
@@ -105,6 +100,8 @@ class Leisure:
     Class to manage all possible activites that happen during leisure time.
     """
 
+    random_source = RandomSource()
+
     def __init__(
         self,
         leisure_distributors: Dict[str, SocialVenueDistributor],
@@ -192,9 +189,13 @@ class Leisure:
         if person.residence.group.spec == "care_home":
             return
         prob_age_sex = self._get_activity_probabilities_for_person(person=person)
-        if random() < prob_age_sex["does_activity"]:
-            activity_idx = random_choice_numba(
-                arr=np.arange(0, len(prob_age_sex["activities"])),
+        if (
+            self.random_source.random("leisure.does_activity", person.id)
+            < prob_age_sex["does_activity"]
+        ):
+            activity_idx = self.random_source.choice(
+                "leisure.activity",
+                person.id,
                 prob=np.array(list(prob_age_sex["activities"].values())),
             )
             activity = list(prob_age_sex["activities"].keys())[activity_idx]
@@ -202,7 +203,7 @@ class Leisure:
             subgroup = activity_distributor.get_leisure_subgroup(
                 person, to_send_abroad=to_send_abroad
             )
-            person.subgroups.leisure = subgroup
+            person.leisure = subgroup
             activity_distributor.send_household_with_person_if_necessary(
                 person=person, to_send_abroad=to_send_abroad
             )
@@ -344,7 +345,10 @@ class Leisure:
                 prob = self.probabilities_by_region_sex_age[
                     list(self.probabilities_by_region_sex_age.keys())[0]
                 ][person.sex][person.age]["drags_household"][activity]
-        return random() < prob
+        return (
+            self.random_source.random(f"leisure.{activity}.drags_household", person.id)
+            < prob
+        )
 
     def _get_activity_probabilities_for_person(self, person: Person):
         try:
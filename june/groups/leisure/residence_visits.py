@@ -5,7 +5,6 @@ from numpy.random import choice
 
 from june.groups.leisure import SocialVenueDistributor
 from june.paths import configs_path
-from june.utils import random_choice_numba
 
 default_config_filename = configs_path / "defaults/groups/leisure/visits.yaml"
 
@@ -127,8 +126,9 @@ class ResidenceVisitsDistributor(SocialVenueDistributor):
             residence_type_probabilities = (
                 residence_type_probabilities / residence_type_probabilities.sum()
             )
-            type_sample = random_choice_numba(
-                tuple(range(len(residence_type_probabilities))),
+            type_sample = self.random_source.choice(
+                f"leisure.{self.spec}.residence_type",
+                person.id,
                 residence_type_probabilities,
             )
             which_type = residence_types[type_sample]
@@ -139,7 +139,11 @@ class ResidenceVisitsDistributor(SocialVenueDistributor):
         elif n_candidates == 1:
             group = candidates[0]
         else:
-            group = candidates[randint(0, n_candidates - 1)]
+            group = candidates[
+                self.random_source.randint(
+                    f"leisure.{self.spec}.residence", person.id, 0, n_candidates - 1
+                )
+            ]
         return group
 
     def get_poisson_parameter(
@@ -32,7 +32,10 @@ class SocialVenue(Group):
 
     def add(self, person, activity="leisure"):
         self.subgroups[0].append(person)
-        setattr(person.subgroups, activity, self.subgroups[0])
+        if activity == "leisure":
+            person.leisure = self.subgroups[0]
+        else:
+            setattr(person.subgroups, activity, self.subgroups[0])
 
     @property
     def super_area(self):
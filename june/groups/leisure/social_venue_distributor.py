@@ -9,6 +9,7 @@ import re
 from june.groups.leisure import SocialVenues, SocialVenue, SocialVenueError
 from june.groups import Household, ExternalSubgroup
 from june.utils.parse_probabilities import parse_age_probabilities
+from june.utils.random_streams import RandomSource
 from june.geography import Area
 
 
@@ -25,6 +26,8 @@ class SocialVenueDistributor:
     Tool to associate social venues to people.
     """
 
+    random_source = RandomSource()
+
     def __init__(
         self,
         social_venues: SocialVenues,
@@ -215,7 +218,11 @@ class SocialVenueDistributor:
         elif n_candidates == 1:
             group = candidates[0]
         else:
-            group = candidates[randint(0, n_candidates - 1)]
+            group = candidates[
+                self.random_source.randint(
+                    f"leisure.{self.spec}.venue", person.id, 0, n_candidates - 1
+                )
+            ]
         return group
 
     def get_leisure_subgroup(self, person, to_send_abroad=None):
@@ -230,11 +237,14 @@ class SocialVenueDistributor:
         )
         return subgroup
 
-    def person_drags_household(self):
+    def person_drags_household(self, person):
         """
         Check whether person drags household or not.
         """
-        return random() < self.drags_household_probability
+        return (
+            self.random_source.random(f"leisure.{self.spec}.drags_household", person.id)
+            < self.drags_household_probability
+        )
 
     def send_household_with_person_if_necessary(self, person, to_send_abroad=None):
         """
@@ -248,7 +258,7 @@ class SocialVenueDistributor:
         ):
             return
         subgroup = person.leisure
-        if self.person_drags_household():
+        if self.person_drags_household(person):
             for mate in person.residence.group.residents:
                 if mate != person:
                     if mate.busy:
@@ -269,6 +279,6 @@ class SocialVenueDistributor:
                                 subgroup.append(mate)
                             else:
                                 to_send_abroad.add_person(mate, subgroup)
-                    mate.subgroups.leisure = (
+                    mate.leisure = (
                         subgroup  # person will be added later in the simulator.
                     )
@@ -469,6 +469,10 @@ class InteractiveSchool(InteractiveGroup):
         # If same age but different class room, reduce contacts
         return processed_contact_matrix
 
+    @property
+    def contact_matrix_key(self):
+        return tuple(int(year) for year in self.school_years)
+
     def get_processed_contact_matrix(self, contact_matrix):
         n_school_years = len(self.school_years)
         n_subgroups = n_school_years + 1
@@ -494,18 +498,22 @@ class InteractiveSchool(InteractiveGroup):
                             ret[i, j] = contact_matrix[year_idx_i, year_idx_j]
         return ret
 
+    @property
+    def beta_key(self):
+        if self.sector is None:
+            return "school"
+        elif "secondary" in self.sector:
+            return "secondary_school"
+        else:
+            return "primary_school"
+
     def get_processed_beta(self, betas, beta_reductions):
         """
         Returns the processed contact intensity, by taking into account the policies
         beta reductions and regional compliance. This is a group method as different interactive
         groups may choose to treat this differently.
         """
-        if self.sector is None:
-            spec = "school"
-        elif "secondary" in self.sector:
-            spec = "secondary_school"
-        else:
-            spec = "primary_school"
+        spec = self.beta_key
         if spec in betas:
             beta = betas[spec]
         else:
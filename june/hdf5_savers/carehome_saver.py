@@ -3,7 +3,7 @@ import numpy as np
 
 from june.groups import CareHome, CareHomes
 from june.world import World
-from .utils import read_dataset
+from .utils import read_dataset, write_location_index, get_read_ranges
 
 nan_integer = -999
 
@@ -80,6 +80,10 @@ def save_care_homes_to_hdf5(
                 care_homes_dset["n_residents"][idx1:idx2] = n_residents
                 care_homes_dset["n_workers"].resize(newshape)
                 care_homes_dset["n_workers"][idx1:idx2] = n_workers
+        if n_care_homes > 0:
+            write_location_index(
+                care_homes_dset, read_dataset(care_homes_dset["super_area"])
+            )
 
 
 def load_care_homes_from_hdf5(file_path: str, chunk_size=50000, domain_super_areas=None):
@@ -93,10 +97,10 @@ def load_care_homes_from_hdf5(file_path: str, chunk_size=50000, domain_super_are
         care_homes = f["care_homes"]
         care_homes_list = []
         n_carehomes = care_homes.attrs["n_care_homes"]
-        n_chunks = int(np.ceil(n_carehomes / chunk_size))
-        for chunk in range(n_chunks):
-            idx1 = chunk * chunk_size
-            idx2 = min((chunk + 1) * chunk_size, n_carehomes)
+        read_ranges = get_read_ranges(
+            care_homes, n_carehomes, chunk_size, domain_super_areas
+        )
+        for idx1, idx2 in read_ranges:
             length = idx2 - idx1
             ids = read_dataset(care_homes["id"], idx1, idx2)
             n_residents = read_dataset(care_homes["n_residents"], idx1, idx2)
@@ -132,10 +136,10 @@ def restore_care_homes_properties_from_hdf5(
         carehomes = f["care_homes"]
         carehomes_list = []
         n_carehomes = carehomes.attrs["n_care_homes"]
-        n_chunks = int(np.ceil(n_carehomes / chunk_size))
-        for chunk in range(n_chunks):
-            idx1 = chunk * chunk_size
-            idx2 = min((chunk + 1) * chunk_size, n_carehomes)
+        read_ranges = get_read_ranges(
+            carehomes, n_carehomes, chunk_size, domain_super_areas
+        )
+        for idx1, idx2 in read_ranges:
             ids = carehomes["id"][idx1:idx2]
             areas = carehomes["area"][idx1:idx2]
             super_areas = carehomes["super_area"][idx1:idx2]
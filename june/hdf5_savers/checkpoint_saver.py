@@ -196,6 +196,11 @@ def restore_simulator_to_checkpoint(
     """
     people_ids = set(world.people.people_ids)
     checkpoint_data = load_checkpoint_from_hdf5(checkpoint_path, chunk_size=chunk_size)
+    # restore timer
+    checkpoint_date = datetime.strptime(checkpoint_data["date"], "%Y-%m-%d")
+    # we need to start the next day
+    checkpoint_date += timedelta(days=1)
+    simulator.timer.reset_to_new_date(checkpoint_date)
     for dead_id in checkpoint_data["dead_id"]:
         if dead_id not in people_ids:
             continue
@@ -211,18 +216,20 @@ def restore_simulator_to_checkpoint(
             if infected_id not in people_ids:
                 continue
             person = simulator.world.people.get_from_id(infected_id)
+            # the transmission probability is not saved
+            infection.transmission.update_infection_probability(
+                time_from_infection=simulator.timer.now - infection.start_time
+            )
             person.infection = infection
     # restore immunities
     for person_id, immunity in zip(
         checkpoint_data["people_id"], checkpoint_data["immunity_list"]
     ):
+        if person_id not in people_ids:
+            continue
         person = world.people.get_from_id(person_id)
         person.immunity = immunity
-    # restore timer
-    checkpoint_date = datetime.strptime(checkpoint_data["date"], "%Y-%m-%d")
-    # we need to start the next day
-    checkpoint_date += timedelta(days=1)
-    simulator.timer.reset_to_new_date(checkpoint_date)
+        world.people.update_state(person)
     return simulator
 
 
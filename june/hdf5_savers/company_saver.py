@@ -5,7 +5,7 @@ import logging
 from june.groups import Company, Companies
 from june.world import World
 from june.mpi_setup import mpi_rank
-from .utils import read_dataset
+from .utils import read_dataset, write_location_index, get_read_ranges
 
 nan_integer = -999
 
@@ -82,6 +82,10 @@ def save_companies_to_hdf5(
                 companies_dset["sector"][idx1:idx2] = sectors
                 companies_dset["n_workers_max"].resize(newshape)
                 companies_dset["n_workers_max"][idx1:idx2] = n_workers_max
+        if n_companies > 0:
+            write_location_index(
+                companies_dset, read_dataset(companies_dset["super_area"])
+            )
 
 
 def load_companies_from_hdf5(file_path: str, chunk_size=50000, domain_super_areas=None):
@@ -96,11 +100,12 @@ def load_companies_from_hdf5(file_path: str, chunk_size=50000, domain_super_area
         companies = f["companies"]
         companies_list = []
         n_companies = companies.attrs["n_companies"]
-        n_chunks = int(np.ceil(n_companies / chunk_size))
-        for chunk in range(n_chunks):
+        read_ranges = get_read_ranges(
+            companies, n_companies, chunk_size, domain_super_areas
+        )
+        n_chunks = len(read_ranges)
+        for chunk, (idx1, idx2) in enumerate(read_ranges):
             logger.info(f"Companies chunk {chunk} of {n_chunks}")
-            idx1 = chunk * chunk_size
-            idx2 = min((chunk + 1) * chunk_size, n_companies)
             length = idx2 - idx1
             ids = read_dataset(companies["id"], idx1, idx2)
             sectors = read_dataset(companies["sector"], idx1, idx2)
@@ -132,10 +137,10 @@ def restore_companies_properties_from_hdf5(
         companies = f["companies"]
         companies_list = []
         n_companies = companies.attrs["n_companies"]
-        n_chunks = int(np.ceil(n_companies / chunk_size))
-        for chunk in range(n_chunks):
-            idx1 = chunk * chunk_size
-            idx2 = min((chunk + 1) * chunk_size, n_companies)
+        read_ranges = get_read_ranges(
+            companies, n_companies, chunk_size, domain_super_areas
+        )
+        for idx1, idx2 in read_ranges:
             length = idx2 - idx1
             ids = read_dataset(companies["id"], idx1, idx2)
             super_areas = read_dataset(companies["super_area"], idx1, idx2)
@@ -3,7 +3,7 @@ import numpy as np
 
 from june.world import World
 from june.groups import Hospital, Hospitals, ExternalHospital
-from .utils import read_dataset
+from .utils import read_dataset, write_location_index, get_read_ranges
 
 nan_integer = -999
 
@@ -105,6 +105,10 @@ def save_hospitals_to_hdf5(
                 hospitals_dset["n_icu_beds"][idx1:idx2] = n_icu_beds
                 hospitals_dset["coordinates"].resize(newshape[0], axis=0)
                 hospitals_dset["coordinates"][idx1:idx2] = coordinates
+        if n_hospitals > 0:
+            write_location_index(
+                hospitals_dset, read_dataset(hospitals_dset["super_area"])
+            )
 
 
 def load_hospitals_from_hdf5(
@@ -124,6 +128,8 @@ def load_hospitals_from_hdf5(
         hospitals_list = []
         chunk_size = 50000
         n_hospitals = hospitals.attrs["n_hospitals"]
+        # every hospital is read, the ones outside the domain become external
+        # hospitals that patients can be sent to
         n_chunks = int(np.ceil(n_hospitals / chunk_size))
         for chunk in range(n_chunks):
             idx1 = chunk * chunk_size
@@ -183,10 +189,10 @@ def restore_hospital_properties_from_hdf5(
         hospitals = f["hospitals"]
         hospitals_list = []
         n_hospitals = hospitals.attrs["n_hospitals"]
-        n_chunks = int(np.ceil(n_hospitals / chunk_size))
-        for chunk in range(n_chunks):
-            idx1 = chunk * chunk_size
-            idx2 = min((chunk + 1) * chunk_size, n_hospitals)
+        read_ranges = get_read_ranges(
+            hospitals, n_hospitals, chunk_size, domain_super_areas
+        )
+        for idx1, idx2 in read_ranges:
             length = idx2 - idx1
             ids = np.empty(length, dtype=int)
             hospitals["id"].read_direct(ids, np.s_[idx1:idx2], np.s_[0:length])
@@ -7,7 +7,7 @@ from itertools import chain
 from june.world import World
 from june.groups import Household, Households, ExternalGroup
 from june.mpi_setup import mpi_rank
-from .utils import read_dataset
+from .utils import read_dataset, write_location_index, get_read_ranges
 
 nan_integer = -999
 
@@ -25,6 +25,7 @@ def save_households_to_hdf5(
     Saves the households object to hdf5 format file ``file_path``. Currently for each person,
     the following values are stored:
     - id, n_beds, n_icu_beds, super_area, coordinates
+    Households are stored sorted by super area, together with an offset index.
 
     Parameters
     ----------
@@ -38,6 +39,15 @@ def save_households_to_hdf5(
     """
     n_households = len(households)
     n_chunks = int(np.ceil(n_households / chunk_size))
+    households_super_areas = np.array(
+        [
+            nan_integer if household.area is None else household.super_area.id
+            for household in households
+        ],
+        dtype=np.int64,
+    )
+    order = np.argsort(households_super_areas, kind="stable")
+    households = [households[i] for i in order]
     with h5py.File(file_path, "a") as f:
         households_dset = f.create_group("households")
         for chunk in range(n_chunks):
@@ -147,6 +157,7 @@ def save_households_to_hdf5(
             "residences_to_visit_super_areas",
             data=residences_to_visit_super_areas,
         )
+        write_location_index(households_dset, households_super_areas[order])
 
 
 def load_households_from_hdf5(
@@ -163,11 +174,12 @@ def load_households_from_hdf5(
     with h5py.File(file_path, "r", libver="latest", swmr=True) as f:
         households = f["households"]
         n_households = households.attrs["n_households"]
-        n_chunks = int(np.ceil(n_households / chunk_size))
-        for chunk in range(n_chunks):
+        read_ranges = get_read_ranges(
+            households, n_households, chunk_size, domain_super_areas
+        )
+        n_chunks = len(read_ranges)
+        for chunk, (idx1, idx2) in enumerate(read_ranges):
             logger.info(f"Loaded chunk {chunk} of {n_chunks}")
-            idx1 = chunk * chunk_size
-            idx2 = min((chunk + 1) * chunk_size, n_households)
             length = idx2 - idx1
             ids = read_dataset(households["id"], idx1, idx2)
             types = read_dataset(households["type"], idx1, idx2)
@@ -207,11 +219,12 @@ def restore_households_properties_from_hdf5(
     with h5py.File(file_path, "r", libver="latest", swmr=True) as f:
         households = f["households"]
         n_households = households.attrs["n_households"]
-        n_chunks = int(np.ceil(n_households / chunk_size))
-        for chunk in range(n_chunks):
+        read_ranges = get_read_ranges(
+            households, n_households, chunk_size, domain_super_areas
+        )
+        n_chunks = len(read_ranges)
+        for chunk, (idx1, idx2) in enumerate(read_ranges):
             logger.info(f"Restored chunk {chunk} of {n_chunks}")
-            idx1 = chunk * chunk_size
-            idx2 = min((chunk + 1) * chunk_size, n_households)
             length = idx2 - idx1
             ids = read_dataset(households["id"], idx1, idx2)
             super_areas = read_dataset(households["super_area"], idx1, idx2)
@@ -2,7 +2,7 @@ import h5py
 import numpy as np
 from typing import List
 
-from .utils import read_dataset
+from .utils import read_dataset, write_location_index, get_read_ranges
 from june.groups.leisure import (
     Pub,
     Pubs,
@@ -45,6 +45,7 @@ def save_social_venues_to_hdf5(social_venues_list: List[SocialVenues], file_path
             social_venues_dset.create_dataset("id", data=ids)
             social_venues_dset.create_dataset("coordinates", data=coordinates)
             social_venues_dset.create_dataset("area", data=areas)
+            write_location_index(social_venues_dset, areas, index_name="area_index")
 
 
 def load_social_venues_from_hdf5(file_path: str, domain_areas=None):
@@ -57,22 +58,25 @@ def load_social_venues_from_hdf5(file_path: str, domain_areas=None):
             if n == 0:
                 social_venues_dict[spec] = None
                 continue
-            ids = read_dataset(data["id"])
-            coordinates = read_dataset(data["coordinates"])
-            areas = read_dataset(data["area"])
-            for k in range(n):
-                if domain_areas is not None:
-                    area = areas[k]
-                    if area == nan_integer:
-                        raise ValueError(
-                            "if ``domain_areas`` is True, I expect not Nones super areas."
-                        )
-                    if area not in domain_areas:
-                        continue
-                social_venue = spec_to_group_dict[spec]()
-                social_venue.id = ids[k]
-                social_venue.coordinates = coordinates[k]
-                social_venues.append(social_venue)
+            for idx1, idx2 in get_read_ranges(
+                data, n, n, domain_areas, index_name="area_index"
+            ):
+                ids = read_dataset(data["id"], idx1, idx2)
+                coordinates = read_dataset(data["coordinates"], idx1, idx2)
+                areas = read_dataset(data["area"], idx1, idx2)
+                for k in range(idx2 - idx1):
+                    if domain_areas is not None:
+                        area = areas[k]
+                        if area == nan_integer:
+                            raise ValueError(
+                                "if ``domain_areas`` is True, I expect not Nones super areas."
+                            )
+                        if area not in domain_areas:
+                            continue
+                    social_venue = spec_to_group_dict[spec]()
+                    social_venue.id = ids[k]
+                    social_venue.coordinates = coordinates[k]
+                    social_venues.append(social_venue)
             social_venues_dict[spec] = spec_to_supergroup_dict[spec](social_venues)
         return social_venues_dict
 
@@ -87,22 +91,25 @@ def restore_social_venues_properties_from_hdf5(
             if n == 0:
                 continue
             social_venues = getattr(world, spec)
-            ids = read_dataset(data["id"])
-            areas = read_dataset(data["area"])
-            for k in range(n):
-                if domain_areas is not None:
+            for idx1, idx2 in get_read_ranges(
+                data, n, n, domain_areas, index_name="area_index"
+            ):
+                ids = read_dataset(data["id"], idx1, idx2)
+                areas = read_dataset(data["area"], idx1, idx2)
+                for k in range(idx2 - idx1):
+                    if domain_areas is not None:
+                        area = areas[k]
+                        if area == nan_integer:
+                            raise ValueError(
+                                "if ``domain_areas`` is True, I expect not Nones super areas."
+                            )
+                        if area not in domain_areas:
+                            continue
+                    social_venue = social_venues.get_from_id(ids[k])
                     area = areas[k]
                     if area == nan_integer:
-                        raise ValueError(
-                            "if ``domain_areas`` is True, I expect not Nones super areas."
-                        )
-                    if area not in domain_areas:
-                        continue
-                social_venue = social_venues.get_from_id(ids[k])
-                area = areas[k]
-                if area == nan_integer:
-                    area = None
-                else:
-                    area = world.areas.get_from_id(area)
-                social_venue.area = area
+                        area = None
+                    else:
+                        area = world.areas.get_from_id(area)
+                    social_venue.area = area
 
@@ -4,7 +4,7 @@ from collections import OrderedDict
 import logging
 
 
-from .utils import read_dataset
+from .utils import read_dataset, write_location_index, get_read_ranges
 from june.groups import ExternalSubgroup, ExternalGroup
 from june.groups.travel import ModeOfTransport
 from june.demography import Population, Person
@@ -38,6 +38,8 @@ def save_population_to_hdf5(
     Saves the Population object to hdf5 format file ``file_path``. Currently for each person,
     the following values are stored:
     - id, age, sex, ethnicity, area, subgroup memberships ids, housemate ids, mode_of_transport,
+    People are stored sorted by super area, together with an offset index so that
+    each domain can read only the rows of its super areas.
 
     Parameters
     ----------
@@ -51,6 +53,15 @@ def save_population_to_hdf5(
     """
     n_people = len(population.people)
     n_chunks = int(np.ceil(n_people / chunk_size))
+    people_super_areas = np.array(
+        [
+            nan_integer if person.area is None else person.area.super_area.id
+            for person in population.people
+        ],
+        dtype=np.int64,
+    )
+    order = np.argsort(people_super_areas, kind="stable")
+    people = [population.people[i] for i in order]
     with h5py.File(file_path, "a") as f:
         people_dset = f.create_group("population")
         for chunk in range(n_chunks):
@@ -75,7 +86,7 @@ def save_population_to_hdf5(
             mode_of_transport_is_public = []
             lockdown_status = []
 
-            for person in population.people[idx1:idx2]:
+            for person in people[idx1:idx2]:
                 ids.append(person.id)
                 ages.append(person.age)
                 sexes.append(person.sex.encode("ascii", "ignore"))
@@ -122,7 +133,7 @@ def save_population_to_hdf5(
                 stypes = []
                 specs = []
                 group_super_areas_temp = []
-                for subgroup in person.subgroups.iter():
+                for subgroup in person.iter_subgroups():
                     if subgroup is None:
                         gids.append(nan_integer)
                         stypes.append(nan_integer)
@@ -276,6 +287,7 @@ def save_population_to_hdf5(
                 ] = mode_of_transport_is_public
                 people_dset["lockdown_status"].resize(newshape)
                 people_dset["lockdown_status"][idx1:idx2] = lockdown_status
+        write_location_index(people_dset, people_super_areas[order])
 
 
 def load_population_from_hdf5(
@@ -294,11 +306,12 @@ def load_population_from_hdf5(
         population = f["population"]
         # read in chunks of 100k people
         n_people = population.attrs["n_people"]
-        n_chunks = int(np.ceil(n_people / chunk_size))
-        for chunk in range(n_chunks):
+        read_ranges = get_read_ranges(
+            population, n_people, chunk_size, domain_super_areas
+        )
+        n_chunks = len(read_ranges)
+        for chunk, (idx1, idx2) in enumerate(read_ranges):
             logger.info(f"Loaded chunk {chunk} of {n_chunks}")
-            idx1 = chunk * chunk_size
-            idx2 = min((chunk + 1) * chunk_size, n_people)
             length = idx2 - idx1
             ids = read_dataset(population["id"], idx1, idx2)
             ages = read_dataset(population["age"], idx1, idx2)
@@ -373,11 +386,12 @@ def restore_population_properties_from_hdf5(
         population = f["population"]
         # read in chunks of 100k people
         n_people = population.attrs["n_people"]
-        n_chunks = int(np.ceil(n_people / chunk_size))
-        for chunk in range(n_chunks):
+        read_ranges = get_read_ranges(
+            population, n_people, chunk_size, domain_super_areas
+        )
+        n_chunks = len(read_ranges)
+        for chunk, (idx1, idx2) in enumerate(read_ranges):
             logger.info(f"Restored chunk {chunk} of {n_chunks}")
-            idx1 = chunk * chunk_size
-            idx2 = min((chunk + 1) * chunk_size, n_people)
             length = idx2 - idx1
             ids = read_dataset(population["id"], idx1, idx2)
             group_ids = read_dataset(population["group_ids"], idx1, idx2)
@@ -3,7 +3,7 @@ import numpy as np
 
 from june.groups import Schools, School
 from june.world import World
-from .utils import read_dataset
+from .utils import read_dataset, write_location_index, get_read_ranges
 
 nan_integer = -999
 
@@ -71,7 +71,12 @@ def save_schools_to_hdf5(schools: Schools, file_path: str, chunk_size: int = 500
             super_areas = np.array(super_areas, dtype=np.int64)
             coordinates = np.array(coordinates, dtype=np.float64)
             n_classrooms = np.array(n_classrooms, dtype=np.int64)
-            years = np.array(years, dtype=int_vlen_type)
+            # filled one by one, np.array would make a 2D array if all the schools
+            # have the same number of years
+            years_array = np.empty(len(years), dtype=int_vlen_type)
+            for i, school_years in enumerate(years):
+                years_array[i] = school_years
+            years = years_array
             if chunk == 0:
                 schools_dset.attrs["n_schools"] = n_schools
                 schools_dset.create_dataset("id", data=ids, maxshape=(None,))
@@ -116,6 +121,10 @@ def save_schools_to_hdf5(schools: Schools, file_path: str, chunk_size: int = 500
                 schools_dset["n_classrooms"][idx1:idx2] = n_classrooms
                 schools_dset["years"].resize(newshape[0], axis=0)
                 schools_dset["years"][idx1:idx2] = years
+        if n_schools > 0:
+            write_location_index(
+                schools_dset, read_dataset(schools_dset["super_area"])
+            )
 
 
 def load_schools_from_hdf5(
@@ -131,10 +140,10 @@ def load_schools_from_hdf5(
         schools = f["schools"]
         schools_list = []
         n_schools = schools.attrs["n_schools"]
-        n_chunks = int(np.ceil(n_schools / chunk_size))
-        for chunk in range(n_chunks):
-            idx1 = chunk * chunk_size
-            idx2 = min((chunk + 1) * chunk_size, n_schools)
+        read_ranges = get_read_ranges(
+            schools, n_schools, chunk_size, domain_super_areas
+        )
+        for idx1, idx2 in read_ranges:
             length = idx2 - idx1
             ids = read_dataset(schools["id"], idx1, idx2)
             n_pupils_max = read_dataset(schools["n_pupils_max"], idx1, idx2)
@@ -180,10 +189,10 @@ def restore_school_properties_from_hdf5(
         schools = f["schools"]
         schools_list = []
         n_schools = schools.attrs["n_schools"]
-        n_chunks = int(np.ceil(n_schools / chunk_size))
-        for chunk in range(n_chunks):
-            idx1 = chunk * chunk_size
-            idx2 = min((chunk + 1) * chunk_size, n_schools)
+        read_ranges = get_read_ranges(
+            schools, n_schools, chunk_size, domain_super_areas
+        )
+        for idx1, idx2 in read_ranges:
             length = idx2 - idx1
             ids = read_dataset(schools["id"], idx1, idx2)
             areas = read_dataset(schools["area"], idx1, idx2)
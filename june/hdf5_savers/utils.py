@@ -28,3 +28,47 @@ def write_dataset(group, dataset_name, data, index1 = None, index2 = None):
         group[dataset_name].resize(newshape)
         group[dataset_name][index1:index2] = data
 
+
+def write_location_index(group, location_ids, index_name="super_area_index"):
+    """
+    Writes the index of the runs of consecutive rows of a group that share a
+    location (super area or area): the rows offset[i]:offset[i+1] belong to the
+    location id[i]. Rows sorted by location give a single run per location.
+    """
+    location_ids = np.asarray(location_ids, dtype=np.int64)
+    starts = np.flatnonzero(np.diff(location_ids)) + 1
+    if len(location_ids) > 0:
+        starts = np.insert(starts, 0, 0)
+    index = group.create_group(index_name)
+    index.create_dataset("id", data=location_ids[starts])
+    index.create_dataset(
+        "offset", data=np.append(starts, len(location_ids)).astype(np.int64)
+    )
+
+
+def get_read_ranges(
+    group, n_rows, chunk_size, domain_locations=None, index_name="super_area_index"
+):
+    """
+    Returns the (index1, index2) row ranges to read from the datasets of a group,
+    each at most ``chunk_size`` long. If ``domain_locations`` is given and the
+    group has a location index, only the rows of those locations are read
+    (adjacent runs are merged into one hyperslab), otherwise all the rows are.
+    """
+    if domain_locations is None or index_name not in group:
+        slices = [(0, n_rows)]
+    else:
+        index_ids = read_dataset(group[index_name]["id"])
+        offsets = read_dataset(group[index_name]["offset"])
+        slices = []
+        for i in np.flatnonzero(np.isin(index_ids, list(domain_locations))):
+            start, end = offsets[i], offsets[i + 1]
+            if slices and slices[-1][1] == start:
+                slices[-1] = (slices[-1][0], end)
+            else:
+                slices.append((start, end))
+    ranges = []
+    for start, end in slices:
+        for index1 in range(start, end, chunk_size):
+            ranges.append((int(index1), int(min(index1 + chunk_size, end))))
+    return ranges
@@ -1,2 +1,2 @@
-from .interaction import Interaction
+from .interaction import Interaction, InteractionWorkload, ContactMatrixCache
 #from .interactive_group import InteractiveGroup
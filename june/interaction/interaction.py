@@ -1,17 +1,32 @@
 import numpy as np
 import yaml
 import numba as nb
+from collections import defaultdict
 from numpy.random import choice
 from random import random
-from typing import List, Dict
+from typing import List, Dict, Optional
 from itertools import chain
+from time import perf_counter
 from typing import TYPE_CHECKING
 
 from june.exc import InteractionError
 from june.utils import parse_age_probabilities
 from june.groups.group.interactive import InteractiveGroup
-from june.groups import InteractiveSchool, InteractiveCompany, InteractiveHousehold
+from june.groups import (
+    Household,
+    InteractiveSchool,
+    InteractiveCompany,
+    InteractiveHousehold,
+)
+from june.interaction.vectorized_interaction import (
+    scan_group,
+    FlattenedGroups,
+    FlattenedHouseholds,
+    infect_flattened_groups,
+    infect_flattened_groups_parallel,
+)
 from june.records import Record
+from june.utils.random_streams import RandomStreams
 from june import paths
 
 default_config_filename = paths.configs_path / "defaults/interaction/interaction.yaml"
@@ -21,6 +36,72 @@ default_sector_beta_filename = (
 )
 
 
+class InteractionWorkload:
+    """
+    Counters of the interaction work done per group spec since the last reset:
+    groups visited, groups skipped because they had no infector or no susceptible,
+    people in the visited groups, (infector, susceptible) pairs evaluated,
+    infections produced and time spent.
+    """
+
+    fields = ("n_groups", "n_skipped", "n_people", "n_pairs", "n_infections", "time")
+
+    def __init__(self):
+        self.counters = {}
+
+    def add(self, spec: str, **counts):
+        spec_counters = self.counters.get(spec)
+        if spec_counters is None:
+            spec_counters = self.counters[spec] = dict.fromkeys(self.fields, 0)
+        for name, value in counts.items():
+            spec_counters[name] += value
+
+    def reset(self):
+        self.counters = {}
+
+
+class ContactMatrixCache:
+    """
+    Memo of the processed contact matrices of the interactive groups, keyed on the
+    group spec and the group ``contact_matrix_key`` (the school years for schools).
+    Entries are only valid for the raw matrix they were computed from, so replacing
+    a raw contact matrix invalidates them (the raw matrices already include
+    alpha_physical). The matrices returned are read-only, and the hits and misses
+    per spec are counted.
+    """
+
+    def __init__(self):
+        self.matrices = {}
+        self.hits = defaultdict(int)
+        self.misses = defaultdict(int)
+
+    def get(self, interactive_group: InteractiveGroup, contact_matrix: np.ndarray):
+        spec = interactive_group.spec
+        key = (spec, interactive_group.contact_matrix_key)
+        cached = self.matrices.get(key)
+        if cached is not None and cached[0] is contact_matrix:
+            self.hits[spec] += 1
+            return cached[1]
+        self.misses[spec] += 1
+        processed = interactive_group.get_processed_contact_matrix(contact_matrix)
+        # a view, so that the raw matrix itself stays writable
+        processed = processed.view()
+        processed.setflags(write=False)
+        self.matrices[key] = (contact_matrix, processed)
+        return processed
+
+    def hit_rates(self) -> Dict[str, float]:
+        return {
+            spec: self.hits[spec] / (self.hits[spec] + self.misses[spec])
+            for spec in self.misses
+        }
+
+    def clear(self):
+        self.matrices.clear()
+        self.hits.clear()
+        self.misses.clear()
+
+
 class Interaction:
     """
     Class to handle interaction in groups.
@@ -34,14 +115,54 @@ class Interaction:
         dictionary mapping the group specs with their contact intensities
     contact_matrices
         dictionary mapping the group specs with their contact matrices
+    engine
+        how groups are time stepped. "python" builds an InteractiveGroup for every
+        group and loops over its susceptibles, "vectorized" only builds them for the
+        groups that contain infectors and susceptibles and runs the infection draws
+        of a whole supergroup in a single numba kernel. "parallel" is "vectorized"
+        with the susceptibles of the kernel split among numba threads, so that a
+        rank can use several cores.
+    n_threads
+        number of numba threads used by the "parallel" engine, by default all the
+        ones numba was started with (NUMBA_NUM_THREADS).
+    random_streams
+        if given, the infection draws of the "vectorized" and "parallel" engines are
+        taken from these counter based streams, keyed by the time step (see
+        ``timestep``), group and susceptible, instead of from the global random
+        state, so that they do not depend on the domain decomposition. The
+        simulator then also takes the draws of the leisure, the policies and the
+        infection selectors from them (see ``june.utils.random_streams``).
     """
 
+    engines = ("python", "vectorized", "parallel")
+
     def __init__(
         self,
         alpha_physical: float,
         betas: Dict[str, float],
         contact_matrices: dict,
+        engine: str = "python",
+        n_threads: int = None,
+        random_streams: Optional[RandomStreams] = None,
     ):
+        if engine not in self.engines:
+            raise InteractionError(
+                f"Interaction engine {engine} not supported, choose one of {self.engines}"
+            )
+        if n_threads is not None and not 0 < n_threads <= nb.config.NUMBA_NUM_THREADS:
+            raise InteractionError(
+                f"Number of interaction threads {n_threads} has to be between 1 and "
+                f"NUMBA_NUM_THREADS ({nb.config.NUMBA_NUM_THREADS})."
+            )
+        if random_streams is not None and engine == "python":
+            raise InteractionError(
+                "Random streams need the vectorized or parallel interaction engine."
+            )
+        self.engine = engine
+        self.n_threads = n_threads
+        self.random_streams = random_streams
+        # integer identifying the current time step, set by the simulator
+        self.timestep = 0
         self.alpha_physical = alpha_physical
         self.betas = betas or {}
         contact_matrices = contact_matrices or {}
@@ -51,6 +172,8 @@ class Interaction:
             alpha_physical=alpha_physical,
         )
         self.beta_reductions = {}
+        self.workload = InteractionWorkload()
+        self.contact_matrix_cache = ContactMatrixCache()
 
     @classmethod
     def from_file(
@@ -60,10 +183,16 @@ class Interaction:
         with open(config_filename) as f:
             config = yaml.load(f, Loader=yaml.FullLoader)
         contact_matrices = config["contact_matrices"]
+        random_streams = None
+        if config.get("random_streams_seed") is not None:
+            random_streams = RandomStreams(seed=config["random_streams_seed"])
         return Interaction(
             alpha_physical=config["alpha_physical"],
             betas=config["betas"],
             contact_matrices=contact_matrices,
+            engine=config.get("engine", "python"),
+            n_threads=config.get("n_threads"),
+            random_streams=random_streams,
         )
 
     def get_raw_contact_matrices(
@@ -110,10 +239,36 @@ class Interaction:
             contact_matrices[group] = contact_matrix
         return contact_matrices
 
+    @property
+    def beta_reductions(self):
+        return self._beta_reductions
+
+    @beta_reductions.setter
+    def beta_reductions(self, beta_reductions):
+        self._beta_reductions = beta_reductions
+        self.reset_beta_table()
+
+    def reset_beta_table(self):
+        """
+        Empties the table of processed betas. Needs to be called whenever the betas,
+        the policies or the regional compliances change, which the simulator does
+        at the start of every time step.
+        """
+        self.beta_table = {}
+
     def _get_interactive_group_beta(self, interactive_group):
-        return interactive_group.get_processed_beta(
-            betas=self.betas, beta_reductions=self.beta_reductions
-        )
+        """
+        Processed beta of the group. It only depends on the group beta key and
+        region, so it is computed by the first group of each (beta key, region)
+        of the time step and looked up for the rest.
+        """
+        key = (interactive_group.beta_key, interactive_group.region)
+        beta = self.beta_table.get(key)
+        if beta is None:
+            beta = self.beta_table[key] = interactive_group.get_processed_beta(
+                betas=self.betas, beta_reductions=self.beta_reductions
+            )
+        return beta
 
     def create_infector_tensor(
         self,
@@ -144,6 +299,282 @@ class Interaction:
             ret[inf_id] = infector_matrix * beta * delta_time
         return ret
 
+    def time_step_for_super_group(
+        self,
+        super_group: "Supergroup",
+        delta_time: float,
+        people_from_abroad: dict = None,
+        record: Record = None,
+        groups: List["Group"] = None,
+    ):
+        """
+        Runs an interaction time step for all the groups of a supergroup, using the
+        engine selected in the configuration.
+
+        Parameters
+        ----------
+        super_group:
+            supergroup whose groups are time stepped
+        delta_time:
+            Time interval of the interaction
+        people_from_abroad:
+            dictionary mapping group spec -> group id -> subgroup type -> person id
+            -> person data, for the people coming from other domains.
+        groups:
+            if given, only these groups of the supergroup are time stepped.
+
+        Returns
+        -------
+        infected_ids, infection_ids, n_people
+            ids of the newly infected people, ids of the infections they got,
+            and number of people in the supergroup.
+        """
+        tick = perf_counter()
+        people_from_abroad = people_from_abroad or {}
+        if groups is None:
+            groups = super_group
+        if self.engine in ("vectorized", "parallel"):
+            ret = self._time_step_for_super_group_vectorized(
+                groups=groups,
+                delta_time=delta_time,
+                people_from_abroad=people_from_abroad,
+                record=record,
+            )
+        else:
+            ret = self._time_step_for_super_group_python(
+                groups=groups,
+                delta_time=delta_time,
+                people_from_abroad=people_from_abroad,
+                record=record,
+            )
+        if len(super_group):
+            self.workload.add(super_group.group_spec, time=perf_counter() - tick)
+        return ret
+
+    def _time_step_for_super_group_python(
+        self,
+        groups: List["Group"],
+        delta_time: float,
+        people_from_abroad: dict,
+        record: Record = None,
+    ):
+        infected_ids = []
+        infection_ids = []
+        n_people = 0
+        for group in groups:
+            if group.external:
+                continue
+            (
+                new_infected_ids,
+                new_infection_ids,
+                group_size,
+            ) = self.time_step_for_group(
+                group=group,
+                people_from_abroad=people_from_abroad.get(group.spec, {}).get(
+                    group.id, None
+                ),
+                delta_time=delta_time,
+                record=record,
+            )
+            infected_ids += new_infected_ids
+            infection_ids += new_infection_ids
+            n_people += group_size
+        return infected_ids, infection_ids, n_people
+
+    def _time_step_for_super_group_vectorized(
+        self,
+        groups: List["Group"],
+        delta_time: float,
+        people_from_abroad: dict,
+        record: Record = None,
+    ):
+        """
+        Vectorized time step over the groups of a supergroup. Groups are first scanned to find
+        those that have both infectors and susceptibles, only these are turned into
+        interactive groups, which are then flattened into contiguous arrays so that
+        all the infection draws are done in one kernel call. Households without people
+        from other domains skip the interactive groups and are flattened straight from
+        their residents and visitors.
+        """
+        n_people = 0
+        n_groups = 0
+        active_groups = []
+        interactive_groups = []
+        active_households = []
+        for group in groups:
+            if group.external:
+                continue
+            n_groups += 1
+            group_people_from_abroad = people_from_abroad.get(group.spec, {}).get(
+                group.id, None
+            )
+            group_size, has_infectors, has_susceptible = scan_group(
+                group, people_from_abroad=group_people_from_abroad
+            )
+            n_people += group_size
+            if has_infectors and has_susceptible:
+                if isinstance(group, Household) and group_people_from_abroad is None:
+                    active_households.append(group)
+                    continue
+                active_groups.append(group)
+                interactive_groups.append(
+                    group.get_interactive_group(
+                        people_from_abroad=group_people_from_abroad
+                    )
+                )
+        batches = []
+        if interactive_groups:
+            flattened_groups = FlattenedGroups(
+                interactive_groups=interactive_groups,
+                betas=[
+                    self._get_interactive_group_beta(interactive_group)
+                    for interactive_group in interactive_groups
+                ],
+                contact_matrices=[
+                    self.contact_matrix_cache.get(
+                        interactive_group, self.contact_matrices[group.spec]
+                    )
+                    for group, interactive_group in zip(
+                        active_groups, interactive_groups
+                    )
+                ],
+            )
+            batches.append((active_groups, flattened_groups))
+        if active_households:
+            flattened_households = FlattenedHouseholds(
+                households=active_households,
+                betas=[
+                    self._get_household_beta(household)
+                    for household in active_households
+                ],
+                contact_matrix=self.contact_matrix_cache.get(
+                    active_households[0].get_interactive_group(),
+                    self.contact_matrices[active_households[0].spec],
+                ),
+            )
+            batches.append((active_households, flattened_households))
+        if n_groups:
+            self.workload.add(
+                group.spec,
+                n_groups=n_groups,
+                n_skipped=n_groups - len(active_groups) - len(active_households),
+                n_people=n_people,
+                n_pairs=sum(flattened.n_infectious_pairs for _, flattened in batches),
+            )
+        if not batches:
+            return [], [], n_people
+        infected_ids = []
+        infection_ids = []
+        for batch_groups, flattened in batches:
+            batch_infected_ids, batch_infection_ids = self._infect_flattened(
+                groups=batch_groups,
+                flattened=flattened,
+                delta_time=delta_time,
+                record=record,
+            )
+            infected_ids += batch_infected_ids
+            infection_ids += batch_infection_ids
+        self.workload.add(batches[0][0][0].spec, n_infections=len(infected_ids))
+        return infected_ids, infection_ids, n_people
+
+    def _get_household_beta(self, household: Household):
+        """
+        Processed beta of a household, looked up in the beta table without building
+        its interactive group unless it is the first one of its (beta key, region).
+        """
+        super_area = household.super_area
+        region = None if super_area is None else super_area.region
+        beta = self.beta_table.get((household.beta_key, region))
+        if beta is None:
+            beta = self._get_interactive_group_beta(household.get_interactive_group())
+        return beta
+
+    def _infect_flattened(
+        self,
+        groups: List["Group"],
+        flattened,
+        delta_time: float,
+        record: Record = None,
+    ):
+        """
+        Draws the infections of a batch of flattened groups (``FlattenedGroups`` or
+        ``FlattenedHouseholds``) in one kernel call, and records them.
+        """
+        kernel_arguments = dict(
+            betas=flattened.betas,
+            delta_time=delta_time,
+            contact_matrices=flattened.contact_matrices,
+            contact_matrix_offsets=flattened.contact_matrix_offsets,
+            n_subgroups=flattened.n_subgroups,
+            subgroup_offsets=flattened.subgroup_offsets,
+            subgroup_sizes=flattened.subgroup_sizes,
+            infector_transmissions=flattened.infector_transmissions,
+            susceptible_groups=flattened.susceptible_groups,
+            susceptible_subgroups=flattened.susceptible_subgroups,
+            susceptibilities=flattened.susceptibilities,
+        )
+        if self.random_streams is not None:
+            group_ids = np.array([group.id for group in groups], dtype=np.int64)
+            # the fourth draw picks the infector to blame
+            random_numbers = self.random_streams.uniforms(
+                purpose=f"infection.{groups[0].spec}",
+                timestep=self.timestep,
+                group_ids=group_ids[flattened.susceptible_groups],
+                person_ids=flattened.susceptible_ids,
+                n_draws=4,
+            )
+        elif self.engine == "parallel":
+            random_numbers = np.random.random((len(flattened.susceptible_ids), 3))
+        else:
+            random_numbers = None
+        if random_numbers is not None:
+            # the number of numba threads is process wide, only change it for the
+            # kernel call
+            n_threads = nb.get_num_threads()
+            if self.engine == "parallel" and self.n_threads is not None:
+                nb.set_num_threads(self.n_threads)
+            try:
+                infection_indices, blamed_subgroups = infect_flattened_groups_parallel(
+                    random_numbers=random_numbers, **kernel_arguments
+                )
+            finally:
+                nb.set_num_threads(n_threads)
+        else:
+            infection_indices, blamed_subgroups = infect_flattened_groups(
+                **kernel_arguments
+            )
+        infected_ids = []
+        infection_ids = []
+        for g, group in enumerate(groups):
+            start = flattened.susceptible_offsets[g]
+            end = flattened.susceptible_offsets[g + 1]
+            infected = start + np.flatnonzero(infection_indices[start:end] >= 0)
+            if len(infected) == 0:
+                continue
+            group_infected_ids = flattened.susceptible_ids[infected].tolist()
+            group_infection_ids = flattened.infection_ids[
+                infection_indices[infected]
+            ].tolist()
+            if record:
+                to_blame_ids = self._blame_individuals(
+                    blamed_subgroups[infected].tolist(),
+                    group_infection_ids,
+                    flattened.get_infectors(g),
+                    draws=None
+                    if self.random_streams is None
+                    else random_numbers[infected, 3],
+                )
+                self._log_infections_to_record(
+                    infected_ids=group_infected_ids,
+                    infection_ids=group_infection_ids,
+                    to_blame_ids=to_blame_ids,
+                    record=record,
+                    group=group,
+                )
+            infected_ids += group_infected_ids
+            infection_ids += group_infection_ids
+        return infected_ids, infection_ids
+
     def time_step_for_group(
         self,
         group: "Group",
@@ -171,14 +602,17 @@ class Interaction:
             people_from_abroad=people_from_abroad
         )
         if not interactive_group.must_timestep:
+            self.workload.add(
+                group.spec, n_groups=1, n_skipped=1, n_people=interactive_group.size
+            )
             return [], [], interactive_group.size
         infected_ids = []
         infection_ids = []
         to_blame_subgroups = []
         beta = self._get_interactive_group_beta(interactive_group)
         contact_matrix_raw = self.contact_matrices[group.spec]
-        contact_matrix = interactive_group.get_processed_contact_matrix(
-            contact_matrix_raw
+        contact_matrix = self.contact_matrix_cache.get(
+            interactive_group, contact_matrix_raw
         )
         infector_tensor = self.create_infector_tensor(
             interactive_group.infectors_per_infection_per_subgroup,
@@ -217,6 +651,13 @@ class Interaction:
                 record=record,
                 group=group,
             )
+        self.workload.add(
+            group.spec,
+            n_groups=1,
+            n_people=interactive_group.size,
+            n_pairs=interactive_group.n_infectious_pairs,
+            n_infections=len(infected_ids),
+        )
         return infected_ids, infection_ids, interactive_group.size
 
     def _time_step_for_subgroup(
@@ -275,10 +716,21 @@ class Interaction:
         return np.random.choice(len(vector), p=probs)
 
     def _blame_individuals(
-        self, to_blame_subgroups, infection_ids, infectors_per_infection_per_subgroup
+        self,
+        to_blame_subgroups,
+        infection_ids,
+        infectors_per_infection_per_subgroup,
+        draws=None,
     ):
+        """
+        Picks the infector to blame for each infection, among the infectors of the
+        blamed subgroup, weighted by their transmission probabilities. If given,
+        ``draws`` holds a uniform number per infection to pick them with.
+        """
         ret = []
-        for infection_id, subgroup in zip(infection_ids, to_blame_subgroups):
+        for i, (infection_id, subgroup) in enumerate(
+            zip(infection_ids, to_blame_subgroups)
+        ):
             candidates_ids = infectors_per_infection_per_subgroup[infection_id][
                 subgroup
             ]["ids"]
@@ -288,7 +740,17 @@ class Interaction:
                 ]
             )
             candidates_probs /= candidates_probs.sum()
-            ret.append(np.random.choice(candidates_ids, p=candidates_probs))
+            if draws is None:
+                ret.append(np.random.choice(candidates_ids, p=candidates_probs))
+            else:
+                # in id order, as people from other domains are added last
+                order = np.argsort(candidates_ids, kind="stable")
+                index = np.searchsorted(
+                    np.cumsum(candidates_probs[order]), draws[i], side="right"
+                )
+                ret.append(
+                    np.asarray(candidates_ids)[order[min(index, len(order) - 1)]]
+                )
         return ret
 
     def _log_infections_to_record(
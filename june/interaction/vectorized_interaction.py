@@ -0,0 +1,515 @@
+import numpy as np
+import numba as nb
+from typing import List
+
+from june.exc import InteractionError
+
+
+def scan_group(group: "Group", people_from_abroad: dict = None):
+    """
+    Cheap pass over the people of a group that does not build an InteractiveGroup.
+    It counts the people in the group and checks whether there is at least one
+    infector and one susceptible, which is what decides if the group needs to be
+    time stepped.
+
+    Parameters
+    ----------
+    group
+        group to scan
+    people_from_abroad
+        dictionary mapping subgroup type -> ``ForeignPeople`` for the people
+        coming from other domains.
+
+    Returns
+    -------
+    size, has_infectors, has_susceptible
+    """
+    people_from_abroad = people_from_abroad or {}
+    size = 0
+    has_infectors = False
+    has_susceptible = False
+    for subgroup in group.subgroups:
+        people = subgroup.people
+        size += len(people)
+        if not (has_infectors and has_susceptible):
+            for person in people:
+                if person.infection is None:
+                    has_susceptible = True
+                else:
+                    has_infectors = True
+        if subgroup.subgroup_type in people_from_abroad:
+            people_abroad_data = people_from_abroad[subgroup.subgroup_type]
+            size += len(people_abroad_data)
+            if not has_susceptible:
+                has_susceptible = people_abroad_data.has_susceptible
+            if not has_infectors:
+                has_infectors = people_abroad_data.has_infectors
+    return size, has_infectors, has_susceptible
+
+
+class FlattenedGroups:
+    """
+    Contiguous array representation of a batch of interactive groups, so that the
+    infection probabilities of all their susceptibles can be computed in one
+    kernel call. Subgroup quantities are stored at ``subgroup_offsets[g] + j`` and
+    the processed contact matrix of group ``g`` is stored row-major at
+    ``contact_matrix_offsets[g]``.
+
+    Parameters
+    ----------
+    interactive_groups
+        list of interactive groups that need to be time stepped
+    betas
+        processed contact intensity of each interactive group
+    contact_matrices
+        processed contact matrix of each interactive group
+    """
+
+    def __init__(
+        self,
+        interactive_groups: List["InteractiveGroup"],
+        betas: List[float],
+        contact_matrices: List[np.ndarray],
+    ):
+        self.interactive_groups = interactive_groups
+        infection_ids = set()
+        for interactive_group in interactive_groups:
+            infection_ids.update(
+                interactive_group.infectors_per_infection_per_subgroup.keys()
+            )
+        self.infection_ids = np.array(sorted(infection_ids), dtype=np.int64)
+        infection_index = {
+            infection_id: k for k, infection_id in enumerate(self.infection_ids)
+        }
+        n_groups = len(interactive_groups)
+        self.betas = np.array(betas, dtype=np.float64)
+        self.n_subgroups = np.array(
+            [len(contact_matrix) for contact_matrix in contact_matrices],
+            dtype=np.int64,
+        )
+        self.subgroup_offsets = np.zeros(n_groups, dtype=np.int64)
+        self.subgroup_offsets[1:] = np.cumsum(self.n_subgroups)[:-1]
+        self.contact_matrix_offsets = np.zeros(n_groups, dtype=np.int64)
+        self.contact_matrix_offsets[1:] = np.cumsum(self.n_subgroups ** 2)[:-1]
+        if n_groups:
+            self.contact_matrices = np.concatenate(
+                [
+                    np.asarray(contact_matrix, dtype=np.float64).ravel()
+                    for contact_matrix in contact_matrices
+                ]
+            )
+        else:
+            self.contact_matrices = np.zeros(0, dtype=np.float64)
+        n_subgroups_total = int(self.n_subgroups.sum())
+        self.subgroup_sizes = np.ones(n_subgroups_total, dtype=np.int64)
+        self.infector_transmissions = np.zeros(
+            (n_subgroups_total, len(self.infection_ids)), dtype=np.float64
+        )
+        susceptible_ids = []
+        susceptible_groups = []
+        susceptible_subgroups = []
+        susceptibilities = []
+        self.susceptible_offsets = np.zeros(n_groups + 1, dtype=np.int64)
+        for g, interactive_group in enumerate(interactive_groups):
+            offset = self.subgroup_offsets[g]
+            n_subgroups = self.n_subgroups[g]
+            for subgroup_id, subgroup_size in interactive_group.subgroup_sizes.items():
+                if subgroup_id >= n_subgroups:
+                    raise InteractionError(
+                        f"Subgroup {subgroup_id} of {interactive_group.spec} is not "
+                        f"covered by its {n_subgroups}x{n_subgroups} contact matrix."
+                    )
+                self.subgroup_sizes[offset + subgroup_id] = subgroup_size
+            for (
+                infection_id,
+                infectors_per_subgroup,
+            ) in interactive_group.infectors_per_infection_per_subgroup.items():
+                k = infection_index[infection_id]
+                for subgroup_id, infectors in infectors_per_subgroup.items():
+                    self.infector_transmissions[offset + subgroup_id, k] = sum(
+                        infectors["trans_probs"]
+                    )
+            for (
+                subgroup_id,
+                subgroup_susceptibles,
+            ) in interactive_group.susceptibles_per_subgroup.items():
+                for susceptible_id, susceptibility_dict in subgroup_susceptibles.items():
+                    susceptible_ids.append(susceptible_id)
+                    susceptible_groups.append(g)
+                    susceptible_subgroups.append(subgroup_id)
+                    susceptibilities.append(
+                        [
+                            susceptibility_dict.get(infection_id, 1.0)
+                            for infection_id in self.infection_ids
+                        ]
+                    )
+            self.susceptible_offsets[g + 1] = len(susceptible_ids)
+        self.susceptible_ids = np.array(susceptible_ids, dtype=np.int64)
+        self.susceptible_groups = np.array(susceptible_groups, dtype=np.int64)
+        self.susceptible_subgroups = np.array(susceptible_subgroups, dtype=np.int64)
+        self.susceptibilities = np.array(susceptibilities, dtype=np.float64).reshape(
+            len(susceptible_ids), len(self.infection_ids)
+        )
+
+    @property
+    def n_infectious_pairs(self):
+        return sum(
+            interactive_group.n_infectious_pairs
+            for interactive_group in self.interactive_groups
+        )
+
+    def get_infectors(self, g: int) -> dict:
+        """
+        Maps infection id -> subgroup -> {"ids", "trans_probs"} of the infectors of
+        group ``g``.
+        """
+        return self.interactive_groups[g].infectors_per_infection_per_subgroup
+
+    def __len__(self):
+        return len(self.interactive_groups)
+
+
+class FlattenedHouseholds:
+    """
+    Same arrays as ``FlattenedGroups`` for a batch of households, built straight
+    from the people in their subgroups without creating interactive groups. All the
+    households share one contact matrix, and their susceptibles are stored in CSR
+    form: the ids and subgroup codes of the susceptibles of household ``g`` are at
+    ``susceptible_offsets[g]:susceptible_offsets[g + 1]``.
+
+    Parameters
+    ----------
+    households
+        households that need to be time stepped, without people from other domains
+    betas
+        processed contact intensity of each household
+    contact_matrix
+        processed household contact matrix
+    """
+
+    def __init__(
+        self,
+        households: List["Household"],
+        betas: List[float],
+        contact_matrix: np.ndarray,
+    ):
+        self.households = households
+        n_households = len(households)
+        n_subgroups = len(contact_matrix)
+        self.betas = np.array(betas, dtype=np.float64)
+        self.n_subgroups = np.full(n_households, n_subgroups, dtype=np.int64)
+        self.subgroup_offsets = n_subgroups * np.arange(n_households, dtype=np.int64)
+        self.contact_matrix_offsets = np.zeros(n_households, dtype=np.int64)
+        self.contact_matrices = np.asarray(contact_matrix, dtype=np.float64).ravel()
+        self.subgroup_sizes = np.ones(n_households * n_subgroups, dtype=np.int64)
+        self.infectors = []
+        self.n_infectious_pairs = 0
+        susceptible_ids = []
+        susceptible_subgroups = []
+        susceptibility_dicts = []
+        self.susceptible_offsets = np.zeros(n_households + 1, dtype=np.int64)
+        for g, household in enumerate(households):
+            offset = self.subgroup_offsets[g]
+            infectors_per_infection_per_subgroup = {}
+            n_infectors = 0
+            for subgroup_id, subgroup in enumerate(household.subgroups):
+                people = subgroup.people
+                if not people:
+                    continue
+                if subgroup_id >= n_subgroups:
+                    raise InteractionError(
+                        f"Subgroup {subgroup_id} of household is not covered by "
+                        f"its {n_subgroups}x{n_subgroups} contact matrix."
+                    )
+                self.subgroup_sizes[offset + subgroup_id] = len(people)
+                for person in people:
+                    if person.infection is None:
+                        susceptible_ids.append(person.id)
+                        susceptible_subgroups.append(subgroup_id)
+                        susceptibility_dicts.append(
+                            person.immunity.susceptibility_dict
+                        )
+                    else:
+                        infectors = infectors_per_infection_per_subgroup.setdefault(
+                            person.infection.infection_id(), {}
+                        ).setdefault(subgroup_id, {"ids": [], "trans_probs": []})
+                        infectors["ids"].append(person.id)
+                        infectors["trans_probs"].append(
+                            person.infection.transmission.probability
+                        )
+                        n_infectors += 1
+            self.infectors.append(infectors_per_infection_per_subgroup)
+            self.susceptible_offsets[g + 1] = len(susceptible_ids)
+            self.n_infectious_pairs += n_infectors * (
+                len(susceptible_ids) - int(self.susceptible_offsets[g])
+            )
+        infection_ids = set()
+        for infectors_per_infection_per_subgroup in self.infectors:
+            infection_ids.update(infectors_per_infection_per_subgroup.keys())
+        self.infection_ids = np.array(sorted(infection_ids), dtype=np.int64)
+        infection_index = {
+            infection_id: k for k, infection_id in enumerate(self.infection_ids)
+        }
+        self.infector_transmissions = np.zeros(
+            (len(self.subgroup_sizes), len(self.infection_ids)), dtype=np.float64
+        )
+        for offset, infectors_per_infection_per_subgroup in zip(
+            self.subgroup_offsets, self.infectors
+        ):
+            for (
+                infection_id,
+                infectors_per_subgroup,
+            ) in infectors_per_infection_per_subgroup.items():
+                k = infection_index[infection_id]
+                for subgroup_id, infectors in infectors_per_subgroup.items():
+                    self.infector_transmissions[offset + subgroup_id, k] = sum(
+                        infectors["trans_probs"]
+                    )
+        self.susceptible_ids = np.array(susceptible_ids, dtype=np.int64)
+        self.susceptible_groups = np.repeat(
+            np.arange(n_households, dtype=np.int64), np.diff(self.susceptible_offsets)
+        )
+        self.susceptible_subgroups = np.array(susceptible_subgroups, dtype=np.int64)
+        self.susceptibilities = np.array(
+            [
+                [
+                    susceptibility_dict.get(infection_id, 1.0)
+                    for infection_id in self.infection_ids
+                ]
+                for susceptibility_dict in susceptibility_dicts
+            ],
+            dtype=np.float64,
+        ).reshape(len(susceptible_ids), len(self.infection_ids))
+
+    def get_infectors(self, g: int) -> dict:
+        """
+        Maps infection id -> subgroup -> {"ids", "trans_probs"} of the infectors of
+        household ``g``.
+        """
+        return self.infectors[g]
+
+    def __len__(self):
+        return len(self.households)
+
+
+@nb.jit(nopython=True)
+def _weighted_choice_with_draw(weights, total, draw):
+    """
+    Returns an index with probability proportional to weights, given a uniform draw
+    in [0, 1).
+    """
+    draw = draw * total
+    cumulative = 0.0
+    last_positive = 0
+    for i in range(len(weights)):
+        if weights[i] > 0.0:
+            last_positive = i
+            cumulative += weights[i]
+            if draw < cumulative:
+                return i
+    return last_positive
+
+
+@nb.jit(nopython=True)
+def _weighted_choice(weights, total):
+    """
+    Draws an index with probability proportional to weights.
+    """
+    return _weighted_choice_with_draw(weights, total, np.random.random())
+
+
+@nb.jit(nopython=True)
+def _subgroup_weights(
+    weights,
+    i,
+    k,
+    row_offset,
+    subgroup_offset,
+    contact_matrices,
+    subgroup_sizes,
+    infector_transmissions,
+):
+    """
+    Fills weights[j] with the contribution of the infectors of infection k in
+    subgroup j to the exposure of a susceptible in subgroup i, and returns their sum.
+    """
+    total_weight = 0.0
+    for j in range(len(weights)):
+        weights[j] = 0.0
+        transmission = infector_transmissions[subgroup_offset + j, k]
+        if transmission == 0.0:
+            continue
+        size = subgroup_sizes[subgroup_offset + j]
+        if j == i:
+            size = max(1, size - 1)
+        weights[j] = contact_matrices[row_offset + j] * transmission / size
+        total_weight += weights[j]
+    return total_weight
+
+
+@nb.jit(nopython=True)
+def infect_flattened_groups(
+    betas,
+    delta_time,
+    contact_matrices,
+    contact_matrix_offsets,
+    n_subgroups,
+    subgroup_offsets,
+    subgroup_sizes,
+    infector_transmissions,
+    susceptible_groups,
+    susceptible_subgroups,
+    susceptibilities,
+):
+    """
+    Computes the infection probability of every susceptible in a batch of flattened
+    groups and draws who gets infected, by which infection, and which subgroup is to
+    blame. For a susceptible in subgroup i of group g, the exposure to infection k is
+
+    $ beta_g * delta_time * s_k * sum_j C_g[i, j] * T_g[j, k] / N_j $
+
+    where T_g[j, k] is the summed transmission probability of the infectors of k in
+    subgroup j and N_j the size of subgroup j, excluding the susceptible if j == i.
+
+    Returns
+    -------
+    infection_indices
+        index of the infection each susceptible gets, -1 if not infected.
+    blamed_subgroups
+        subgroup (local to the group) blamed for the infection, -1 if not infected.
+    """
+    n_susceptibles = len(susceptible_groups)
+    n_infections = infector_transmissions.shape[1]
+    infection_indices = np.full(n_susceptibles, -1, dtype=np.int64)
+    blamed_subgroups = np.full(n_susceptibles, -1, dtype=np.int64)
+    exposures = np.zeros(n_infections, dtype=np.float64)
+    weights = np.zeros(n_subgroups.max() if len(n_subgroups) else 0, dtype=np.float64)
+    for s in range(n_susceptibles):
+        g = susceptible_groups[s]
+        i = susceptible_subgroups[s]
+        n = n_subgroups[g]
+        row_offset = contact_matrix_offsets[g] + i * n
+        subgroup_offset = subgroup_offsets[g]
+        beta_dt = betas[g] * delta_time
+        subgroup_weights = weights[:n]
+        total_exposure = 0.0
+        for k in range(n_infections):
+            exposure = _subgroup_weights(
+                subgroup_weights,
+                i,
+                k,
+                row_offset,
+                subgroup_offset,
+                contact_matrices,
+                subgroup_sizes,
+                infector_transmissions,
+            )
+            exposure *= beta_dt * susceptibilities[s, k]
+            exposures[k] = exposure
+            total_exposure += exposure
+        if total_exposure <= 0.0:
+            continue
+        if np.random.random() >= 1.0 - np.exp(-total_exposure):
+            continue
+        if n_infections == 1:
+            k = 0
+        else:
+            k = _weighted_choice(exposures, total_exposure)
+        total_weight = _subgroup_weights(
+            subgroup_weights,
+            i,
+            k,
+            row_offset,
+            subgroup_offset,
+            contact_matrices,
+            subgroup_sizes,
+            infector_transmissions,
+        )
+        infection_indices[s] = k
+        blamed_subgroups[s] = _weighted_choice(subgroup_weights, total_weight)
+    return infection_indices, blamed_subgroups
+
+
+@nb.jit(nopython=True, parallel=True)
+def infect_flattened_groups_parallel(
+    betas,
+    delta_time,
+    contact_matrices,
+    contact_matrix_offsets,
+    n_subgroups,
+    subgroup_offsets,
+    subgroup_sizes,
+    infector_transmissions,
+    susceptible_groups,
+    susceptible_subgroups,
+    susceptibilities,
+    random_numbers,
+):
+    """
+    Same as ``infect_flattened_groups``, but the susceptibles are split among the
+    numba threads. The uniform draws of every susceptible (whether they get
+    infected, by which infection, and which subgroup is to blame) are taken
+    beforehand and passed in ``random_numbers``, of shape (n_susceptibles, 3) or
+    wider (extra columns are ignored), so that the result does not depend on the
+    number of threads. The susceptibles are processed in one chunk per thread, so
+    that the scratch arrays are allocated once per chunk.
+    """
+    n_susceptibles = len(susceptible_groups)
+    n_infections = infector_transmissions.shape[1]
+    infection_indices = np.full(n_susceptibles, -1, dtype=np.int64)
+    blamed_subgroups = np.full(n_susceptibles, -1, dtype=np.int64)
+    max_subgroups = n_subgroups.max() if len(n_subgroups) else 0
+    n_chunks = min(nb.get_num_threads(), n_susceptibles)
+    chunk_size = (n_susceptibles + n_chunks - 1) // n_chunks if n_chunks else 0
+    for chunk in nb.prange(n_chunks):
+        weights = np.zeros(max_subgroups, dtype=np.float64)
+        exposures = np.zeros(n_infections, dtype=np.float64)
+        for s in range(
+            chunk * chunk_size, min((chunk + 1) * chunk_size, n_susceptibles)
+        ):
+            g = susceptible_groups[s]
+            i = susceptible_subgroups[s]
+            n = n_subgroups[g]
+            row_offset = contact_matrix_offsets[g] + i * n
+            subgroup_offset = subgroup_offsets[g]
+            beta_dt = betas[g] * delta_time
+            subgroup_weights = weights[:n]
+            total_exposure = 0.0
+            for k in range(n_infections):
+                exposure = _subgroup_weights(
+                    subgroup_weights,
+                    i,
+                    k,
+                    row_offset,
+                    subgroup_offset,
+                    contact_matrices,
+                    subgroup_sizes,
+                    infector_transmissions,
+                )
+                exposure *= beta_dt * susceptibilities[s, k]
+                exposures[k] = exposure
+                total_exposure += exposure
+            if total_exposure <= 0.0:
+                continue
+            if random_numbers[s, 0] >= 1.0 - np.exp(-total_exposure):
+                continue
+            infection = 0
+            if n_infections > 1:
+                infection = _weighted_choice_with_draw(
+                    exposures, total_exposure, random_numbers[s, 1]
+                )
+            total_weight = _subgroup_weights(
+                subgroup_weights,
+                i,
+                infection,
+                row_offset,
+                subgroup_offset,
+                contact_matrices,
+                subgroup_sizes,
+                infector_transmissions,
+            )
+            infection_indices[s] = infection
+            blamed_subgroups[s] = _weighted_choice_with_draw(
+                subgroup_weights, total_weight, random_numbers[s, 2]
+            )
+    return infection_indices, blamed_subgroups
@@ -1,4 +1,5 @@
 from collections import defaultdict
+from typing import List
 from mpi4py import MPI
 import numpy as np
 
@@ -9,12 +10,89 @@ mpi_comm = MPI.COMM_WORLD
 mpi_rank = mpi_comm.Get_rank()
 mpi_size = mpi_comm.Get_size()
 
+# wire format of the people that travel to other domains. Each person is one
+# fixed size record, their immunity (infection id, susceptibility) pairs are sent
+# in a separate buffer with n_immunity entries per person, in the same order.
+movable_person_dtype = np.dtype(
+    [
+        ("id", np.int64),
+        ("inf_prob", np.float64),
+        ("inf_id", np.int64),
+        ("susc", np.bool_),
+        ("dom", np.int32),
+        ("active", np.bool_),
+        ("n_immunity", np.int32),
+    ]
+)
+immunity_dtype = np.dtype([("inf_id", np.int64), ("susc", np.float64)])
+subgroup_key_dtype = np.dtype(
+    [
+        ("spec", "S32"),
+        ("group_id", np.int64),
+        ("subgroup_type", np.int64),
+        ("n_people", np.int64),
+    ]
+)
+
+
+class ForeignPeople:
+    """
+    People from other domains present in one subgroup, as a structured array with
+    ``movable_person_dtype`` fields (id, inf_prob, inf_id, susc, dom, active), and
+    their immunities as a flat array indexed through ``immunity_offsets``.
+    """
+
+    __slots__ = ("data", "immunities", "immunity_offsets")
+
+    def __init__(self, data: np.ndarray, immunities: np.ndarray):
+        self.data = data
+        self.immunities = immunities
+        self.immunity_offsets = np.zeros(len(data) + 1, dtype=np.int64)
+        np.cumsum(data["n_immunity"], out=self.immunity_offsets[1:])
+
+    @classmethod
+    def concatenate(cls, foreign_people: List["ForeignPeople"]) -> "ForeignPeople":
+        if len(foreign_people) == 1:
+            return foreign_people[0]
+        return cls(
+            data=np.concatenate([people.data for people in foreign_people]),
+            immunities=np.concatenate(
+                [people.immunities for people in foreign_people]
+            ),
+        )
+
+    def __len__(self):
+        return len(self.data)
+
+    @property
+    def ids(self):
+        return self.data["id"]
+
+    @property
+    def has_susceptible(self) -> bool:
+        return bool(self.data["susc"].any())
+
+    @property
+    def has_infectors(self) -> bool:
+        return bool((self.data["inf_id"] != 0).any())
+
+    def susceptibility_dict(self, index: int) -> dict:
+        """
+        Susceptibility per infection id of the person at the given index.
+        """
+        immunities = self.immunities[
+            self.immunity_offsets[index] : self.immunity_offsets[index + 1]
+        ]
+        return dict(zip(immunities["inf_id"].tolist(), immunities["susc"].tolist()))
+
+
 class MovablePeople:
     """
     Holds information about people who might be present in a domain, but may or may not be be,
     given circumstances. They have skinny profiles, which only have their id, infection probability,
-    susceptibility, home domain, and whether active or not. For now, we mimic the original structure,
-    but with an additional interface.
+    susceptibility, home domain, and whether active or not. Outgoing people are kept in nested
+    dictionaries, and are sent as structured arrays (see ``movable_person_dtype``). Incoming people
+    are stored as ``ForeignPeople`` arrays, one per subgroup.
     """
 
     def __init__(self):
@@ -39,31 +117,37 @@ class MovablePeople:
             self.skinny_out[domain_id][group_spec][group_id][subgroup_type] = {}
 
         if person.infected:
-            view = [
-                person.id,
-                person.infection.transmission.probability,
-                person.infection.infection_id(),
-                False,
-                np.array([], dtype=np.int64),
-                np.array([], dtype=np.float64),
-                mpi_rank,
-                True,
-            ]
+            view = (
+                (
+                    person.id,
+                    person.infection.transmission.probability,
+                    person.infection.infection_id(),
+                    False,
+                    mpi_rank,
+                    True,
+                    0,
+                ),
+                (),
+                (),
+            )
         else:
             (
                 susceptibility_inf_ids,
                 susceptibility_inf_suscs,
             ) = person.immunity.serialize()
-            view = [
-                person.id,
-                0.0,
-                0,
-                True,
-                np.array(susceptibility_inf_ids, dtype=np.int64),
-                np.array(susceptibility_inf_suscs, dtype=np.float64),
-                mpi_rank,
-                True,
-            ]
+            view = (
+                (
+                    person.id,
+                    0.0,
+                    0,
+                    True,
+                    mpi_rank,
+                    True,
+                    len(susceptibility_inf_ids),
+                ),
+                susceptibility_inf_ids,
+                susceptibility_inf_suscs,
+            )
 
         self.skinny_out[domain_id][group_spec][group_id][subgroup_type][
             person.id
@@ -85,71 +169,108 @@ class MovablePeople:
             return 1
 
     def serialise(self, rank):
-        """ Hopefully more efficient than standard pickle"""
-        keys, data = [], []
-        if rank not in self.skinny_out:
-            return None, None, 0
-        for group_spec in self.skinny_out[rank]:
-            for group_id in self.skinny_out[rank][group_spec]:
-                for subgroup_type in self.skinny_out[rank][group_spec][group_id]:
-                    keys.append(
-                        (
-                            group_spec,
-                            group_id,
-                            subgroup_type,
-                            len(
-                                self.skinny_out[rank][group_spec][group_id][
-                                    subgroup_type
-                                ]
-                            ),
+        """
+        Packs the people going to the given rank into three flat arrays: the subgroup
+        keys, the people records and their immunities.
+
+        Returns
+        -------
+        keys, people, immunities, n_people
+        """
+        keys, records, immunity_ids, immunity_suscs = [], [], [], []
+        if rank in self.skinny_out:
+            for group_spec in self.skinny_out[rank]:
+                for group_id in self.skinny_out[rank][group_spec]:
+                    for subgroup_type, views in self.skinny_out[rank][group_spec][
+                        group_id
+                    ].items():
+                        keys.append(
+                            (group_spec.encode(), group_id, subgroup_type, len(views))
                         )
-                    )
-                    data += [
-                        view
-                        for pid, view in self.skinny_out[rank][group_spec][group_id][
-                            subgroup_type
-                        ].items()
-                    ]
-        outbound = np.array(data, dtype=object)
-        return keys, outbound, outbound.shape[0]
-
-    def update(self, rank, keys, rank_data):
+                        for record, inf_ids, suscs in views.values():
+                            records.append(record)
+                            immunity_ids.extend(inf_ids)
+                            immunity_suscs.extend(suscs)
+        keys = np.array(keys, dtype=subgroup_key_dtype)
+        people = np.array(records, dtype=movable_person_dtype)
+        immunities = np.empty(len(immunity_ids), dtype=immunity_dtype)
+        immunities["inf_id"] = immunity_ids
+        immunities["susc"] = immunity_suscs
+        return keys, people, immunities, len(people)
+
+    def update(self, rank, keys, people, immunities):
         """Update the information we have about people coming into our domain
         :param rank: domain of origin
-        :param keys: dictionary keys for the group structure
-        :param rank_data: numpy array of all the person data
+        :param keys: structured array of the subgroups people go to, and how many
+        :param people: structured array of all the person data
+        :param immunities: structured array of the immunities of all the people
         """
-        index = 0
-
+        people_offset = 0
+        immunity_offset = 0
         for key in keys:
-            group_spec, group_id, subgroup_type, n_data = key
-            if group_spec not in self.skinny_in:
-                self.skinny_in[group_spec] = {}
-            if group_id not in self.skinny_in[group_spec]:
-                self.skinny_in[group_spec][group_id] = {}
-            if subgroup_type not in self.skinny_in[group_spec][group_id]:
-                self.skinny_in[group_spec][group_id][subgroup_type] = {}
-            data = rank_data[index : index + n_data]
-            index += n_data
-
-            try:
-                self.skinny_in[group_spec][group_id][subgroup_type].update(
-                    {
-                        int(k): {
-                            "inf_prob": i,
-                            "inf_id": t,
-                            "susc": s,
-                            "immunity_inf_ids": iids,
-                            "immunity_suscs": iis,
-                            "dom": d,
-                            "active": a,
-                        }
-                        for k, i, t, s, iids, iis, d, a in data
-                    }
+            group_spec = key["spec"].decode()
+            group_id = int(key["group_id"])
+            subgroup_type = int(key["subgroup_type"])
+            n_people = int(key["n_people"])
+            data = people[people_offset : people_offset + n_people]
+            people_offset += n_people
+            n_immunities = int(data["n_immunity"].sum())
+            subgroup_people = ForeignPeople(
+                data=data,
+                immunities=immunities[immunity_offset : immunity_offset + n_immunities],
+            )
+            immunity_offset += n_immunities
+            subgroups = self.skinny_in.setdefault(group_spec, {}).setdefault(
+                group_id, {}
+            )
+            if subgroup_type in subgroups:
+                subgroup_people = ForeignPeople.concatenate(
+                    [subgroups[subgroup_type], subgroup_people]
                 )
-            except:
-                print("failing", rank, "f-done")
-                raise
+            subgroups[subgroup_type] = subgroup_people
+
+    def _serialise_all(self):
+        # nobody travels to their own domain, so nothing is sent to this rank
+        return [
+            self.serialise(rank if rank != mpi_rank else None)
+            for rank in range(mpi_size)
+        ]
+
+    def start_exchange(self) -> "PendingPeopleExchange":
+        """
+        Non-blocking version of ``exchange``. The subgroup keys are exchanged
+        right away, while the people and immunity buffers are sent with
+        Ialltoallv and only decoded when ``wait`` is called on the returned
+        exchange.
+        """
+        outbound = self._serialise_all()
+        keys, _ = move_records([data[0] for data in outbound])
+        return PendingPeopleExchange(
+            movable_people=self,
+            keys=keys,
+            people=PendingRecords([data[1] for data in outbound]),
+            immunities=PendingRecords([data[2] for data in outbound]),
+            n_people_going_abroad=sum(data[3] for data in outbound),
+        )
+
+    def exchange(self):
+        """
+        Sends the people going abroad to their domains and receives the people
+        coming to this domain, with one Alltoallv per buffer.
+
+        Returns
+        -------
+        n_people_going_abroad, n_people_from_abroad
+        """
+        outbound = self._serialise_all()
+        keys, _ = move_records([data[0] for data in outbound])
+        people, n_people_from_abroad = move_records([data[1] for data in outbound])
+        immunities, _ = move_records([data[2] for data in outbound])
+        n_people_going_abroad = sum(data[3] for data in outbound)
+        for rank in range(mpi_size):
+            if len(keys[rank]):
+                self.update(rank, keys[rank], people[rank], immunities[rank])
+        return n_people_going_abroad, n_people_from_abroad
 
 
 def move_info(info2move):
@@ -183,3 +304,133 @@ def move_info(info2move):
     )
 
     return r_buffer, n_sending, n_receiving
+
+
+# datatypes of one record of each size moved by ``move_records``
+_record_datatypes = {}
+# MPI counts and displacements are C ints
+_max_count = np.iinfo(np.int32).max
+
+
+def _record_datatype(itemsize: int):
+    if itemsize not in _record_datatypes:
+        _record_datatypes[itemsize] = MPI.BYTE.Create_contiguous(itemsize).Commit()
+    return _record_datatypes[itemsize]
+
+
+def _records_exchange_buffers(records_per_rank: List[np.ndarray]):
+    """
+    Prepares the send and receive buffer specifications to move a list of
+    structured arrays (one per rank) with Alltoallv. Each record is sent as one
+    element of a contiguous datatype of its size in bytes, so that counts and
+    displacements are numbers of records. The counts are exchanged here with a
+    (small) blocking alltoall.
+    """
+    assert len(records_per_rank) == mpi_size
+    dtype = records_per_rank[0].dtype
+    buffer = np.ascontiguousarray(np.concatenate(records_per_rank)).view(np.uint8)
+    count = np.array([len(records) for records in records_per_rank], dtype=np.int64)
+    values = np.array(mpi_comm.alltoall(count.tolist()), dtype=np.int64)
+    if max(count.sum(), values.sum()) > _max_count:
+        raise SimulatorError(
+            f"Rank {mpi_rank} cannot exchange more than {_max_count} records at once"
+        )
+    r_buffer = np.empty(int(values.sum()) * dtype.itemsize, dtype=np.uint8)
+    displ = np.concatenate(([0], np.cumsum(count)[:-1]))
+    rdispl = np.concatenate(([0], np.cumsum(values)[:-1]))
+    datatype = _record_datatype(dtype.itemsize)
+    send = [buffer, count, displ, datatype]
+    receive = [r_buffer, values, rdispl, datatype]
+    return send, receive, values, dtype
+
+
+def _split_records(r_buffer: np.ndarray, values: np.ndarray, dtype: np.dtype):
+    received_records = r_buffer.view(dtype)
+    received = []
+    offset = 0
+    for n in values:
+        received.append(received_records[offset : offset + n])
+        offset += n
+    return received, int(values.sum())
+
+
+def move_records(records_per_rank: List[np.ndarray]):
+    """
+    Send a list of structured arrays (one per rank, all with the same dtype) to all
+    ranks, and receive the arrays all ranks send to this one. The records are moved
+    as raw bytes with Alltoallv, so no pickling is involved.
+
+    Returns
+    -------
+    received
+        list with the array received from each rank
+    n_receiving
+        total number of records received
+    """
+    send, receive, values, dtype = _records_exchange_buffers(records_per_rank)
+    mpi_comm.Alltoallv(send, receive)
+    return _split_records(receive[0], values, dtype)
+
+
+class PendingRecords:
+    """
+    Non-blocking version of ``move_records``, the records are only available
+    after ``wait``.
+    """
+
+    def __init__(self, records_per_rank: List[np.ndarray]):
+        self._send, self._receive, self._values, self._dtype = (
+            _records_exchange_buffers(records_per_rank)
+        )
+        self.n_receiving = int(self._values.sum())
+        self.request = mpi_comm.Ialltoallv(self._send, self._receive)
+
+    def wait(self):
+        self.request.Wait()
+        self._send = None
+        return _split_records(self._receive[0], self._values, self._dtype)
+
+
+class PendingPeopleExchange:
+    """
+    People exchange started by ``MovablePeople.start_exchange``. The subgroup keys
+    are already known, so it can tell which local groups will receive visitors,
+    while the people and immunity buffers are still in flight.
+    """
+
+    def __init__(self, movable_people, keys, people, immunities, n_people_going_abroad):
+        self.movable_people = movable_people
+        self.keys = keys
+        self.people = people
+        self.immunities = immunities
+        self.n_people_going_abroad = n_people_going_abroad
+        self.n_people_from_abroad = sum(
+            int(rank_keys["n_people"].sum()) for rank_keys in keys
+        )
+        self.visited_groups = defaultdict(set)
+        for rank_keys in keys:
+            for spec, group_id in zip(rank_keys["spec"], rank_keys["group_id"]):
+                self.visited_groups[spec.decode()].add(int(group_id))
+
+    def is_visited(self, group) -> bool:
+        """
+        Whether people from other domains come to the given group.
+        """
+        return group.id in self.visited_groups.get(group.spec, ())
+
+    def wait(self):
+        """
+        Waits for the people data to arrive and decodes it.
+
+        Returns
+        -------
+        people coming from abroad, as in ``MovablePeople.skinny_in``
+        """
+        people, _ = self.people.wait()
+        immunities, _ = self.immunities.wait()
+        for rank in range(mpi_size):
+            if len(self.keys[rank]):
+                self.movable_people.update(
+                    rank, self.keys[rank], people[rank], immunities[rank]
+                )
+        return self.movable_people.skinny_in
@@ -1,7 +1,6 @@
 import numpy as np
 from typing import List, Optional, Union
 import datetime
-from random import random
 import june.policy
 
 from june.epidemiology.infection import SymptomTag
@@ -21,6 +20,13 @@ class IndividualPolicy(Policy):
         self.policy_type = "individual"
         self.policy_subtype = None
 
+    def _random(self, person: Person, draw: int = 0) -> float:
+        """
+        Uniform number for a decision of the policy about ``person``, ``draw``
+        telling apart the decisions taken in one time step.
+        """
+        return self.random_source.random(f"policy.{self.spec}", person.id, draw)
+
 
 class IndividualPolicies(PolicyCollection):
     policy_type = "individual"
@@ -65,7 +71,7 @@ class IndividualPolicies(PolicyCollection):
                                 guardian = person.find_guardian()
                                 if guardian is not None:
                                     if guardian.busy:
-                                        for subgroup in guardian.subgroups.iter():
+                                        for subgroup in guardian.iter_subgroups():
                                             if (
                                                 subgroup is not None
                                                 and guardian in subgroup
@@ -176,7 +182,7 @@ class Quarantine(StayHome):
                 if person.symptoms.tag in (SymptomTag.mild, SymptomTag.severe):
                     release_day = time_of_symptoms_onset + self.n_days
                     if 0 < release_day - days_from_start < self.n_days:
-                        if random() < self.compliance * regional_compliance:
+                        if self._random(person) < self.compliance * regional_compliance:
                             return True
 
         if (person.vaccinated and person.vaccine_plan is None) or person.age < 18:
@@ -184,6 +190,8 @@ class Quarantine(StayHome):
                 time=days_from_start,
                 quarantine_days=self.n_days_household,
                 household_compliance=self.vaccinated_household_compliance * self.household_compliance * regional_compliance,
+                person=person,
+                random_source=self.random_source,
             )
 
         else:
@@ -191,6 +199,8 @@ class Quarantine(StayHome):
                 time=days_from_start,
                 quarantine_days=self.n_days_household,
                 household_compliance=self.household_compliance * regional_compliance,
+                person=person,
+                random_source=self.random_source,
             )
             
         return housemates_quarantine
@@ -266,7 +276,7 @@ class SchoolQuarantine(StayHome):
             < (days_from_start - person.primary_activity.quarantine_starting_date)
             < self.n_days
         ):
-            return random() < compliance
+            return self._random(person) < compliance
         return False
 
 
@@ -290,7 +300,7 @@ class Shielding(StayHome):
         if person.age >= self.min_age:
             if (
                 self.compliance is None
-                or random() < self.compliance * regional_compliance
+                or self._random(person) < self.compliance * regional_compliance
             ):
                 return True
         return False
@@ -380,7 +390,7 @@ class CloseSchools(SkipActivity):
                     if self.years_to_close and person.age in self.years_to_close:
                         return True
                     else:
-                        if random() > self.attending_compliance:
+                        if self._random(person) > self.attending_compliance:
                             return True
         except AttributeError:
             return False
@@ -477,7 +487,7 @@ class CloseCompanies(SkipActivity):
                         regional_compliance = person.region.regional_compliance
                     except:
                         regional_compliance = 1
-                        if random() < regional_compliance:
+                        if self._random(person, draw=0) < regional_compliance:
                             return True
 
             except AttributeError:
@@ -493,7 +503,7 @@ class CloseCompanies(SkipActivity):
                         regional_compliance = person.region.regional_compliance
                     except:
                         regional_compliance = 1
-                        if random() < regional_compliance:
+                        if self._random(person, draw=1) < regional_compliance:
                             return True
 
             except AttributeError:
@@ -511,7 +521,7 @@ class CloseCompanies(SkipActivity):
                         regional_compliance = person.region.regional_compliance
                     except:
                         regional_compliance = 1
-                        if random() < regional_compliance:
+                        if self._random(person, draw=2) < regional_compliance:
                             return True
             except AttributeError:
                 pass
@@ -525,7 +535,7 @@ class CloseCompanies(SkipActivity):
                         regional_compliance = person.region.regional_compliance
                     except:
                         regional_compliance = 1
-                        if random() < regional_compliance:
+                        if self._random(person, draw=3) < regional_compliance:
                             return True
             except AttributeError:
                 pass
@@ -549,11 +559,17 @@ class CloseCompanies(SkipActivity):
                         return True
                     # if there are too many or correct number of furloughed people then furlough with a probability
                     elif self.furlough_ratio >= self.furlough_probability:
-                        if random() < self.furlough_probability / self.furlough_ratio:
+                        if (
+                            self._random(person, draw=4)
+                            < self.furlough_probability / self.furlough_ratio
+                        ):
                             return True
                         # otherwise treat them as random
                         elif self.avoid_work_probability is not None:
-                            if random() < self.avoid_work_probability:
+                            if (
+                                self._random(person, draw=5)
+                                < self.avoid_work_probability
+                            ):
                                 return True
                 else:
                     return True
@@ -565,7 +581,10 @@ class CloseCompanies(SkipActivity):
             ):
                 # if there are too many key workers, scale them down - otherwise send all to work
                 if self.key_ratio > self.key_probability:
-                    if random() > self.key_probability / self.key_ratio:
+                    if (
+                        self._random(person, draw=6)
+                        > self.key_probability / self.key_ratio
+                    ):
                         return True
 
             elif (
@@ -586,13 +605,15 @@ class CloseCompanies(SkipActivity):
                         and self.key_ratio < self.key_probability
                     ):
                         if (
-                            random()
+                            self._random(person, draw=7)
                             < (self.furlough_probability - self.furlough_ratio)
                             / self.random_ratio
                         ):
                             return True
                         # correct for some random workers now being treated as furloughed
-                        elif random() < (self.key_probability - self.key_ratio) / (
+                        elif self._random(person, draw=8) < (
+                            self.key_probability - self.key_ratio
+                        ) / (
                             self.random_ratio
                             - (self.furlough_probability - self.furlough_ratio)
                         ):
@@ -600,7 +621,7 @@ class CloseCompanies(SkipActivity):
                     # if there are too few furloughed people
                     elif self.furlough_ratio < self.furlough_probability:
                         if (
-                            random()
+                            self._random(person, draw=9)
                             < (self.furlough_probability - self.furlough_ratio)
                             / self.random_ratio
                         ):
@@ -608,7 +629,7 @@ class CloseCompanies(SkipActivity):
                     # if there are too few kew workers
                     elif self.key_ratio < self.key_probability:
                         if (
-                            random()
+                            self._random(person, draw=10)
                             < (self.key_probability - self.key_ratio)
                             / self.random_ratio
                         ):
@@ -622,7 +643,7 @@ class CloseCompanies(SkipActivity):
                     # if there are too few furloughed people then randomly stop extra people from going to work
                     if self.furlough_ratio < self.furlough_probability:
                         if (
-                            random()
+                            self._random(person, draw=11)
                             < (self.furlough_probability - self.furlough_ratio)
                             / self.random_ratio
                         ):
@@ -636,13 +657,13 @@ class CloseCompanies(SkipActivity):
                     # if there are too few key workers then randomly boost more people going to work and do not subject them to the random choice
                     if self.key_ratio < self.key_probability:
                         if (
-                            random()
+                            self._random(person, draw=12)
                             < (self.key_probability - self.key_ratio)
                             / self.random_ratio
                         ):
                             return False
 
-                if random() < self.avoid_work_probability:
+                if self._random(person, draw=13) < self.avoid_work_probability:
                     return True
 
         return False
@@ -693,7 +714,7 @@ class LimitLongCommute(SkipActivity):
         if person.id not in self.long_distance_commuter_ids:
             return False
         else:
-            if random() < self.going_to_work_probability:
+            if self._random(person) < self.going_to_work_probability:
                 return True
             else:
                 return False
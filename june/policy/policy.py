@@ -14,11 +14,14 @@ from june.groups.leisure import Leisure
 from june.epidemiology.infection import SymptomTag
 from june.interaction import Interaction
 from june.utils import read_date, str_to_class
+from june.utils.random_streams import RandomSource
 
 default_config_filename = paths.configs_path / "defaults/policy/policy.yaml"
 
 
 class Policy(ABC):
+    random_source = RandomSource()
+
     def __init__(
         self,
         start_time: Union[str, datetime.datetime] = "1900-01-01",
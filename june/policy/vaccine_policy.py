@@ -1,5 +1,4 @@
 import operator
-from random import random
 import numpy as np
 import datetime
 from typing import List
@@ -210,15 +209,21 @@ class VaccineDistribution(Policy):
                 return True
         return False
 
-    def vaccinate(self, person, date):
+    def vaccinate(self, person, date, people=None):
         person.vaccinated = True
         first_dose_effective_date = date + datetime.timedelta(
             days=self.effective_after_first_dose
         )
         # second dose
-        if random() < self.second_dose_compliance:
-            second_dose_lag = np.random.normal(
-                loc=self.mean_time_delay, scale=self.std_time_delay
+        if (
+            self.random_source.random(f"{self._random_purpose}.second_dose", person.id)
+            < self.second_dose_compliance
+        ):
+            second_dose_lag = self.random_source.normal(
+                f"{self._random_purpose}.second_dose_lag",
+                person.id,
+                loc=self.mean_time_delay,
+                scale=self.std_time_delay,
             )
             second_dose_date = first_dose_effective_date + datetime.timedelta(
                 days=int(second_dose_lag)
@@ -240,17 +245,25 @@ class VaccineDistribution(Policy):
             original_effective_multiplier=person.immunity.effective_multiplier_dict,
         )
         self.vaccinated_ids.add(person.id)
+        if people is not None:
+            people.update_state(person)
+
+    @property
+    def _random_purpose(self):
+        return f"policy.{self.spec}.{self.group_attribute}.{self.group_value}"
 
     def daily_vaccine_probability(self, days_passed):
         return self.group_coverage * (
             1 / (self.total_days - days_passed * self.group_coverage)
         )
 
-    def apply(self, person: Person, date: datetime):
+    def apply(self, person: Person, date: datetime, people=None):
         if person.should_be_vaccinated and self.is_target_group(person):
             days_passed = (date - self.start_time).days
-            if random() < self.daily_vaccine_probability(days_passed=days_passed):
-                self.vaccinate(person=person, date=date)
+            if self.random_source.random(
+                f"{self._random_purpose}.first_dose", person.id
+            ) < self.daily_vaccine_probability(days_passed=days_passed):
+                self.vaccinate(person=person, date=date, people=people)
 
     def update_vaccine_effect(self, person, date):
         (
@@ -272,6 +285,7 @@ class VaccineDistribution(Policy):
             for pid in self.vaccinated_ids:
                 person = people.get_from_id(pid)
                 self.update_vaccine_effect(person=person, date=date)
+                people.update_state(person)
                 if person.vaccine_plan.is_finished(date):
                     ids_to_remove.add(person.id)
                     person.vaccine_plan = None
@@ -281,9 +295,9 @@ class VaccineDistribution(Policy):
 class VaccineDistributions(PolicyCollection):
     policy_type = "vaccine_distribution"
 
-    def apply(self, person: Person, date: datetime, active_policies):
+    def apply(self, person: Person, date: datetime, active_policies, people=None):
         for policy in active_policies:
-            policy.apply(person=person, date=date)
+            policy.apply(person=person, date=date, people=people)
 
     def is_active(self, date: datetime):
         if self.get_active(date):
@@ -45,7 +45,7 @@ class EventRecord:
             ]
             + [np.array(getattr(self, name), dtype=np.int32) for name in self.int_names]
             + [
-                np.array(getattr(self, name), dtype=np.float6432)
+                np.array(getattr(self, name), dtype=np.float32)
                 for name in self.float_names
             ]
             + [np.array(getattr(self, name), dtype="S20") for name in self.str_names]
@@ -196,3 +196,28 @@ class SymptomsRecord(EventRecord):
         self.infected_ids.append(infected_id)
         self.new_symptoms.append(symptoms)
         self.infection_ids.append(infection_id)
+
+
+class WorkloadRecord(EventRecord):
+    def __init__(
+        self,
+        hdf5_file,
+    ):
+        super().__init__(
+            hdf5_file=hdf5_file,
+            table_name="workload",
+            int_names=["n_groups", "n_skipped", "n_people", "n_infections"],
+            float_names=["n_pairs", "time"],
+            str_names=["specs"],
+        )
+
+    def accumulate(
+        self, spec, n_groups, n_skipped, n_people, n_pairs, n_infections, time
+    ):
+        self.specs.append(spec)
+        self.n_groups.append(n_groups)
+        self.n_skipped.append(n_skipped)
+        self.n_people.append(n_people)
+        self.n_pairs.append(n_pairs)
+        self.n_infections.append(n_infections)
+        self.time.append(time)
@@ -23,6 +23,7 @@ from june.records.event_records_writer import (
     DeathsRecord,
     RecoveriesRecord,
     SymptomsRecord,
+    WorkloadRecord,
 )
 from june.records.static_records_writer import (
     PeopleRecord,
@@ -35,6 +36,17 @@ from june import paths
 
 logger = logging.getLogger("records_writer")
 
+workload_summary_fields = [
+    "time_stamp",
+    "spec",
+    "n_groups",
+    "n_skipped",
+    "n_people",
+    "n_pairs",
+    "n_infections",
+    "time",
+]
+
 
 class Record:
     def __init__(
@@ -46,9 +58,11 @@ class Record:
         if mpi_rank is not None:
             self.filename = f"june_record.{mpi_rank}.h5"
             self.summary_filename = f"summary.{mpi_rank}.csv"
+            self.workload_summary_filename = f"workload_summary.{mpi_rank}.csv"
         else:
             self.filename = f"june_record.h5"
             self.summary_filename = f"summary.csv"
+            self.workload_summary_filename = f"workload_summary.csv"
         self.configs_filename = f"config.yaml"
         self.record_static_data = record_static_data
         try:
@@ -64,6 +78,7 @@ class Record:
                 "deaths": DeathsRecord(hdf5_file=self.file),
                 "recoveries": RecoveriesRecord(hdf5_file=self.file),
                 "symptoms": SymptomsRecord(hdf5_file=self.file),
+                "workload": WorkloadRecord(hdf5_file=self.file),
             }
             if self.record_static_data:
                 self.statics = {
@@ -88,6 +103,14 @@ class Record:
                 ["daily_hospital_deaths", "daily_deaths"]
             )
             writer.writerow(header)
+        self.workload_summary_file = open(
+            self.record_path / self.workload_summary_filename, "w", newline=""
+        )
+        self.workload_summary_writer = csv.DictWriter(
+            self.workload_summary_file, fieldnames=workload_summary_fields
+        )
+        self.workload_summary_writer.writeheader()
+        self.workload_summary_file.flush()
         description = {
             "description": f"Started runnning at {datetime.now()}. Good luck!"
         }
@@ -134,6 +157,11 @@ class Record:
         daily_infections, current_infected = defaultdict(int), defaultdict(int)
         for region in self.events["infections"].region_names:
             daily_infections[region] += 1
+        infected_per_region = world.people.infected_per_region
+        if infected_per_region is not None:
+            for region in world.regions:
+                current_infected[region.name] = infected_per_region.get(region.name, 0)
+            return daily_infections, current_infected
         for region in world.regions:
             current_infected[region.name] = len(
                 [person for person in region.people if person.infected]
@@ -187,6 +215,21 @@ class Record:
                         + data
                     )
 
+    def summarise_workload(self, timestamp: str, workload: "InteractionWorkload"):
+        """
+        Writes the interaction workload counters of the time step, per group spec,
+        to the workload table and to the workload summary. The summary file stays
+        open for the whole run and is flushed once per time step, so forked
+        processes never inherit unwritten rows.
+        """
+        time_stamp = timestamp.strftime("%Y-%m-%d")
+        for spec, counters in workload.counters.items():
+            self.accumulate(table_name="workload", spec=spec, **counters)
+            self.workload_summary_writer.writerow(
+                dict(counters, time_stamp=time_stamp, spec=spec)
+            )
+        self.workload_summary_file.flush()
+
     def combine_outputs(self, remove_left_overs=True):
         combine_records(self.record_path, remove_left_overs=remove_left_overs)
 
@@ -211,6 +254,7 @@ class Record:
             interaction_dict = {}
             interaction_dict["betas"] = interaction.betas
             interaction_dict["alpha_physical"] = interaction.alpha_physical
+            interaction_dict["engine"] = interaction.engine
             interaction_dict["contact_matrices"] = {}
             for key, values in interaction.contact_matrices.items():
                 interaction_dict["contact_matrices"][key] = values.tolist()
@@ -348,6 +392,24 @@ def combine_summaries(record_path, remove_left_overs=False, save_dir=None):
     summary.to_csv(full_summary_save_path)
 
 
+def combine_workload_summaries(record_path, remove_left_overs=False, save_dir=None):
+    record_path = Path(record_path)
+    summary_files = list(record_path.glob("workload_summary.*.csv"))
+    if not summary_files:
+        return
+    dfs = []
+    for summary_file in summary_files:
+        dfs.append(pd.read_csv(summary_file))
+        if remove_left_overs:
+            summary_file.unlink()
+    summary = pd.concat(dfs).groupby(["time_stamp", "spec"]).sum()
+    if save_dir is None:
+        save_path = record_path
+    else:
+        save_path = Path(save_dir)
+    summary.to_csv(save_path / "workload_summary.csv")
+
+
 def combine_hdf5s(
     record_path,
     table_names=("infections", "population"),
@@ -386,6 +448,9 @@ def combine_records(record_path, remove_left_overs=False, save_dir=None):
     combine_summaries(
         record_path, remove_left_overs=remove_left_overs, save_dir=save_dir
     )
+    combine_workload_summaries(
+        record_path, remove_left_overs=remove_left_overs, save_dir=save_dir
+    )
     combine_hdf5s(record_path, remove_left_overs=remove_left_overs, save_dir=save_dir)
 
 
@@ -400,6 +465,7 @@ def prepend_checkpoint_hdf5(
         "infections",
         "recoveries",
         "symptoms",
+        "workload",
     ),
     merged_record_path=None,
     checkpoint_date: str = None,
@@ -431,7 +497,10 @@ def prepend_checkpoint_hdf5(
 
                 for dataset in post_record.root._f_list_nodes():
                     description = getattr(post_record.root, dataset.name).description
-                    if dataset.name not in tables_to_merge:
+                    if (
+                        dataset.name not in tables_to_merge
+                        or dataset.name not in pre_record.root
+                    ):
                         arr_data = dataset[:]
                         merged_record.create_table(
                             merged_record.root, dataset.name, description=description
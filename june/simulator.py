@@ -3,6 +3,7 @@ import datetime
 import numpy as np
 import pickle
 import yaml
+from collections import defaultdict
 from itertools import chain
 from typing import Optional, List, Dict, Union
 from pathlib import Path
@@ -17,6 +18,8 @@ from june.exc import SimulatorError
 from june.groups.leisure import Leisure
 from june.groups.travel import Travel
 from june.groups.group.interactive import InteractiveGroup
+from june.groups import Group, Supergroup
+from june.groups.group import InfectorIndex
 from june.epidemiology.epidemiology import Epidemiology
 from june.interaction import Interaction
 from june.policy import Policies
@@ -26,6 +29,8 @@ from june.records import Record
 from june.world import World
 from june.mpi_setup import mpi_comm, mpi_size, mpi_rank, move_info
 from june.utils.profiler import profile
+from june.utils.random_streams import RandomSource
+from june.utils.tracing import tracer
 
 default_config_filename = paths.configs_path / "config_example.yaml"
 
@@ -54,6 +59,12 @@ def _read_checkpoint_dates_from_file(config_filename):
     return _read_checkpoint_dates(config.get("checkpoint_save_dates", None))
 
 
+def _read_mpi_overlap_from_file(config_filename):
+    with open(config_filename) as f:
+        config = yaml.load(f, Loader=yaml.FullLoader)
+    return bool(config.get("mpi_overlap", False))
+
+
 def _read_checkpoint_dates(checkpoint_dates):
     if isinstance(checkpoint_dates, datetime.date):
         return (checkpoint_dates,)
@@ -72,6 +83,49 @@ def _read_checkpoint_dates(checkpoint_dates):
         return ()
 
 
+class SimulatorSnapshot:
+    """
+    State of a simulator that changes during a run: the world's epidemic state,
+    the timer, the dates already seeded by the infection seeds and the people
+    followed by the vaccine distributions.
+
+    The rest of the policy state is either kept on the world (quarantine dates,
+    regional lockdowns, see ``WorldSnapshot``) or recomputed from the date at the
+    start of every time step (beta reductions, leisure reductions and regional
+    compliance), so a snapshot taken while a policy is active restores it. Events
+    keep no state of their own during a run: the people they infect, cure or
+    mutate and the households they send carers to are part of the world state.
+    """
+
+    def __init__(self, simulator: "Simulator"):
+        self.world = simulator.world.snapshot()
+        timer = simulator.timer
+        self.timer = (timer.date, timer.shift, timer.delta_time, timer.previous_date)
+        self.infection_seeds = []
+        if simulator.epidemiology and simulator.epidemiology.infection_seeds:
+            self.infection_seeds = [
+                (seed, set(seed.dates_seeded), seed.past_infections_seeded)
+                for seed in simulator.epidemiology.infection_seeds
+            ]
+        self.vaccine_distributions = [
+            (policy, set(policy.vaccinated_ids))
+            for policy in simulator._vaccine_distribution_policies()
+        ]
+
+    def restore(self, simulator: "Simulator"):
+        # people vaccinated during the run are reset even if untracked
+        vaccinated_ids = set()
+        for policy, policy_vaccinated_ids in self.vaccine_distributions:
+            vaccinated_ids |= policy.vaccinated_ids
+            policy.vaccinated_ids = set(policy_vaccinated_ids)
+        self.world.restore(simulator.world, changed_ids=vaccinated_ids)
+        timer = simulator.timer
+        timer.date, timer.shift, timer.delta_time, timer.previous_date = self.timer
+        for seed, dates_seeded, past_infections_seeded in self.infection_seeds:
+            seed.dates_seeded = set(dates_seeded)
+            seed.past_infections_seeded = past_infections_seeded
+
+
 class Simulator:
     ActivityManager = ActivityManager
 
@@ -86,6 +140,8 @@ class Simulator:
         record: Optional[Record] = None,
         checkpoint_save_dates: List[datetime.date] = None,
         checkpoint_save_path: str = None,
+        mpi_overlap: bool = False,
+        rebalancer: Optional["DomainRebalancer"] = None,
     ):
         """
         Class to run an epidemic spread simulation on the world.
@@ -94,6 +150,14 @@ class Simulator:
         ----------
         world:
             instance of World class
+        mpi_overlap:
+            if True, the people exchange between domains is started without waiting
+            for it, the groups that receive no people from other domains are time
+            stepped while the data is in flight, and the non essential barriers
+            between ranks are skipped.
+        rebalancer:
+            if given, the interaction cost of each super area is measured and the
+            domains are rebalanced at the checkpoint dates, see ``DomainRebalancer``.
         """
         self.activity_manager = activity_manager
         self.world = world
@@ -101,11 +165,24 @@ class Simulator:
         self.events = events
         self.timer = timer
         self.epidemiology = epidemiology
+        self.random_source = RandomSource()
+        self.bind_random_source()
+        self._set_random_streams_timestep()
+        self.infector_index = InfectorIndex()
+        self._bind_world()
         if self.epidemiology:
             self.epidemiology.set_medical_care(
                 world=world, activity_manager=activity_manager
             )
             self.epidemiology.set_immunity(self.world.people)
+            if self.epidemiology.infection_selectors:
+                infection_ids = list(
+                    self.epidemiology.infection_selectors.infection_id_to_selector
+                )
+            else:
+                infection_ids = []
+            self.world.people.build_store(infection_ids=infection_ids)
+            self.epidemiology.set_population(self.world.people)
         if self.events is not None:
             self.events.init_events(world=world)
         # self.comment = comment
@@ -115,6 +192,8 @@ class Simulator:
                 checkpoint_save_path = "results/checkpoints"
             self.checkpoint_save_path = Path(checkpoint_save_path)
             self.checkpoint_save_path.mkdir(parents=True, exist_ok=True)
+        self.mpi_overlap = mpi_overlap
+        self.set_rebalancer(rebalancer)
         self.record = record
         if self.record is not None and self.record.record_static_data:
             self.record.static_data(world=world)
@@ -132,6 +211,7 @@ class Simulator:
         config_filename: str = default_config_filename,
         checkpoint_save_path: str = None,
         record: Optional[Record] = None,
+        rebalancer: Optional["DomainRebalancer"] = None,
     ) -> "Simulator":
 
         """
@@ -153,6 +233,7 @@ class Simulator:
         A Simulator
         """
         checkpoint_save_dates = _read_checkpoint_dates_from_file(config_filename)
+        mpi_overlap = _read_mpi_overlap_from_file(config_filename)
         timer = Timer.from_file(config_filename=config_filename)
         activity_manager = cls.ActivityManager.from_file(
             config_filename=config_filename,
@@ -172,6 +253,8 @@ class Simulator:
             record=record,
             checkpoint_save_dates=checkpoint_save_dates,
             checkpoint_save_path=checkpoint_save_path,
+            mpi_overlap=mpi_overlap,
+            rebalancer=rebalancer,
         )
 
     @classmethod
@@ -205,22 +288,180 @@ class Simulator:
             reset_infections=reset_infections,
         )
 
+    def _vaccine_distribution_policies(self):
+        policies = self.activity_manager.policies
+        if policies is None or policies.vaccine_distribution is None:
+            return []
+        return policies.vaccine_distribution.policies
+
+    def snapshot(self) -> SimulatorSnapshot:
+        """
+        Captures the state of the simulation, typically before ``run``, so that
+        more runs can be done on the same world after calling ``restore``.
+        """
+        return SimulatorSnapshot(self)
+
+    def restore(self, snapshot: SimulatorSnapshot, record: Optional[Record] = None):
+        """
+        Resets the simulation to the given snapshot. Only the people whose state
+        changed since the snapshot are touched.
+
+        Parameters
+        ----------
+        snapshot
+            snapshot taken with ``snapshot``
+        record
+            record for the next run, if None the current one is kept
+        """
+        self.clear_world()
+        snapshot.restore(self)
+        if record is not None:
+            self.record = record
+
+    def set_rebalancer(self, rebalancer: Optional["DomainRebalancer"]):
+        self.rebalancer = rebalancer
+        if rebalancer is None:
+            self.super_area_costs = None
+        else:
+            from june.domains.load_balancing import SuperAreaCosts
+
+            self.super_area_costs = SuperAreaCosts()
+
+    def _time_step_for_super_group(
+        self, super_group, people_from_abroad=None, groups=None
+    ):
+        tick = perf_counter()
+        with tracer.span(f"interaction.{super_group.spec}", category="interaction"):
+            ret = self.interaction.time_step_for_super_group(
+                super_group=super_group,
+                people_from_abroad=people_from_abroad,
+                delta_time=self.timer.duration,
+                record=self.record,
+                groups=groups,
+            )
+        if self.super_area_costs is not None:
+            self.super_area_costs.add(
+                super_group if groups is None else groups, perf_counter() - tick
+            )
+        return ret
+
+    def _groups_with_infectors(self, super_group, people_from_abroad=None):
+        """
+        Returns the groups of the supergroup that may need to be time stepped, that
+        is the ones with at least one infected person (as tracked by the infector
+        index while people were moved), and the ones visited by infectors from other
+        domains, sorted by id. The rest of the groups cannot infect anyone and are
+        skipped.
+        """
+        spec = super_group.group_spec
+        groups = dict(self.infector_index.groups_with_infectors.get(spec, {}))
+        if people_from_abroad:
+            for group_id, people_per_subgroup in people_from_abroad.get(
+                spec, {}
+            ).items():
+                if group_id in groups:
+                    continue
+                for foreign_people in people_per_subgroup.values():
+                    if foreign_people.has_infectors:
+                        groups[group_id] = super_group.get_from_id(group_id)
+                        break
+        return sorted(groups.values(), key=lambda group: group.id)
+
+    @staticmethod
+    def _count_people(super_group, people_from_abroad=None):
+        """
+        Counts the people in the groups of the supergroup, including the ones from
+        other domains, to check people conservation.
+        """
+        n_people = 0
+        for group in super_group:
+            if group.external:
+                continue
+            for subgroup in group.subgroups:
+                n_people += len(subgroup.people)
+        if people_from_abroad:
+            for people_per_subgroup in people_from_abroad.get(
+                super_group.group_spec, {}
+            ).values():
+                for foreign_people in people_per_subgroup.values():
+                    n_people += len(foreign_people)
+        return n_people
+
+    def _account_skipped_groups(self, super_group, n_groups, n_people):
+        """
+        Adds the groups that were skipped because they had no infectors to the
+        interaction workload.
+        """
+        n_skipped = len(super_group) - n_groups
+        if n_skipped > 0:
+            self.interaction.workload.add(
+                super_group.group_spec,
+                n_groups=n_skipped,
+                n_skipped=n_skipped,
+                n_people=n_people,
+            )
+
+    def _bind_world(self):
+        """
+        Sets the epoch of the world on its people and groups, and the infector
+        index of the simulator on the groups, so that it is filled as people are
+        appended to them.
+        """
+        epoch = self.world.epoch
+        for person in self.world.people:
+            person.epoch = epoch
+        for super_group in vars(self.world).values():
+            if not isinstance(super_group, Supergroup):
+                continue
+            for group in super_group:
+                if isinstance(group, Group):
+                    group.epoch = epoch
+                    group.infector_index = self.infector_index
+
     def clear_world(self):
         """
         Removes everyone from all possible groups, and sets everyone's busy attribute
-        to False.
+        to False. Group memberships, busy and leisure are tagged with the epoch in
+        which they were set, so this only advances the epoch of the world (see
+        ``june.epoch``).
         """
-        for super_group_name in self.activity_manager.all_super_groups:
-            if "visits" in super_group_name:
-                continue
-            grouptype = getattr(self.world, super_group_name)
-            if grouptype is not None:
-                for group in grouptype.members:
-                    group.clear()
+        self.world.epoch.advance()
+        self.infector_index.clear()
+
+    def bind_random_source(self):
+        """
+        Points the random source of the simulator to the random streams of the
+        interaction, and sets it on everything that draws random numbers for people:
+        the infection seeds and selectors, the immunity setter, the policies, the
+        leisure and the events. It has to be called again when any of them is
+        replaced.
+        """
+        self.random_source.streams = self.interaction.random_streams
+        users = []
+        if self.epidemiology:
+            selectors = self.epidemiology.infection_selectors
+            if selectors:
+                users += selectors.infection_id_to_selector.values()
+            if self.epidemiology.infection_seeds:
+                for infection_seed in self.epidemiology.infection_seeds:
+                    users += [infection_seed, infection_seed.infection_selector]
+            if self.epidemiology.immunity_setter:
+                users.append(self.epidemiology.immunity_setter)
+        if self.activity_manager.policies is not None:
+            users += self.activity_manager.policies.policies or []
+        leisure = self.activity_manager.leisure
+        if leisure is not None:
+            users += [leisure, *leisure.leisure_distributors.values()]
+        if self.events is not None:
+            users += self.events.events or []
+        for user in users:
+            user.random_source = self.random_source
 
-        for person in self.world.people.members:
-            person.busy = False
-            person.subgroups.leisure = None
+    def _set_random_streams_timestep(self):
+        # minutes since the start, identifies the time step for the random streams
+        timestep = round(self.timer.now * 24 * 60)
+        self.interaction.timestep = timestep
+        self.random_source.timestep = timestep
 
     def do_timestep(self):
         """
@@ -234,28 +475,33 @@ class Simulator:
         """
         output_logger.info("==================== timestep ====================")
         tick, tickw = perf_counter(), wall_clock()
+        tracer.set_date(self.timer.date)
+        self._set_random_streams_timestep()
         if self.activity_manager.policies is not None:
-            self.activity_manager.policies.interaction_policies.apply(
-                date=self.timer.date,
-                interaction=self.interaction,
-            )
-            self.activity_manager.policies.regional_compliance.apply(
-                date=self.timer.date, regions=self.world.regions
-            )
-            if self.activity_manager.policies.vaccine_distribution is not None:
-                self.activity_manager.policies.vaccine_distribution.update_vaccinated(
-                    self.world.people, date=self.timer.date
+            with tracer.span("policies"):
+                self.activity_manager.policies.interaction_policies.apply(
+                    date=self.timer.date,
+                    interaction=self.interaction,
                 )
+                self.activity_manager.policies.regional_compliance.apply(
+                    date=self.timer.date, regions=self.world.regions
+                )
+                if self.activity_manager.policies.vaccine_distribution is not None:
+                    self.activity_manager.policies.vaccine_distribution.update_vaccinated(
+                        self.world.people, date=self.timer.date
+                    )
+        self.interaction.reset_beta_table()
         activities = self.timer.activities
         # apply events
         if self.events is not None:
-            self.events.apply(
-                date=self.timer.date,
-                world=self.world,
-                activities=activities,
-                day_type=self.timer.day_type,
-                simulator=self,
-            )
+            with tracer.span("events"):
+                self.events.apply(
+                    date=self.timer.date,
+                    world=self.world,
+                    activities=activities,
+                    day_type=self.timer.day_type,
+                    simulator=self,
+                )
         if not activities or len(activities) == 0:
             output_logger.info("==== do_timestep(): no active groups found. ====")
             return
@@ -264,7 +510,7 @@ class Simulator:
             n_people_from_abroad,
             n_people_going_abroad,
             to_send_abroad,  # useful for knowing who's MPI-ing, so can send extra info as needed.
-        ) = self.activity_manager.do_timestep()
+        ) = self.activity_manager.do_timestep(non_blocking=self.mpi_overlap)
         tick_interaction = perf_counter()
 
         # get the supergroup instances that are active in this time step:
@@ -292,31 +538,102 @@ class Simulator:
         # main interaction loop
         infected_ids = []  # ids of the newly infected people
         infection_ids = []  # ids of the viruses they got
-        for super_group in super_group_instances:
-            for group in super_group:
-                if group.external:
-                    continue
-                else:
-                    people_from_abroad = people_from_abroad_dict.get(
-                        group.spec, {}
-                    ).get(group.id, None)
+        # only the groups with infectors are time stepped, people are counted
+        # in all groups to check people conservation.
+        if self.mpi_overlap:
+            # people_from_abroad_dict is still in flight, first run the groups
+            # that no one from other domains visits.
+            people_exchange = people_from_abroad_dict
+            n_groups_stepped = defaultdict(int)
+            n_people_stepped = defaultdict(int)
+            for super_group in super_group_instances:
+                groups = self._groups_with_infectors(super_group)
+                local_groups = [
+                    group for group in groups if not people_exchange.is_visited(group)
+                ]
+                (
+                    new_infected_ids,
+                    new_infection_ids,
+                    super_group_size,
+                ) = self._time_step_for_super_group(
+                    super_group=super_group, groups=local_groups
+                )
+                infected_ids += new_infected_ids
+                infection_ids += new_infection_ids
+                n_groups_stepped[super_group.spec] += len(local_groups)
+                n_people_stepped[super_group.spec] += super_group_size
+            tick_waiting = perf_counter()
+            with tracer.span("move_people_waiting", category="mpi"):
+                people_from_abroad_dict = people_exchange.wait()
+            rank_logger.info(
+                f"Rank {mpi_rank} -- move_people_waiting -- "
+                f"{perf_counter()-tick_waiting}"
+            )
+            for super_group in super_group_instances:
+                groups = self._groups_with_infectors(
+                    super_group, people_from_abroad=people_from_abroad_dict
+                )
+                super_group_n_people = self._count_people(
+                    super_group, people_from_abroad=people_from_abroad_dict
+                )
+                visited_groups = [
+                    group for group in groups if people_exchange.is_visited(group)
+                ]
+                if visited_groups:
                     (
                         new_infected_ids,
                         new_infection_ids,
-                        group_size,
-                    ) = self.interaction.time_step_for_group(
-                        group=group,
-                        people_from_abroad=people_from_abroad,
-                        delta_time=self.timer.duration,
-                        record=self.record,
+                        super_group_size,
+                    ) = self._time_step_for_super_group(
+                        super_group=super_group,
+                        people_from_abroad=people_from_abroad_dict,
+                        groups=visited_groups,
                     )
                     infected_ids += new_infected_ids
                     infection_ids += new_infection_ids
-                    n_people += group_size
+                    n_groups_stepped[super_group.spec] += len(visited_groups)
+                    n_people_stepped[super_group.spec] += super_group_size
+                self._account_skipped_groups(
+                    super_group,
+                    n_groups=n_groups_stepped[super_group.spec],
+                    n_people=super_group_n_people
+                    - n_people_stepped[super_group.spec],
+                )
+                n_people += super_group_n_people
+        else:
+            for super_group in super_group_instances:
+                groups = self._groups_with_infectors(
+                    super_group, people_from_abroad=people_from_abroad_dict
+                )
+                super_group_n_people = self._count_people(
+                    super_group, people_from_abroad=people_from_abroad_dict
+                )
+                (
+                    new_infected_ids,
+                    new_infection_ids,
+                    super_group_size,
+                ) = self._time_step_for_super_group(
+                    super_group=super_group,
+                    people_from_abroad=people_from_abroad_dict,
+                    groups=groups,
+                )
+                infected_ids += new_infected_ids
+                infection_ids += new_infection_ids
+                self._account_skipped_groups(
+                    super_group,
+                    n_groups=len(groups),
+                    n_people=super_group_n_people - super_group_size,
+                )
+                n_people += super_group_n_people
         tock_interaction = perf_counter()
         rank_logger.info(
             f"Rank {mpi_rank} -- interaction -- {tock_interaction-tick_interaction}"
         )
+        if self.record is not None:
+            self.record.summarise_workload(
+                timestamp=self.timer.date, workload=self.interaction.workload
+            )
+        self.interaction.workload.reset()
         self.epidemiology.do_timestep(
             world=self.world,
             timer=self.timer,
@@ -325,10 +642,12 @@ class Simulator:
             infection_ids=infection_ids,
             people_from_abroad_dict=people_from_abroad_dict,
         )
-        tick, tickw = perf_counter(), wall_clock()
-        mpi_comm.Barrier()
-        tock, tockw = perf_counter(), wall_clock()
-        rank_logger.info(f"Rank {mpi_rank} -- interaction_waiting -- {tock-tick}")
+        if not self.mpi_overlap:
+            tick, tickw = perf_counter(), wall_clock()
+            with tracer.span("interaction_waiting", category="mpi"):
+                mpi_comm.Barrier()
+            tock, tockw = perf_counter(), wall_clock()
+            rank_logger.info(f"Rank {mpi_rank} -- interaction_waiting -- {tock-tick}")
 
         # recount people active to check people conservation
         people_active = (
@@ -345,7 +664,8 @@ class Simulator:
             )
 
         # remove everyone from their active groups
-        self.clear_world()
+        with tracer.span("clear_world"):
+            self.clear_world()
         tock, tockw = perf_counter(), wall_clock()
         output_logger.info(
             f"CMS: Timestep for rank {mpi_rank}/{mpi_size} - {tock - tick},"
@@ -353,9 +673,15 @@ class Simulator:
         )
         mpi_logger.info(f"{self.timer.date},{mpi_rank},timestep,{tock-tick}")
 
-    def run(self):
+    def run(self, until: Optional[datetime.datetime] = None):
         """
         Run simulation with n_seed initial infections
+
+        Parameters
+        ----------
+        until
+            if given, the simulation stops before this date instead of at the final
+            date of the timer, and can be continued by calling ``run`` again.
         """
         output_logger.info(
             f"Starting simulation for {self.timer.total_days} days at day {self.timer.date},"
@@ -368,12 +694,17 @@ class Simulator:
                 epidemiology=self.epidemiology,
                 activity_manager=self.activity_manager,
             )
-        while self.timer.date < self.timer.final_date:
+        final_date = self.timer.final_date
+        if until is not None:
+            final_date = min(final_date, until)
+        while self.timer.date < final_date:
+            self._set_random_streams_timestep()
             if self.epidemiology:
                 self.epidemiology.infection_seeds_timestep(
                     self.timer, record=self.record
                 )
-            mpi_comm.Barrier()
+            if not self.mpi_overlap:
+                mpi_comm.Barrier()
             if mpi_rank == 0:
                 rank_logger.info("Next timestep")
             self.do_timestep()
@@ -387,7 +718,54 @@ class Simulator:
                     f"Saving simulation checkpoint at {self.timer.date.date()}"
                 )
                 self.save_checkpoint(saving_date)
+                if self.rebalancer is not None and self.rebalancer.should_rebalance(
+                    saving_date
+                ):
+                    self.rebalance(saving_date)
+                    # the timer is already at the start of the next day
+                    continue
             next(self.timer)
+        if tracer.enabled:
+            tracer.save()
+
+    def rebalance(self, saving_date):
+        """
+        Moves this rank to the domain given by the rebalancer, restored from the
+        checkpoint of ``saving_date``. The world, the activity manager and the
+        epidemiology are replaced by those built for the new domain, while the
+        policies (with the vaccine campaigns), the events, the interaction (with
+        its caches and workload counters), the record, the timer and the
+        checkpoint settings are kept and bound to the new world. The timer is
+        moved to the start of the day after the checkpoint.
+        """
+        rebalanced = self.rebalancer.rebalance(self, saving_date)
+        if self.epidemiology and rebalanced.epidemiology:
+            for seed, new_seed in zip(
+                self.epidemiology.infection_seeds or [],
+                rebalanced.epidemiology.infection_seeds or [],
+            ):
+                new_seed.dates_seeded = set(seed.dates_seeded)
+                new_seed.past_infections_seeded = seed.past_infections_seeded
+        policies = self.activity_manager.policies
+        self.world = rebalanced.world
+        self.activity_manager = rebalanced.activity_manager
+        self.activity_manager.timer = self.timer
+        self.activity_manager.policies = policies
+        if policies is not None:
+            policies.init_policies(world=self.world)
+        self.epidemiology = rebalanced.epidemiology
+        if self.epidemiology:
+            self.epidemiology.set_medical_care(
+                world=self.world, activity_manager=self.activity_manager
+            )
+        if self.events is not None:
+            self.events.init_events(world=self.world)
+        self.bind_random_source()
+        self._bind_world()
+        self.timer.reset_to_new_date(rebalanced.timer.date)
+        self.super_area_costs.reset()
+        # the groups of the new domain are filled when it is loaded
+        self.clear_world()
 
     def save_checkpoint(self, saving_date):
         from june.hdf5_savers.checkpoint_saver import save_checkpoint_to_hdf5
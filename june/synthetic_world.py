@@ -0,0 +1,525 @@
+import json
+import logging
+from collections import defaultdict
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+import yaml
+from sklearn.neighbors import BallTree
+
+from june import paths
+from june.demography import Person, Population
+from june.geography import (
+    Area,
+    Areas,
+    Geography,
+    Region,
+    Regions,
+    SuperArea,
+    SuperAreas,
+)
+from june.groups import (
+    CareHome,
+    CareHomes,
+    Cemeteries,
+    Companies,
+    Company,
+    Hospital,
+    Hospitals,
+    Household,
+    Households,
+    School,
+    Schools,
+)
+from june.groups.leisure import Cinemas, Groceries, Gyms, Pubs
+from june.world import World
+
+default_config_filename = paths.configs_path / "defaults/synthetic_world.yaml"
+
+logger = logging.getLogger("synthetic_world")
+
+social_venues_classes = {
+    "pubs": Pubs,
+    "groceries": Groceries,
+    "cinemas": Cinemas,
+    "gyms": Gyms,
+}
+
+
+def _random_round(x: float, rng) -> int:
+    """
+    Rounds x up with probability equal to its fractional part.
+    """
+    floor = int(x)
+    return floor + int(rng.random() < x - floor)
+
+
+def _split_evenly(n: int, n_bins: int) -> np.ndarray:
+    counts = np.full(n_bins, n // n_bins, dtype=np.int64)
+    counts[: n % n_bins] += 1
+    return counts
+
+
+class SyntheticWorldGenerator:
+    """
+    Generates worlds of any size that do not need the downloaded census data, to
+    benchmark, profile and stress test the code offline. Super areas are laid on a
+    square grid, split into regions and areas, and filled with people, households,
+    care homes, schools, companies, hospitals and social venues following the size
+    distributions of the configuration file. The generated world can be saved with
+    ``save_world_to_hdf5`` like any other world, and
+    ``save_domain_decomposition_inputs`` writes the super area centroids and
+    adjacency graph that ``DomainSplitter`` needs.
+
+    Commuting by public transport, cities, stations and universities are not
+    generated.
+
+    Parameters
+    ----------
+    geography
+        size of areas and super areas, and layout of the grid of super areas
+    age_distribution
+        fraction of people in each 5 year age band, from 0-4 to 95-99
+    households
+        household size distribution
+    care_homes
+        care homes per person, number of residents and workers
+    schools
+        age range and size of primary and secondary schools, and teacher ratio
+    companies
+        employment rate, commuting and company size distribution
+    hospitals
+        hospitals per person, beds and workers
+    social_venues
+        people per venue for each type of social venue
+    """
+
+    def __init__(
+        self,
+        geography: dict,
+        age_distribution: List[float],
+        households: dict,
+        care_homes: dict,
+        schools: dict,
+        companies: dict,
+        hospitals: dict,
+        social_venues: dict,
+    ):
+        self.geography = geography
+        self.age_distribution = np.array(age_distribution, dtype=np.float64)
+        self.age_distribution /= self.age_distribution.sum()
+        self.households = households
+        self.care_homes = care_homes
+        self.schools = schools
+        self.companies = companies
+        self.hospitals = hospitals
+        self.social_venues = social_venues
+
+    @classmethod
+    def from_file(cls, config_filename: str = default_config_filename):
+        with open(config_filename) as f:
+            config = yaml.load(f, Loader=yaml.FullLoader)
+        return cls(**config)
+
+    def generate(self, n_people: int, seed: Optional[int] = None) -> World:
+        """
+        Generates a world with ``n_people`` people.
+
+        Parameters
+        ----------
+        n_people
+            number of people in the world
+        seed
+            seed of the random generator, the same seed gives the same world
+        """
+        rng = np.random.default_rng(seed)
+        world = World()
+        geography = self.generate_geography(n_people=n_people, rng=rng)
+        world.areas = geography.areas
+        world.super_areas = geography.super_areas
+        world.regions = geography.regions
+        logger.info(f"Populating {len(world.areas)} areas with {n_people} people")
+        world.people = self.populate_areas(world.areas, n_people=n_people, rng=rng)
+        world.care_homes = self.generate_care_homes(world.super_areas, rng=rng)
+        world.households = self.generate_households(world.areas, rng=rng)
+        world.schools = self.generate_schools(world.super_areas, rng=rng)
+        world.hospitals = self.generate_hospitals(
+            world.super_areas, n_people=n_people, rng=rng
+        )
+        world.companies = self.distribute_workers(world, rng=rng)
+        social_venues = self.generate_social_venues(world.super_areas, rng=rng)
+        for spec, venues in social_venues.items():
+            setattr(world, spec, venues)
+        self.link_social_venues_to_areas(world.areas, social_venues)
+        world.cemeteries = Cemeteries()
+        logger.info(
+            f"Synthetic world has {len(world.people)} people, "
+            f"{len(world.households)} households, {len(world.companies)} companies "
+            f"and {len(world.schools)} schools"
+        )
+        return world
+
+    def generate_geography(self, n_people: int, rng) -> Geography:
+        config = self.geography
+        n_areas = max(1, int(np.ceil(n_people / config["people_per_area"])))
+        n_super_areas = max(1, int(np.ceil(n_areas / config["areas_per_super_area"])))
+        side = int(np.ceil(np.sqrt(n_super_areas)))
+        spacing = config["super_area_spacing"]
+        centre_latitude, centre_longitude = config["centre"]
+        longitude_spacing = spacing / np.cos(np.deg2rad(centre_latitude))
+        regions, super_areas, areas = [], [], []
+        for i, n_super_area_areas in enumerate(_split_evenly(n_areas, n_super_areas)):
+            if i % config["super_areas_per_region"] == 0:
+                region = Region(name=f"Synthetic Region {len(regions) + 1}")
+                regions.append(region)
+            row, column = divmod(i, side)
+            super_area = SuperArea(
+                name=f"S02{i:07d}",
+                coordinates=np.array(
+                    [
+                        centre_latitude + (row - side / 2) * spacing,
+                        centre_longitude + (column - side / 2) * longitude_spacing,
+                    ]
+                ),
+                region=region,
+            )
+            for _ in range(n_super_area_areas):
+                offset = rng.uniform(-0.5, 0.5, size=2) * [spacing, longitude_spacing]
+                area = Area(
+                    name=f"S00{len(areas):07d}",
+                    super_area=super_area,
+                    coordinates=super_area.coordinates + offset,
+                    socioeconomic_index=rng.random(),
+                )
+                super_area.areas.append(area)
+                areas.append(area)
+            region.super_areas.append(super_area)
+            super_areas.append(super_area)
+        return Geography(Areas(areas), SuperAreas(super_areas), Regions(regions))
+
+    def populate_areas(self, areas: Areas, n_people: int, rng) -> Population:
+        bands = rng.choice(len(self.age_distribution), size=n_people, p=self.age_distribution)
+        ages = (5 * bands + rng.integers(0, 5, size=n_people)).tolist()
+        sexes = np.where(rng.random(n_people) < 0.5, "f", "m").tolist()
+        people = []
+        for area, n_area_people in zip(areas, _split_evenly(n_people, len(areas))):
+            start = len(people)
+            for age, sex in zip(
+                ages[start : start + n_area_people], sexes[start : start + n_area_people]
+            ):
+                person = Person.from_attributes(sex=sex, age=age)
+                area.add(person)
+                people.append(person)
+        return Population(people)
+
+    def generate_care_homes(self, super_areas: SuperAreas, rng) -> CareHomes:
+        config = self.care_homes
+        care_homes = []
+        for super_area in super_areas:
+            people = super_area.people
+            n_care_homes = min(
+                _random_round(len(people) / config["people_per_care_home"], rng),
+                len(super_area.areas),
+            )
+            # the loaders need at least one care home
+            if not care_homes and super_area is super_areas[-1]:
+                n_care_homes = max(n_care_homes, 1)
+            if n_care_homes == 0:
+                continue
+            old_people = sorted(
+                (person for person in people if person.age >= config["residents_min_age"]),
+                key=lambda person: person.age,
+                reverse=True,
+            )
+            n_residents = config["residents"]
+            for i, area_index in enumerate(
+                rng.choice(len(super_area.areas), size=n_care_homes, replace=False)
+            ):
+                residents = old_people[i * n_residents : (i + 1) * n_residents]
+                if not residents:
+                    break
+                area = super_area.areas[area_index]
+                care_home = CareHome(
+                    area=area,
+                    n_residents=len(residents),
+                    n_workers=int(
+                        np.ceil(len(residents) / config["residents_per_worker"])
+                    ),
+                )
+                for person in residents:
+                    care_home.add(person)
+                area.care_home = care_home
+                care_homes.append(care_home)
+        return CareHomes(care_homes)
+
+    def generate_households(self, areas: Areas, rng) -> Households:
+        sizes = np.array(list(self.households["size_distribution"].keys()), dtype=int)
+        probabilities = np.array(
+            list(self.households["size_distribution"].values()), dtype=np.float64
+        )
+        probabilities /= probabilities.sum()
+        households = []
+        for area in areas:
+            people = [person for person in area.people if person.residence is None]
+            people = [people[i] for i in rng.permutation(len(people))]
+            adults = [person for person in people if person.age >= 18]
+            kids = [person for person in people if person.age < 18]
+            household_sizes = rng.choice(sizes, size=len(people), p=probabilities)
+            for size in household_sizes.tolist():
+                if not adults and not kids:
+                    break
+                # up to two adults, the rest of the places go to kids first
+                members = [adults.pop() for _ in range(min(size, 2, len(adults)))]
+                while len(members) < size and (kids or adults):
+                    members.append(kids.pop() if kids else adults.pop())
+                if any(person.age < 18 for person in members):
+                    household_type = "family"
+                elif all(person.age >= 65 for person in members):
+                    household_type = "old"
+                else:
+                    household_type = "nokids"
+                household = Household(type=household_type, area=area, max_size=size)
+                for person in members:
+                    household.add(
+                        person,
+                        subgroup_type=household.get_leisure_subgroup_type(person),
+                    )
+                area.households.append(household)
+                households.append(household)
+        return Households(households)
+
+    def generate_schools(self, super_areas: SuperAreas, rng) -> Schools:
+        config = self.schools
+        schools = []
+        for super_area in super_areas:
+            people = super_area.people
+            for sector in ("primary", "secondary"):
+                age_min = config[sector]["age_min"]
+                age_max = config[sector]["age_max"]
+                pupils = [person for person in people if age_min <= person.age <= age_max]
+                if not pupils:
+                    continue
+                n_schools = max(1, int(round(len(pupils) / config[sector]["pupils"])))
+                super_area_schools = []
+                for area_index in rng.integers(len(super_area.areas), size=n_schools):
+                    area = super_area.areas[area_index]
+                    school = School(
+                        coordinates=area.coordinates,
+                        age_min=age_min,
+                        age_max=age_max,
+                        sector=sector,
+                        area=area,
+                    )
+                    area.schools.append(school)
+                    super_area_schools.append(school)
+                for pupil, school_index in zip(
+                    pupils, rng.integers(n_schools, size=len(pupils)).tolist()
+                ):
+                    super_area_schools[school_index].add(pupil)
+                for school in super_area_schools:
+                    school.n_pupils_max = school.n_pupils
+                    school.n_teachers_max = int(
+                        np.ceil(school.n_pupils / config["pupils_per_teacher"])
+                    )
+                    school.limit_classroom_sizes(config["max_classroom_size"])
+                schools += super_area_schools
+        return Schools(schools)
+
+    def generate_hospitals(
+        self, super_areas: SuperAreas, n_people: int, rng
+    ) -> Hospitals:
+        config = self.hospitals
+        n_hospitals = min(
+            max(1, int(round(n_people / config["people_per_hospital"]))),
+            len(super_areas),
+        )
+        mean_beds = config["beds_per_person"] * n_people / n_hospitals
+        hospitals = []
+        for i, super_area_index in enumerate(
+            rng.choice(len(super_areas), size=n_hospitals, replace=False)
+        ):
+            super_area = super_areas[super_area_index]
+            area = super_area.areas[rng.integers(len(super_area.areas))]
+            n_beds = max(1, int(round(mean_beds * rng.uniform(0.5, 1.5))))
+            hospitals.append(
+                Hospital(
+                    n_beds=n_beds,
+                    n_icu_beds=max(1, int(round(config["icu_fraction"] * n_beds))),
+                    area=area,
+                    coordinates=area.coordinates,
+                    trust_code=f"S{i:05d}",
+                )
+            )
+        hospitals = Hospitals(
+            hospitals, neighbour_hospitals=config["neighbour_hospitals"]
+        )
+        for super_area in super_areas:
+            super_area.closest_hospitals = hospitals.get_closest_hospitals(
+                super_area.coordinates, hospitals.neighbour_hospitals
+            )
+        return hospitals
+
+    def _sample_company_sizes(self, n: int, rng) -> List[int]:
+        bands = np.array(self.companies["size_distribution"], dtype=np.float64)
+        probabilities = bands[:, 2] / bands[:, 2].sum()
+        chosen = rng.choice(len(bands), size=n, p=probabilities)
+        log_sizes = rng.uniform(
+            np.log(bands[chosen, 0]), np.log(bands[chosen, 1] + 1)
+        )
+        return np.exp(log_sizes).astype(int).tolist()
+
+    def distribute_workers(self, world: World, rng) -> Companies:
+        """
+        Sends the employed adults to work in their super area or in one nearby.
+        In each work super area, teachers, care home workers and hospital workers
+        are taken first and the rest of the workers fill companies.
+        """
+        config = self.companies
+        super_areas = world.super_areas.members
+        coordinates = np.deg2rad([super_area.coordinates for super_area in super_areas])
+        radius = np.deg2rad(
+            (config["commute_distance"] + 0.5) * self.geography["super_area_spacing"]
+        )
+        destinations = BallTree(coordinates, metric="haversine").query_radius(
+            coordinates, r=radius
+        )
+        workers_per_super_area = defaultdict(list)
+        for i, super_area in enumerate(super_areas):
+            adults = [
+                person
+                for person in super_area.people
+                if 18 <= person.age < 65 and person.residence.group.spec == "household"
+            ]
+            employed = rng.random(len(adults)) < config["employment_rate"]
+            at_home = rng.random(len(adults)) < config["work_in_home_super_area"]
+            work_super_areas = destinations[i][
+                rng.integers(len(destinations[i]), size=len(adults))
+            ]
+            work_super_areas[at_home] = i
+            for person, is_employed, work_super_area in zip(
+                adults, employed.tolist(), work_super_areas.tolist()
+            ):
+                if is_employed:
+                    workers_per_super_area[work_super_area].append(person)
+        hospitals_per_super_area = defaultdict(list)
+        for hospital in world.hospitals:
+            hospitals_per_super_area[hospital.super_area.id].append(hospital)
+        sectors = config["sectors"]
+        companies = []
+        for i, super_area in enumerate(super_areas):
+            workers = workers_per_super_area[i]
+            workers = [workers[j] for j in rng.permutation(len(workers))]
+            for person in workers:
+                super_area.add_worker(person)
+            workers.reverse()
+            for area in super_area.areas:
+                for school in area.schools:
+                    for _ in range(min(school.n_teachers_max, len(workers))):
+                        person = workers.pop()
+                        school.add(person, subgroup_type=School.SubgroupType.teachers)
+                        person.sector = "P"
+                if area.care_home is not None:
+                    for _ in range(min(area.care_home.n_workers, len(workers))):
+                        person = workers.pop()
+                        area.care_home.add(
+                            person,
+                            subgroup_type=CareHome.SubgroupType.workers,
+                            activity="primary_activity",
+                        )
+                        person.sector = "Q"
+            for hospital in hospitals_per_super_area[super_area.id]:
+                n_workers = int(round(self.hospitals["workers_per_bed"] * hospital.n_beds))
+                for _ in range(min(n_workers, len(workers))):
+                    person = workers.pop()
+                    hospital.add(person)
+                    person.sector = "Q"
+            company_sizes = self._sample_company_sizes(len(workers), rng)
+            company_sectors = rng.choice(sectors, size=len(workers)).tolist()
+            for size, sector in zip(company_sizes, company_sectors):
+                if not workers:
+                    break
+                company = Company(super_area=super_area, n_workers_max=size, sector=sector)
+                for _ in range(min(size, len(workers))):
+                    person = workers.pop()
+                    company.add(person)
+                    person.sector = sector
+                super_area.companies.append(company)
+                companies.append(company)
+        return Companies(companies)
+
+    def generate_social_venues(self, super_areas: SuperAreas, rng) -> dict:
+        """
+        Returns a dictionary mapping the supergroup name (eg. "pubs") to its social
+        venues. Every type of venue has at least one venue.
+        """
+        ret = {}
+        n_people = [len(super_area.people) for super_area in super_areas]
+        for spec, people_per_venue in self.social_venues["people_per_venue"].items():
+            venues_class = social_venues_classes[spec]
+            venues = []
+            for super_area, n_super_area_people in zip(super_areas, n_people):
+                n_venues = _random_round(n_super_area_people / people_per_venue, rng)
+                if not venues and super_area is super_areas[-1]:
+                    n_venues = max(n_venues, 1)
+                for area_index in rng.integers(len(super_area.areas), size=n_venues):
+                    venue = venues_class.social_venue_class()
+                    venue.area = super_area.areas[area_index]
+                    venue.coordinates = venue.area.coordinates
+                    venues.append(venue)
+            ret[spec] = venues_class(venues)
+        return ret
+
+    def link_social_venues_to_areas(self, areas: Areas, social_venues: dict):
+        """
+        Lets the people of each area go to the closest venues of each type.
+        """
+        coordinates = np.deg2rad([area.coordinates for area in areas])
+        for venues in social_venues.values():
+            k = min(self.social_venues["venues_per_area"], len(venues))
+            closest = venues.ball_tree.query(coordinates, k=k, return_distance=False)
+            members = venues.members
+            spec = members[0].spec
+            for area, venue_indices in zip(areas, closest):
+                area.social_venues[spec] = tuple(members[j] for j in venue_indices)
+
+    def save_domain_decomposition_inputs(
+        self, world: World, centroids_path: str, adjacency_graph_path: str
+    ):
+        """
+        Writes the super area centroids and adjacency graph used by
+        ``DomainSplitter``. Super areas are adjacent if they are next to each other,
+        diagonals included, on the grid.
+        """
+        super_areas = world.super_areas.members
+        names = [super_area.name for super_area in super_areas]
+        coordinates = np.array([super_area.coordinates for super_area in super_areas])
+        pd.DataFrame(
+            {"X": coordinates[:, 1], "Y": coordinates[:, 0]}, index=names
+        ).to_csv(centroids_path)
+        radius = np.deg2rad(1.5 * self.geography["super_area_spacing"])
+        neighbours = BallTree(np.deg2rad(coordinates), metric="haversine").query_radius(
+            np.deg2rad(coordinates), r=radius
+        )
+        adjacency_graph = {}
+        for i, name in enumerate(names):
+            row = np.zeros(len(names), dtype=int)
+            row[neighbours[i]] = 1
+            row[i] = 0
+            adjacency_graph[name] = row.tolist()
+        with open(adjacency_graph_path, "w") as f:
+            json.dump(adjacency_graph, f)
+
+
+def generate_synthetic_world(
+    n_people: int,
+    seed: Optional[int] = None,
+    config_filename: str = default_config_filename,
+) -> World:
+    """
+    Generates a synthetic world of ``n_people`` people, see
+    ``SyntheticWorldGenerator``.
+    """
+    return SyntheticWorldGenerator.from_file(config_filename).generate(
+        n_people=n_people, seed=seed
+    )
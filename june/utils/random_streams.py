@@ -0,0 +1,256 @@
+import zlib
+from random import random, randint
+from statistics import NormalDist
+from typing import Optional
+
+import numba as nb
+import numpy as np
+
+from june.utils.numba_random import random_choice_numba
+
+_mask = np.uint64(0xFFFFFFFF)
+_philox_m0 = np.uint64(0xD2511F53)
+_philox_m1 = np.uint64(0xCD9E8D57)
+_philox_w0 = np.uint64(0x9E3779B9)
+_philox_w1 = np.uint64(0xBB67AE85)
+_shift = np.uint64(32)
+
+
+@nb.jit(nopython=True)
+def philox4x32(c0, c1, c2, c3, k0, k1):
+    """
+    Philox4x32-10 block of Salmon et al. (2011), "Parallel random numbers: as easy
+    as 1, 2, 3". Maps a 128 bit counter (c0, c1, c2, c3) and a 64 bit key (k0, k1),
+    given as 32 bit words stored in uint64, to 128 random bits.
+    """
+    c0, c1, c2, c3 = (
+        np.uint64(c0) & _mask,
+        np.uint64(c1) & _mask,
+        np.uint64(c2) & _mask,
+        np.uint64(c3) & _mask,
+    )
+    k0, k1 = np.uint64(k0) & _mask, np.uint64(k1) & _mask
+    for round in range(10):
+        if round > 0:
+            k0 = (k0 + _philox_w0) & _mask
+            k1 = (k1 + _philox_w1) & _mask
+        product0 = _philox_m0 * c0
+        product1 = _philox_m1 * c2
+        c0, c1, c2, c3 = (
+            (product1 >> _shift) ^ c1 ^ k0,
+            product1 & _mask,
+            (product0 >> _shift) ^ c3 ^ k1,
+            product0 & _mask,
+        )
+    return c0, c1, c2, c3
+
+
+@nb.jit(nopython=True)
+def _to_uniform(high, low):
+    # 53 random bits in [0, 1)
+    return (((high << _shift) | low) >> np.uint64(11)) / 9007199254740992.0
+
+
+@nb.jit(nopython=True)
+def _uniforms(k0, k1, timestep, group_ids, person_ids, n_draws):
+    n = len(person_ids)
+    ret = np.empty((n, n_draws), dtype=np.float64)
+    for row in range(n):
+        for block in range((n_draws + 1) // 2):
+            x0, x1, x2, x3 = philox4x32(
+                timestep, group_ids[row], person_ids[row], block, k0, k1
+            )
+            ret[row, 2 * block] = _to_uniform(x0, x1)
+            if 2 * block + 1 < n_draws:
+                ret[row, 2 * block + 1] = _to_uniform(x2, x3)
+    return ret
+
+
+def purpose_code(purpose: str) -> int:
+    """
+    Stable 32 bit code of a purpose name (python's hash of strings changes between
+    processes).
+    """
+    return zlib.crc32(purpose.encode("utf-8"))
+
+
+# seed of the run, mixed into the seed of every stream
+_run_seed = None
+
+
+def set_run_seed(seed: Optional[int]):
+    """
+    Sets the seed of the run (``june.ensemble.set_random_seed`` does it), so that
+    the random streams, already created or not, draw different numbers for every
+    run seed. With None, the streams only depend on their own seed.
+    """
+    global _run_seed
+    _run_seed = None if seed is None else int(seed) & 0xFFFFFFFF
+
+
+class RandomStreams:
+    """
+    Counter based random numbers: every draw is a function of the seed, the time
+    step, the group and person it is for, and its purpose, so it does not depend on
+    the order of the draws nor on which MPI rank makes them. The same seed gives the
+    same draws for any domain decomposition.
+
+    Parameters
+    ----------
+    seed
+        seed of the streams, up to 32 bits
+    """
+
+    def __init__(self, seed: int = 0):
+        self.base_seed = int(seed) & 0xFFFFFFFF
+        # (run seed, key) of the last run seed used
+        self._key = None
+
+    @property
+    def seed(self) -> int:
+        """
+        Key of the streams: their own seed, mixed with the seed of the run if one
+        was set with ``set_run_seed``.
+        """
+        if _run_seed is None:
+            return self.base_seed
+        if self._key is None or self._key[0] != _run_seed:
+            key = philox4x32(self.base_seed, _run_seed, 0, 0, 0, 0)[0]
+            self._key = (_run_seed, int(key))
+        return self._key[1]
+
+    def uniforms(
+        self,
+        purpose: str,
+        timestep: int,
+        group_ids: np.ndarray,
+        person_ids: np.ndarray,
+        n_draws: int = 1,
+    ) -> np.ndarray:
+        """
+        Returns an array of shape (len(person_ids), n_draws) of uniform numbers in
+        [0, 1), row i being the draws of person ``person_ids[i]`` in group
+        ``group_ids[i]``. Group and person ids are taken modulo 2**32.
+
+        Parameters
+        ----------
+        purpose
+            what the numbers are drawn for, draws for different purposes are
+            independent. It should include the group spec, as group ids are only
+            unique within a spec.
+        timestep
+            index of the time step
+        """
+        return _uniforms(
+            self.seed,
+            purpose_code(purpose),
+            int(timestep),
+            np.asarray(group_ids, dtype=np.int64),
+            np.asarray(person_ids, dtype=np.int64),
+            int(n_draws),
+        )
+
+
+@nb.jit(nopython=True)
+def _uniform(k0, k1, timestep, group_id, person_id, draw):
+    # same layout as _uniforms: two draws per philox block
+    x0, x1, x2, x3 = philox4x32(timestep, group_id, person_id, draw // 2, k0, k1)
+    if draw % 2 == 0:
+        return _to_uniform(x0, x1)
+    return _to_uniform(x2, x3)
+
+
+class RandomSource:
+    """
+    Source of the random numbers drawn for people during the simulation, by the
+    infection seeds and selectors, the immunity setter, the leisure, the policies
+    and the events. By default the numbers come from the global generators of
+    ``random`` and numpy. If ``streams`` is given, every number is instead a
+    function of its purpose, the person it is drawn for and ``timestep``, so that
+    the simulation does not depend on the order in which people are visited nor on
+    the domain decomposition.
+
+    Every simulator has its own source, drawing from the random streams of its
+    interaction, which it sets on everything that draws numbers for people
+    (``Simulator.bind_random_source``).
+    """
+
+    def __init__(self, streams: Optional[RandomStreams] = None):
+        self.streams = streams
+        self.timestep = 0
+        self._purpose_codes = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.streams is not None
+
+    def _purpose_code(self, purpose: str) -> int:
+        try:
+            return self._purpose_codes[purpose]
+        except KeyError:
+            code = self._purpose_codes[purpose] = purpose_code(purpose)
+            return code
+
+    def random(self, purpose: str, person_id: int, draw: int = 0) -> float:
+        """
+        Uniform number in [0, 1). ``draw`` tells apart several numbers drawn for
+        the same purpose and person in one time step.
+        """
+        if self.streams is None:
+            return random()
+        return _uniform(
+            self.streams.seed,
+            self._purpose_code(purpose),
+            self.timestep,
+            0,
+            int(person_id),
+            draw,
+        )
+
+    def randint(
+        self, purpose: str, person_id: int, low: int, high: int, draw: int = 0
+    ) -> int:
+        """
+        Integer in [low, high], both included like ``random.randint``.
+        """
+        if self.streams is None:
+            return randint(low, high)
+        return low + int(self.random(purpose, person_id, draw) * (high - low + 1))
+
+    def choice(self, purpose: str, person_id: int, prob, draw: int = 0) -> int:
+        """
+        Index drawn with the (normalised) probabilities ``prob``.
+        """
+        prob = np.asarray(prob, dtype=np.float64)
+        if self.streams is None:
+            return random_choice_numba(np.arange(len(prob)), prob)
+        return int(
+            np.searchsorted(
+                np.cumsum(prob), self.random(purpose, person_id, draw), side="right"
+            )
+        )
+
+    def normal(
+        self, purpose: str, person_id: int, loc: float, scale: float, draw: int = 0
+    ) -> float:
+        if self.streams is None:
+            return np.random.normal(loc=loc, scale=scale)
+        # inv_cdf is not defined at 0
+        u = max(self.random(purpose, person_id, draw), 1e-300)
+        return NormalDist(loc, scale).inv_cdf(u)
+
+    def uniforms(self, purpose: str, person_ids, n_draws: int = 1) -> np.ndarray:
+        """
+        Array of shape (len(person_ids), n_draws) of uniform numbers in [0, 1).
+        """
+        if self.streams is None:
+            return np.random.random((len(person_ids), n_draws))
+        person_ids = np.asarray(person_ids, dtype=np.int64)
+        return _uniforms(
+            self.streams.seed,
+            self._purpose_code(purpose),
+            self.timestep,
+            np.zeros(len(person_ids), dtype=np.int64),
+            person_ids,
+            int(n_draws),
+        )
@@ -0,0 +1,160 @@
+import csv
+import json
+import logging
+from contextlib import nullcontext
+from pathlib import Path
+from time import perf_counter
+
+from june.mpi_setup import mpi_comm, mpi_rank, mpi_size
+
+logger = logging.getLogger("tracing")
+
+# returned by disabled tracers, so that a disabled span costs one attribute check
+_null_span = nullcontext()
+
+
+class Span:
+    """
+    Times the code inside a ``with`` block and hands it to the tracer on exit.
+    """
+
+    __slots__ = ("tracer", "name", "category", "args", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, args: dict):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.add(self.name, self.category, self.start, perf_counter(), self.args)
+        return False
+
+
+class Tracer:
+    """
+    Collects named spans of the phases of each time step, for every rank. Times
+    are measured from an origin taken right after a barrier, so that the spans of
+    all ranks can be put on the same timeline. The spans are written to a csv
+    file per rank and to a single Chrome trace json file (which can be opened in
+    chrome://tracing or https://ui.perfetto.dev), with one row per rank.
+
+    Tracing is disabled by default; then ``span`` returns a shared empty context
+    manager and nothing is recorded.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.trace_path = None
+        self.origin = None
+        self.date = None
+        self.spans = []
+
+    def start(self, trace_path: str = "results"):
+        """
+        Starts recording spans. Must be called by all ranks.
+        """
+        self.trace_path = Path(trace_path)
+        self.trace_path.mkdir(parents=True, exist_ok=True)
+        self.spans = []
+        if mpi_size > 1:
+            mpi_comm.Barrier()
+        self.origin = perf_counter()
+        self.enabled = True
+
+    def stop(self):
+        self.enabled = False
+
+    def set_date(self, date):
+        self.date = str(date)
+
+    def span(self, name: str, category: str = "simulator", **args):
+        """
+        Context manager timing one span.
+
+        Parameters
+        ----------
+        name
+            name of the span, eg. "move_people"
+        category
+            category of the span, used to filter spans in the trace viewers
+        args
+            extra information shown with the span in the trace viewers
+        """
+        if not self.enabled:
+            return _null_span
+        return Span(self, name, category, args)
+
+    def add(self, name: str, category: str, start: float, end: float, args: dict):
+        self.spans.append(
+            (name, category, self.date, start - self.origin, end - start, args)
+        )
+
+    def to_csv(self, filename: str):
+        with open(filename, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["rank", "date", "name", "category", "start", "duration"])
+            for name, category, date, start, duration, _ in self.spans:
+                writer.writerow([mpi_rank, date, name, category, start, duration])
+
+    def chrome_trace_events(self, rank: int = mpi_rank, spans=None) -> list:
+        """
+        Spans as Chrome trace complete ("X") events, times in microseconds.
+        """
+        spans = self.spans if spans is None else spans
+        events = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": rank,
+                "tid": 0,
+                "args": {"name": f"rank {rank}"},
+            }
+        ]
+        for name, category, date, start, duration, args in spans:
+            events.append(
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": start * 1e6,
+                    "dur": duration * 1e6,
+                    "pid": rank,
+                    "tid": 0,
+                    "args": dict(args, date=date),
+                }
+            )
+        return events
+
+    def save(self):
+        """
+        Writes ``trace.{rank}.csv`` on every rank and gathers the spans of all
+        ranks into ``trace.json`` on rank 0. Must be called by all ranks.
+        """
+        self.to_csv(self.trace_path / f"trace.{mpi_rank}.csv")
+        if mpi_size > 1:
+            spans_per_rank = mpi_comm.gather(self.spans, root=0)
+        else:
+            spans_per_rank = [self.spans]
+        if mpi_rank == 0:
+            events = []
+            for rank, spans in enumerate(spans_per_rank):
+                events += self.chrome_trace_events(rank=rank, spans=spans)
+            with open(self.trace_path / "trace.json", "w") as f:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+            logger.info(f"Trace written to {self.trace_path}")
+
+
+tracer = Tracer()
+
+
+def enable_tracing(results_folder: str):
+    """
+    Traces the phases of every time step of this rank, the traces are written
+    to ``results_folder`` at the end of ``Simulator.run``.
+    """
+    tracer.start(results_folder)
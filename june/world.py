@@ -1,11 +1,14 @@
 import logging
 import h5py
 from collections import defaultdict
+from copy import deepcopy
 from tqdm import tqdm
 import numpy as np
 from typing import Optional
 from june.demography import Demography, Population
 from june.demography.person import Activities, Person
+from june.epidemiology.infection import Immunity
+from june.epoch import Epoch
 from june.distributors import (
     SchoolDistributor,
     HospitalDistributor,
@@ -79,6 +82,7 @@ class World:
         self.universities = None
         self.cities = None
         self.stations = None
+        self.epoch = Epoch()
 
     def __iter__(self):
         ret = []
@@ -168,6 +172,195 @@ class World:
 
         save_world_to_hdf5(world=self, file_path=file_path, chunk_size=chunk_size)
 
+    def snapshot(self) -> "WorldSnapshot":
+        """
+        Captures the epidemic state of the world, so that it can be reset with
+        ``restore`` after a simulation has run on it.
+        """
+        return WorldSnapshot(self)
+
+    def restore(self, snapshot: "WorldSnapshot"):
+        """
+        Resets the epidemic state of the world to the given snapshot.
+        """
+        snapshot.restore(self)
+
+
+def _dicts_to_csr(dicts):
+    offsets = np.zeros(len(dicts) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(d) for d in dicts])
+    keys = np.fromiter(
+        (key for d in dicts for key in d), dtype=np.int64, count=offsets[-1]
+    )
+    values = np.fromiter(
+        (value for d in dicts for value in d.values()),
+        dtype=np.float64,
+        count=offsets[-1],
+    )
+    return offsets, keys, values
+
+
+class WorldSnapshot:
+    """
+    Mutable epidemic state of the people of a world: death, vaccination, vaccine
+    plans, infections, immunities and group memberships, plus the household
+    residents, cemeteries and hospital patients. The policy bookkeeping kept on
+    the world is included too: the quarantine start dates of households and
+    classrooms, and the lockdown tier, closed venues and compliance of each
+    region. Immunities are stored as CSR arrays and memberships as an object
+    array of references, so taking a snapshot copies no groups.
+
+    Taking the snapshot starts tracking the people whose state changes (see
+    ``Population.update_state``), so restoring it only resets those people and
+    the ones infected at the time of the snapshot.
+    """
+
+    def __init__(self, world: "World"):
+        people = world.people.people
+        self.row_by_id = {person.id: row for row, person in enumerate(people)}
+        self.dead = np.array([person.dead for person in people], dtype=bool)
+        self.vaccinated = np.array(
+            [person.vaccinated for person in people], dtype=bool
+        )
+        self.vaccine_plans = {
+            person.id: deepcopy(person.vaccine_plan)
+            for person in people
+            if person.vaccine_plan is not None
+        }
+        self.infections = {
+            person.id: deepcopy(person.infection)
+            for person in people
+            if person.infection is not None
+        }
+        (
+            self.susceptibility_offsets,
+            self.susceptibility_ids,
+            self.susceptibilities,
+        ) = _dicts_to_csr([person.immunity.susceptibility_dict for person in people])
+        (
+            self.multiplier_offsets,
+            self.multiplier_ids,
+            self.multipliers,
+        ) = _dicts_to_csr(
+            [person.immunity.effective_multiplier_dict for person in people]
+        )
+        self.subgroups = np.empty(
+            (len(people), len(Activities.__fields__)), dtype=object
+        )
+        for row, person in enumerate(people):
+            self.subgroups[row] = person.iter_subgroups()
+        self.residents = {}
+        if world.households is not None:
+            self.residents = {
+                household.id: household.residents for household in world.households
+            }
+        self.cemetery_people = []
+        if world.cemeteries is not None:
+            self.cemetery_people = [
+                list(cemetery[0].people) for cemetery in world.cemeteries
+            ]
+        self.hospital_patients = []
+        if world.hospitals is not None:
+            self.hospital_patients = [
+                (set(hospital.ward_ids), set(hospital.icu_ids))
+                for hospital in world.hospitals
+            ]
+        # domains only have the supergroups found in their hdf5 file
+        households = getattr(world, "households", None) or []
+        self.household_quarantine_dates = [
+            household.quarantine_starting_date for household in households
+        ]
+        schools = getattr(world, "schools", None) or []
+        self.classroom_quarantine_dates = [
+            [subgroup.quarantine_starting_date for subgroup in school.subgroups]
+            for school in schools
+        ]
+        regions = getattr(world, "regions", None) or []
+        self.region_policies = [deepcopy(region.policy) for region in regions]
+        world.people.track_changes()
+
+    def _restore_immunity(self, row: int) -> Immunity:
+        start, end = self.susceptibility_offsets[row : row + 2]
+        susceptibility_dict = dict(
+            zip(
+                self.susceptibility_ids[start:end].tolist(),
+                self.susceptibilities[start:end].tolist(),
+            )
+        )
+        start, end = self.multiplier_offsets[row : row + 2]
+        effective_multiplier_dict = dict(
+            zip(
+                self.multiplier_ids[start:end].tolist(),
+                self.multipliers[start:end].tolist(),
+            )
+        )
+        return Immunity(
+            susceptibility_dict=susceptibility_dict,
+            effective_multiplier_dict=effective_multiplier_dict,
+        )
+
+    def restore(self, world: "World", changed_ids=None):
+        """
+        Resets the state of the people that changed since the snapshot was taken.
+
+        Parameters
+        ----------
+        world
+            the world the snapshot was taken from
+        changed_ids
+            ids of the people to reset, on top of the ones tracked by the
+            population. If nothing was tracked, everyone is reset.
+        """
+        population = world.people
+        if population.changed_ids is None:
+            changed_ids = set(self.row_by_id)
+        else:
+            # infections progress in place, without going through update_state
+            changed_ids = (
+                population.changed_ids | set(self.infections) | set(changed_ids or ())
+            )
+        restored = []
+        for person_id in changed_ids:
+            row = self.row_by_id[person_id]
+            person = population.get_from_id(person_id)
+            person.dead = bool(self.dead[row])
+            person.vaccinated = bool(self.vaccinated[row])
+            person.vaccine_plan = deepcopy(self.vaccine_plans.get(person_id))
+            person.infection = deepcopy(self.infections.get(person_id))
+            person.immunity = self._restore_immunity(row)
+            person.subgroups = Activities(*self.subgroups[row])
+            person.busy = False
+            residence = person.residence
+            if residence is not None and residence.group.spec == "household":
+                household = residence.group
+                household.residents = self.residents.get(
+                    household.id, household.residents
+                )
+            restored.append(person)
+        for person in restored:
+            population.update_state(person)
+        if world.cemeteries is not None:
+            for cemetery, people in zip(world.cemeteries, self.cemetery_people):
+                cemetery[0].people = list(people)
+        if world.hospitals is not None:
+            for hospital, (ward_ids, icu_ids) in zip(
+                world.hospitals, self.hospital_patients
+            ):
+                hospital.ward_ids = set(ward_ids)
+                hospital.icu_ids = set(icu_ids)
+        households = getattr(world, "households", None) or []
+        for household, date in zip(households, self.household_quarantine_dates):
+            household.quarantine_starting_date = date
+        schools = getattr(world, "schools", None) or []
+        for school, dates in zip(schools, self.classroom_quarantine_dates):
+            for subgroup, date in zip(school.subgroups, dates):
+                subgroup.quarantine_starting_date = date
+        regions = getattr(world, "regions", None) or []
+        for region, policy in zip(regions, self.region_policies):
+            region.policy = deepcopy(policy)
+        population.track_changes()
+        logger.info(f"Restored the state of {len(restored)} people")
+
 
 def generate_world_from_geography(
     geography: Geography,
@@ -0,0 +1,11 @@
+from .benchmark import (
+    Benchmark,
+    benchmark,
+    registry,
+    run_benchmarks,
+    save_results,
+    load_results,
+    compare_results,
+    meta_information,
+)
+from .hot_paths import BenchmarkContext
@@ -0,0 +1,74 @@
+"""
+Runs the benchmarks of the simulator hot paths and saves the results to json:
+
+    python -m test_june.benchmarks --n_people 20000 --output benchmarks.json
+
+With ``--compare baseline.json`` the results are compared to a previous run, and
+the command fails if any benchmark is slower or uses more memory than the
+thresholds allow.
+"""
+import argparse
+import logging
+import sys
+
+from . import (
+    BenchmarkContext,
+    compare_results,
+    load_results,
+    meta_information,
+    registry,
+    run_benchmarks,
+    save_results,
+)
+
+logger = logging.getLogger("benchmarks")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks of the JUNE hot paths.")
+    parser.add_argument("--n_people", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=None)
+    parser.add_argument(
+        "--only",
+        nargs="*",
+        default=None,
+        help="run the benchmarks whose name starts with any of these",
+    )
+    parser.add_argument("--output", default="benchmarks.json")
+    parser.add_argument("--compare", default=None, help="baseline results to compare")
+    parser.add_argument("--time_threshold", type=float, default=0.1)
+    parser.add_argument("--memory_threshold", type=float, default=0.1)
+    parser.add_argument("--list", action="store_true", help="list the benchmarks")
+    args = parser.parse_args(argv)
+    if args.list:
+        for name in registry:
+            print(name)
+        return 0
+    context = BenchmarkContext(n_people=args.n_people, seed=args.seed)
+    try:
+        results = run_benchmarks(context, names=args.only, repeat=args.repeat)
+    finally:
+        context.cleanup()
+    meta = meta_information(n_people=args.n_people, seed=args.seed)
+    save_results(results, meta=meta, filename=args.output)
+    logger.info(f"Results saved to {args.output}")
+    if args.compare is None:
+        return 0
+    regressions = compare_results(
+        load_results(args.compare),
+        load_results(args.output),
+        time_threshold=args.time_threshold,
+        memory_threshold=args.memory_threshold,
+    )
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression['name']} {regression['metric']}: "
+            f"{regression['baseline']:.4g} -> {regression['current']:.4g} "
+            f"({regression['ratio']:.2f}x)"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
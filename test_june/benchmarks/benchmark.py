@@ -0,0 +1,198 @@
+import datetime
+import gc
+import json
+import logging
+import platform
+import subprocess
+import tracemalloc
+from pathlib import Path
+from statistics import mean, median, stdev
+from time import perf_counter
+from typing import Callable, List, Optional
+
+import numpy as np
+
+import june
+
+logger = logging.getLogger("benchmarks")
+
+# all the benchmarks, filled by the ``benchmark`` decorator
+registry = {}
+
+
+class Benchmark:
+    """
+    A named piece of code to time. ``make`` takes the benchmark context (and
+    the parameter, if the benchmark is parametrized) and returns a ``run``
+    function, which is the code that is timed, or a ``(setup, run)`` tuple, where
+    ``setup`` is called untimed before every repetition.
+    """
+
+    def __init__(self, name: str, make: Callable, repeat: int = 5, params=None):
+        self.name = name
+        self.make = make
+        self.repeat = repeat
+        self.params = params
+
+    def cases(self, context):
+        params = self.params(context) if callable(self.params) else self.params
+        if params is None:
+            yield self.name, self.make(context)
+        else:
+            for param in params:
+                yield f"{self.name}[{param}]", self.make(context, param)
+
+
+def benchmark(name: str, repeat: int = 5, params=None):
+    """
+    Registers a benchmark, see ``Benchmark``. ``params`` is a list of parameters,
+    or a function of the context returning it.
+    """
+
+    def decorator(make):
+        registry[name] = Benchmark(name=name, make=make, repeat=repeat, params=params)
+        return make
+
+    return decorator
+
+
+def time_case(setup: Optional[Callable], run: Callable, repeat: int) -> dict:
+    """
+    Times ``repeat`` calls of ``run``, and measures the peak of the memory
+    allocated by one more call with tracemalloc (which is not timed, as
+    tracemalloc slows python down).
+    """
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        gc.collect()
+        tick = perf_counter()
+        run()
+        times.append(perf_counter() - tick)
+    if setup is not None:
+        setup()
+    gc.collect()
+    tracemalloc.start()
+    run()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "repeat": repeat,
+        "min": min(times),
+        "median": median(times),
+        "mean": mean(times),
+        "std": stdev(times) if repeat > 1 else 0.0,
+        "peak_memory_mb": peak_memory / 1024 ** 2,
+    }
+
+
+def _git_commit() -> str:
+    june_git = Path(june.__path__[0]).parent / ".git"
+    try:
+        return (
+            subprocess.run(
+                f"git --git-dir {june_git} rev-parse --short HEAD".split(),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+            .stdout.decode("utf-8")
+            .strip()
+        ) or "unavailable"
+    except Exception:
+        return "unavailable"
+
+
+def meta_information(**kwargs) -> dict:
+    meta = {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "june_commit": _git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "node": platform.node(),
+    }
+    meta.update(kwargs)
+    return meta
+
+
+def run_benchmarks(
+    context, names: Optional[List[str]] = None, repeat: Optional[int] = None
+) -> dict:
+    """
+    Runs the registered benchmarks.
+
+    Parameters
+    ----------
+    context
+        object holding what the benchmarks need (world, simulator, ...)
+    names
+        only the benchmarks whose name starts with one of these are run
+    repeat
+        number of timed repetitions, if None the one of each benchmark is used
+    """
+    results = {}
+    for benchmark in registry.values():
+        if names and not any(benchmark.name.startswith(name) for name in names):
+            continue
+        for case_name, case in benchmark.cases(context):
+            setup, run = case if isinstance(case, tuple) else (None, case)
+            results[case_name] = time_case(
+                setup, run, repeat=repeat or benchmark.repeat
+            )
+            logger.info(
+                f"{case_name}: median {results[case_name]['median']:.4g} s, "
+                f"peak memory {results[case_name]['peak_memory_mb']:.4g} MB"
+            )
+    return results
+
+
+def save_results(results: dict, meta: dict, filename: str):
+    with open(filename, "w") as f:
+        json.dump({"meta": meta, "benchmarks": results}, f, indent=2)
+
+
+def load_results(filename: str) -> dict:
+    with open(filename) as f:
+        return json.load(f)
+
+
+def compare_results(
+    baseline: dict,
+    current: dict,
+    time_threshold: float = 0.1,
+    memory_threshold: float = 0.1,
+    time_floor: float = 1e-4,
+) -> List[dict]:
+    """
+    Compares two result files (as returned by ``load_results``) and returns the
+    regressions: the benchmarks whose median time or peak memory grew by more than
+    the given relative thresholds. Benchmarks faster than ``time_floor`` seconds
+    are too noisy to compare times.
+    """
+    regressions = []
+    baseline_benchmarks = baseline["benchmarks"]
+    for name, result in current["benchmarks"].items():
+        reference = baseline_benchmarks.get(name)
+        if reference is None:
+            continue
+        for metric, threshold in (
+            ("median", time_threshold),
+            ("peak_memory_mb", memory_threshold),
+        ):
+            if reference[metric] <= 0:
+                continue
+            if metric == "median" and result[metric] < time_floor:
+                continue
+            ratio = result[metric] / reference[metric]
+            if ratio > 1 + threshold:
+                regressions.append(
+                    {
+                        "name": name,
+                        "metric": metric,
+                        "baseline": reference[metric],
+                        "current": result[metric],
+                        "ratio": ratio,
+                    }
+                )
+    return regressions
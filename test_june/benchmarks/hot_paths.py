@@ -0,0 +1,277 @@
+import datetime
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from june.epidemiology.epidemiology import Epidemiology
+from june.epidemiology.infection import InfectionSelector, InfectionSelectors
+from june.epidemiology.infection_seed import InfectionSeed
+from june.groups.leisure import generate_leisure_for_world
+from june.hdf5_savers import generate_world_from_hdf5, save_world_to_hdf5
+from june.interaction import Interaction
+from june.policy import Policies
+from june.records import Record
+from june.simulator import Simulator
+from june.synthetic_world import generate_synthetic_world
+
+from .benchmark import benchmark
+
+config_path = Path(__file__).parent / "config_benchmark.yaml"
+
+leisure_groups = [
+    "pubs",
+    "cinemas",
+    "groceries",
+    "gyms",
+    "household_visits",
+    "care_home_visits",
+]
+date = datetime.datetime(2020, 3, 2, 8)
+
+primary_activities = ["medical_facility", "primary_activity", "residence"]
+leisure_activities = ["medical_facility", "leisure", "residence"]
+residence_activities = ["medical_facility", "residence"]
+# activities during which the groups of each supergroup are filled
+interactive_super_groups = {
+    "households": residence_activities,
+    "care_homes": residence_activities,
+    "schools": primary_activities,
+    "companies": primary_activities,
+    "hospitals": primary_activities,
+    "pubs": leisure_activities,
+    "cinemas": leisure_activities,
+    "groceries": leisure_activities,
+    "gyms": leisure_activities,
+}
+
+
+def health_index_generator(person, infection_id):
+    return [0.4, 0.5, 0.7, 0.74, 0.85, 0.90, 0.95]
+
+
+class BenchmarkContext:
+    """
+    A synthetic world with a simulator set up on it, and a fraction of its people
+    infected, shared by all the benchmarks. The world does not depend on the
+    census data, so that the benchmarks can run anywhere.
+
+    Parameters
+    ----------
+    n_people
+        number of people of the synthetic world
+    seed
+        seed of the world and of the infections
+    infected_fraction
+        fraction of people infected before benchmarking
+    results_path
+        where the benchmarks write their files, by default a temporary directory
+    """
+
+    def __init__(
+        self,
+        n_people: int = 20000,
+        seed: int = 0,
+        infected_fraction: float = 0.05,
+        results_path: str = None,
+    ):
+        self.n_people = n_people
+        self.seed = seed
+        self._tmp_dir = None
+        if results_path is None:
+            self._tmp_dir = tempfile.TemporaryDirectory(prefix="june_benchmarks_")
+            results_path = self._tmp_dir.name
+        self.results_path = Path(results_path)
+        self.results_path.mkdir(parents=True, exist_ok=True)
+        np.random.seed(seed)
+        self.world = generate_synthetic_world(n_people=n_people, seed=seed)
+        self.leisure = generate_leisure_for_world(leisure_groups, self.world)
+        self.selector = InfectionSelector(
+            health_index_generator=health_index_generator
+        )
+        self.simulator = Simulator.from_file(
+            world=self.world,
+            interaction=Interaction.from_file(),
+            epidemiology=Epidemiology(
+                infection_selectors=InfectionSelectors([self.selector])
+            ),
+            config_filename=config_path,
+            leisure=self.leisure,
+            policies=Policies([]),
+            record=None,
+        )
+        seed = InfectionSeed.from_uniform_cases(
+            self.world,
+            self.selector,
+            cases_per_capita=infected_fraction,
+            date="2020-03-01",
+        )
+        seed.unleash_virus_per_day(time=0, date=pd.to_datetime("2020-03-01"))
+        self.snapshot = self.simulator.snapshot()
+
+    def restore(self):
+        """
+        Puts the world back to its state right after the infection seeding.
+        """
+        self.simulator.restore(self.snapshot)
+        np.random.seed(self.seed)
+
+    def prepare_time_step(self, activities):
+        self.restore()
+        self.leisure.generate_leisure_probabilities_for_timestep(
+            delta_time=8,
+            working_hours="primary_activity" in activities,
+            day_type="weekday",
+        )
+
+    def move_people(self, activities):
+        self.prepare_time_step(activities)
+        self.simulator.activity_manager.move_people_to_active_subgroups(
+            activities, date=date, days_from_start=1
+        )
+
+    def cleanup(self):
+        if self._tmp_dir is not None:
+            self._tmp_dir.cleanup()
+
+
+@benchmark(
+    "activity_manager.move_people_to_active_subgroups",
+    params=["primary_activity", "leisure", "residence"],
+)
+def move_people_to_active_subgroups(context, activity):
+    activities = {
+        "primary_activity": primary_activities,
+        "leisure": leisure_activities,
+        "residence": residence_activities,
+    }[activity]
+
+    def setup():
+        context.prepare_time_step(activities)
+
+    def run():
+        context.simulator.activity_manager.move_people_to_active_subgroups(
+            activities, date=date, days_from_start=1
+        )
+
+    return setup, run
+
+
+@benchmark("interaction.time_step_for_group", params=list(interactive_super_groups))
+def time_step_for_group(context, super_group_name):
+    """
+    Runs the interaction of every non empty group of the given supergroup.
+    """
+    groups = []
+
+    def setup():
+        context.move_people(interactive_super_groups[super_group_name])
+        super_group = getattr(context.world, super_group_name)
+        groups[:] = [group for group in super_group.members if group.size > 0]
+
+    def run():
+        for group in groups:
+            context.simulator.interaction.time_step_for_group(group, delta_time=8)
+
+    return setup, run
+
+
+@benchmark("epidemiology.update_health_status")
+def update_health_status(context):
+    epidemiology = context.simulator.epidemiology
+
+    def setup():
+        context.restore()
+
+    def run():
+        epidemiology.update_health_status(
+            world=context.world, time=5.0, duration=1.0, record=None
+        )
+
+    return setup, run
+
+
+@benchmark("infection_selector.infect_person_at_time")
+def infect_person_at_time(context, n_people=1000):
+    """
+    Infects ``n_people`` people of the world that are not infected.
+    """
+    people = []
+
+    def setup():
+        context.restore()
+        people[:] = [
+            person for person in context.world.people if person.infection is None
+        ][:n_people]
+
+    def run():
+        for person in people:
+            context.selector.infect_person_at_time(person, time=0.0)
+
+    return setup, run
+
+
+@benchmark(
+    "leisure.generate_leisure_probabilities_for_timestep",
+    params=["weekday", "weekend"],
+)
+def generate_leisure_probabilities_for_timestep(context, day_type):
+    def run():
+        context.leisure.generate_leisure_probabilities_for_timestep(
+            delta_time=8, working_hours=False, day_type=day_type
+        )
+
+    return run
+
+
+@benchmark("world.save_to_hdf5", repeat=3)
+def save_world(context):
+    world_path = context.results_path / "benchmark_world.hdf5"
+
+    def setup():
+        context.restore()
+        if world_path.exists():
+            world_path.unlink()
+
+    def run():
+        save_world_to_hdf5(context.world, world_path)
+
+    return setup, run
+
+
+@benchmark("world.load_from_hdf5", repeat=3)
+def load_world(context):
+    world_path = context.results_path / "benchmark_world_to_load.hdf5"
+    context.restore()
+    save_world_to_hdf5(context.world, world_path)
+
+    def run():
+        generate_world_from_hdf5(world_path)
+
+    return run
+
+
+@benchmark("record.time_step", params=[10000, 100000])
+def record_time_step(context, n_events):
+    """
+    Writes ``n_events`` infections to the record.
+    """
+    record = Record(record_path=context.results_path / "record")
+    ids = np.arange(n_events).tolist()
+
+    def setup():
+        record.accumulate(
+            table_name="infections",
+            location_spec="household",
+            location_id=0,
+            region_name="Synthetic Region 1",
+            infector_ids=ids,
+            infected_ids=ids,
+            infection_ids=ids,
+        )
+
+    def run():
+        record.time_step(timestamp=date)
+
+    return setup, run
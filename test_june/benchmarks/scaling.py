@@ -0,0 +1,405 @@
+"""
+Strong and weak scaling of the simulator with MPI, on the local machine.
+
+The driver generates the synthetic worlds, runs the simulator under ``mpirun``
+for each number of ranks, and builds the scaling tables from the per rank phase
+timings written by the tracer (``june.utils.tracing``):
+
+    python -m test_june.benchmarks.scaling strong --ranks 1 2 4 --n_people 100000
+    python -m test_june.benchmarks.scaling weak --ranks 1 2 4 --n_people 25000
+
+In strong scaling the world has ``n_people`` people for every number of ranks, in
+weak scaling it has ``n_people`` people per rank.
+"""
+import argparse
+import datetime
+import json
+import logging
+import os
+import shlex
+import subprocess
+import sys
+from pathlib import Path
+from time import perf_counter
+from typing import List
+
+import h5py
+import pandas as pd
+
+logger = logging.getLogger("scaling")
+
+# spans of the tracer where ranks exchange data, and where they wait for each other
+transfer_spans = ["people_comms", "infection_comms"]
+waiting_spans = ["move_people_waiting", "interaction_waiting", "infection_comms_waiting"]
+
+
+def run_rank(
+    world_path: str,
+    centroids_path: str,
+    adjacency_graph_path: str,
+    output_path: str,
+    days: float,
+    seed: int = 0,
+    random_streams_seed: int = None,
+):
+    """
+    Runs the simulator on the domain of this rank. Called by every rank under
+    ``mpirun``. Every rank writes its phase timings to
+    ``output_path / trace.{rank}.csv``, and rank 0 writes the run time and number
+    of people of every rank to ``output_path / ranks.json``.
+
+    If ``random_streams_seed`` is given, the random numbers are drawn from counter
+    based streams (``june.utils.random_streams``) with the vectorized interaction,
+    the susceptibilities are drawn for every person, and the infections are
+    recorded to ``output_path / june_record.{rank}.h5``, so that runs with
+    different numbers of ranks can be compared.
+    """
+    from june.domains import Domain, DomainSplitter
+    from june.ensemble import set_random_seed
+    from june.epidemiology.epidemiology import Epidemiology
+    from june.epidemiology.infection import InfectionSelector, InfectionSelectors
+    from june.epidemiology.infection import ImmunitySetter
+    from june.epidemiology.infection_seed import InfectionSeed, InfectionSeeds
+    from june.exc import SimulatorError
+    from june.groups.leisure import generate_leisure_for_world
+    from june.interaction import Interaction
+    from june.mpi_setup import mpi_comm, mpi_rank, mpi_size
+    from june.policy import Policies
+    from june.records import Record
+    from june.simulator import Simulator
+    from june.utils.random_streams import RandomStreams
+    from june.utils.tracing import enable_tracing
+
+    from .hot_paths import config_path, health_index_generator, leisure_groups
+
+    if mpi_rank > 0:
+        logging.disable(logging.CRITICAL)
+    super_areas_to_domain_dict = None
+    if mpi_rank == 0:
+        with h5py.File(world_path, "r") as f:
+            super_area_name_to_id = {
+                name.decode(): int(super_area_id)
+                for name, super_area_id in zip(
+                    f["geography"]["super_area_name"], f["geography"]["super_area_id"]
+                )
+            }
+        if mpi_size == 1:
+            super_areas_per_domain = {0: list(super_area_name_to_id)}
+        else:
+            super_areas_per_domain, _ = DomainSplitter.generate_world_split(
+                number_of_domains=mpi_size,
+                world_path=world_path,
+                super_area_centroids_path=centroids_path,
+                super_area_adjacency_graph_path=adjacency_graph_path,
+            )
+        super_areas_to_domain_dict = {
+            super_area_name_to_id[name]: domain_id
+            for domain_id, names in super_areas_per_domain.items()
+            for name in names
+        }
+    super_areas_to_domain_dict = mpi_comm.bcast(super_areas_to_domain_dict, root=0)
+    # raised by every rank, otherwise the others would wait forever
+    if set(super_areas_to_domain_dict.values()) != set(range(mpi_size)):
+        raise SimulatorError(
+            f"The world can't be split in {mpi_size} domains, "
+            f"generate it with more super areas."
+        )
+    domain = Domain.from_hdf5(
+        domain_id=mpi_rank,
+        super_areas_to_domain_dict=super_areas_to_domain_dict,
+        hdf5_file_path=world_path,
+    )
+    selector = InfectionSelector(health_index_generator=health_index_generator)
+    interaction = Interaction.from_file()
+    record = None
+    immunity_setter = None
+    if random_streams_seed is None:
+        set_random_seed(seed + mpi_rank)
+    else:
+        # the seed of the run is mixed into the streams, so it is the same for
+        # every rank
+        set_random_seed(seed)
+        interaction.engine = "vectorized"
+        interaction.random_streams = RandomStreams(seed=random_streams_seed)
+        record = Record(record_path=output_path, mpi_rank=mpi_rank)
+        immunity_setter = ImmunitySetter(susceptibility_mode="individual")
+    infection_seed = InfectionSeed.from_uniform_cases(
+        domain, selector, cases_per_capita=0.01, date="2020-03-01"
+    )
+    simulator = Simulator.from_file(
+        world=domain,
+        interaction=interaction,
+        epidemiology=Epidemiology(
+            infection_selectors=InfectionSelectors([selector]),
+            infection_seeds=InfectionSeeds([infection_seed]),
+            immunity_setter=immunity_setter,
+        ),
+        config_filename=config_path,
+        leisure=generate_leisure_for_world(leisure_groups, domain),
+        policies=Policies([]),
+        record=record,
+    )
+    simulator.timer.total_days = days
+    simulator.timer.final_date = simulator.timer.initial_date + datetime.timedelta(
+        days=days
+    )
+    enable_tracing(output_path)
+    mpi_comm.Barrier()
+    tick = perf_counter()
+    simulator.run()
+    run_time = perf_counter() - tick
+    ranks = mpi_comm.gather(
+        {"rank": mpi_rank, "n_people": len(domain.people), "run_time": run_time},
+        root=0,
+    )
+    if mpi_rank == 0:
+        with open(Path(output_path) / "ranks.json", "w") as f:
+            json.dump(ranks, f)
+
+
+def summarise_run(output_path: str) -> dict:
+    """
+    Reads the timings of one run and returns its wall time (slowest rank), the
+    total time of each phase (mean and maximum over ranks), the fraction of time
+    spent exchanging data and waiting for other ranks, and the load imbalance of
+    the computation (slowest over mean rank).
+    """
+    output_path = Path(output_path)
+    with open(output_path / "ranks.json") as f:
+        ranks = pd.DataFrame(json.load(f)).set_index("rank")
+    spans = pd.concat(
+        [
+            pd.read_csv(output_path / f"trace.{rank}.csv")
+            for rank in ranks.index
+        ]
+    )
+    phases = spans.groupby(["rank", "name"])["duration"].sum().unstack(fill_value=0)
+    for name in transfer_spans + waiting_spans:
+        if name not in phases:
+            phases[name] = 0.0
+    transfer = phases[transfer_spans].sum(axis=1)
+    waiting = phases[waiting_spans].sum(axis=1)
+    compute = ranks["run_time"] - transfer - waiting
+    summary = {
+        "n_ranks": len(ranks),
+        "n_people": int(ranks["n_people"].sum()),
+        "wall_time": ranks["run_time"].max(),
+        "comm_fraction": (transfer / ranks["run_time"]).mean(),
+        "wait_fraction": (waiting / ranks["run_time"]).mean(),
+        "imbalance": compute.max() / compute.mean(),
+    }
+    for name in phases:
+        summary[f"{name}_mean"] = phases[name].mean()
+        summary[f"{name}_max"] = phases[name].max()
+    return summary
+
+
+def scaling_table(summaries: List[dict], mode: str) -> pd.DataFrame:
+    """
+    Speedup and efficiency relative to the run with the fewest ranks. In weak
+    scaling the speedup is the scaled speedup, n_ranks * t_1 / t_n.
+    """
+    table = pd.DataFrame(summaries).sort_values("n_ranks").reset_index(drop=True)
+    reference = table.iloc[0]
+    relative_ranks = table["n_ranks"] / reference["n_ranks"]
+    if mode == "strong":
+        table["speedup"] = reference["wall_time"] / table["wall_time"]
+        table["efficiency"] = table["speedup"] / relative_ranks
+    elif mode == "weak":
+        table["efficiency"] = reference["wall_time"] / table["wall_time"]
+        table["speedup"] = table["efficiency"] * relative_ranks
+    else:
+        raise ValueError(f"Scaling mode {mode} not understood, use strong or weak.")
+    first_columns = [
+        "n_ranks",
+        "n_people",
+        "wall_time",
+        "speedup",
+        "efficiency",
+        "comm_fraction",
+        "wait_fraction",
+        "imbalance",
+    ]
+    return table[first_columns + [c for c in table if c not in first_columns]]
+
+
+def run_ranks(
+    n_ranks: int,
+    world_files: List[Path],
+    output_path: str,
+    days: float = 2,
+    seed: int = 0,
+    mpirun: str = "mpirun",
+    random_streams_seed: int = None,
+):
+    """
+    Runs the simulator with ``n_ranks`` ranks under ``mpirun`` (see ``run_rank``).
+
+    Parameters
+    ----------
+    world_files
+        paths to the world hdf5 file, and to the super area centroids and
+        adjacency graph used to split it in domains
+    """
+    # the ranks import this module, whatever the working directory
+    env = dict(os.environ)
+    repository_path = str(Path(__file__).parents[2])
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [repository_path, env.get("PYTHONPATH")])
+    )
+    command = shlex.split(mpirun) + [
+        "-np",
+        str(n_ranks),
+        sys.executable,
+        "-m",
+        "test_june.benchmarks.scaling",
+        "rank",
+        *[str(world_file) for world_file in world_files],
+        str(output_path),
+        "--days",
+        str(days),
+        "--seed",
+        str(seed),
+    ]
+    if random_streams_seed is not None:
+        command += ["--random_streams_seed", str(random_streams_seed)]
+    logger.info(f"Running {' '.join(command)}")
+    subprocess.run(command, check=True, env=env)
+
+
+def run_scaling(
+    mode: str,
+    ranks: List[int],
+    n_people: int,
+    output_path: str = "scaling",
+    days: float = 2,
+    seed: int = 0,
+    mpirun: str = "mpirun",
+    super_areas_per_rank: int = 8,
+) -> pd.DataFrame:
+    """
+    Runs the simulator with each number of ranks and returns the scaling table,
+    which is also saved to ``output_path / scaling_{mode}.csv`` and ``.json``.
+
+    Parameters
+    ----------
+    mode
+        "strong" (the world has ``n_people`` people) or "weak" (the world has
+        ``n_people`` people per rank)
+    ranks
+        numbers of ranks to run with
+    n_people
+        people in the world, or per rank
+    days
+        number of days to simulate
+    mpirun
+        command used to launch the ranks, eg. "mpirun --oversubscribe"
+    super_areas_per_rank
+        the super areas of the worlds are made smaller (down to one area) until
+        there are this many per rank with the most ranks, so that the world can be
+        split in that many domains
+    """
+    from june.hdf5_savers import save_world_to_hdf5
+    from june.synthetic_world import SyntheticWorldGenerator
+
+    output_path = Path(output_path)
+    generator = SyntheticWorldGenerator.from_file()
+    geography = dict(generator.geography)
+    summaries = []
+    world_files = None
+    for n_ranks in sorted(ranks):
+        world_people = n_people * n_ranks if mode == "weak" else n_people
+        if mode == "weak" or world_files is None:
+            world_path = output_path / f"world_{world_people}"
+            world_path.mkdir(parents=True, exist_ok=True)
+            world_files = [
+                world_path / "world.hdf5",
+                world_path / "super_area_centroids.csv",
+                world_path / "super_area_adjacency_graph.json",
+            ]
+            # small enough super areas for every rank to get several of them, in
+            # weak scaling they have the same size in all the worlds
+            n_areas = max(1, world_people // geography["people_per_area"])
+            max_ranks = n_ranks if mode == "weak" else max(ranks)
+            generator.geography["areas_per_super_area"] = max(
+                1,
+                min(
+                    geography["areas_per_super_area"],
+                    n_areas // (super_areas_per_rank * max_ranks),
+                ),
+            )
+            world = generator.generate(n_people=world_people, seed=seed)
+            save_world_to_hdf5(world, world_files[0])
+            generator.save_domain_decomposition_inputs(world, *world_files[1:])
+            del world
+        run_path = output_path / f"{mode}_{n_ranks:03d}"
+        run_path.mkdir(parents=True, exist_ok=True)
+        run_ranks(
+            n_ranks,
+            world_files,
+            run_path,
+            days=days,
+            seed=seed,
+            mpirun=mpirun,
+        )
+        summaries.append(summarise_run(run_path))
+    table = scaling_table(summaries, mode=mode)
+    table.to_csv(output_path / f"scaling_{mode}.csv", index=False)
+    table.to_json(output_path / f"scaling_{mode}.json", orient="records", indent=2)
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MPI scaling of the JUNE simulator.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for mode in ("strong", "weak"):
+        mode_parser = subparsers.add_parser(mode)
+        mode_parser.add_argument("--ranks", type=int, nargs="+", default=[1, 2, 4])
+        mode_parser.add_argument(
+            "--n_people",
+            type=int,
+            default=100000 if mode == "strong" else 25000,
+            help="people in the world"
+            + (" per rank" if mode == "weak" else ""),
+        )
+        mode_parser.add_argument("--days", type=float, default=2)
+        mode_parser.add_argument("--seed", type=int, default=0)
+        mode_parser.add_argument("--output", default="scaling")
+        mode_parser.add_argument("--mpirun", default="mpirun")
+        mode_parser.add_argument("--super_areas_per_rank", type=int, default=8)
+    rank_parser = subparsers.add_parser("rank", help="run by every rank")
+    rank_parser.add_argument("world_path")
+    rank_parser.add_argument("centroids_path")
+    rank_parser.add_argument("adjacency_graph_path")
+    rank_parser.add_argument("output_path")
+    rank_parser.add_argument("--days", type=float, default=2)
+    rank_parser.add_argument("--seed", type=int, default=0)
+    rank_parser.add_argument("--random_streams_seed", type=int, default=None)
+    args = parser.parse_args(argv)
+    if args.command == "rank":
+        run_rank(
+            world_path=args.world_path,
+            centroids_path=args.centroids_path,
+            adjacency_graph_path=args.adjacency_graph_path,
+            output_path=args.output_path,
+            days=args.days,
+            seed=args.seed,
+            random_streams_seed=args.random_streams_seed,
+        )
+        return
+    table = run_scaling(
+        mode=args.command,
+        ranks=args.ranks,
+        n_people=args.n_people,
+        output_path=args.output,
+        days=args.days,
+        seed=args.seed,
+        mpirun=args.mpirun,
+        super_areas_per_rank=args.super_areas_per_rank,
+    )
+    with pd.option_context("display.width", 200):
+        print(table.iloc[:, :8])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,8 @@
+import datetime
+import os
 import random
+import subprocess
+import sys
 
 import numba as nb
 import numpy as np
@@ -7,6 +11,7 @@ import h5py
 from pathlib import Path
 
 from june.interaction import Interaction
+from june.utils.random_streams import set_run_seed
 from june import paths
 from june.geography import (
     Geography,
@@ -39,11 +44,23 @@ from june.epidemiology.infection import (
     InfectionSelectors,
 )
 from june.epidemiology.infection import transmission as trans
+from june.epidemiology.infection_seed import InfectionSeed
+from june.policy import Policies
 from june.simulator import Simulator
+from june.synthetic_world import generate_synthetic_world
 from june.world import generate_world_from_geography, World
 
 constant_config = paths.configs_path / "defaults/epidemiology/infection/transmission/TransmissionConstant.yaml"
 interaction_config = paths.configs_path / "tests/interaction.yaml"
+synthetic_simulator_config = paths.configs_path / "tests/test_simulator_synthetic.yaml"
+synthetic_leisure_groups = [
+    "pubs",
+    "cinemas",
+    "groceries",
+    "gyms",
+    "household_visits",
+    "care_home_visits",
+]
 
 import logging
 
@@ -52,10 +69,8 @@ logging.disable(logging.CRITICAL)
 
 
 @pytest.fixture(autouse=True, name="test_results", scope="session")
-def make_test_output():
-    save_path = Path("./test_results")
-    save_path.mkdir(exist_ok=True)
-    return save_path
+def make_test_output(tmp_path_factory):
+    return tmp_path_factory.mktemp("test_results")
 
 
 @pytest.fixture(autouse=True)
@@ -72,6 +87,7 @@ def set_random_seed(seed=999):
     set_seed_numba(seed)
     np.random.seed(seed)
     random.seed(seed)
+    set_run_seed(None)
     return
 
 
@@ -381,3 +397,75 @@ def create_domains_world():
     travel = Travel()
     travel.initialise_commute(world)
     return world
+
+
+@pytest.fixture(name="make_synthetic_simulator", scope="session")
+def make_synthetic_simulator_factory(health_index_generator):
+    """
+    Returns a function that sets up a simulator on a synthetic world, or on a
+    domain of one. Synthetic worlds do not need the census data.
+    """
+
+    def make_synthetic_simulator(world, interaction=None, policies=None, events=None):
+        return Simulator.from_file(
+            world=world,
+            interaction=interaction or Interaction.from_file(),
+            epidemiology=Epidemiology(
+                infection_selectors=InfectionSelectors(
+                    [InfectionSelector(health_index_generator=health_index_generator)]
+                )
+            ),
+            config_filename=synthetic_simulator_config,
+            leisure=generate_leisure_for_world(synthetic_leisure_groups, world),
+            policies=policies or Policies([]),
+            events=events,
+            record=None,
+        )
+
+    return make_synthetic_simulator
+
+
+@pytest.fixture(name="synthetic_simulator", scope="module")
+def create_synthetic_simulator(make_synthetic_simulator):
+    """
+    Simulator on a synthetic world of 2000 people, 5% of them infected.
+    """
+    np.random.seed(3)
+    world = generate_synthetic_world(n_people=2000, seed=3)
+    simulator = make_synthetic_simulator(world)
+    seed = InfectionSeed.from_uniform_cases(
+        world,
+        simulator.epidemiology.infection_selectors[0],
+        cases_per_capita=0.05,
+        date="2020-03-01",
+    )
+    seed.unleash_virus_per_day(time=0, date=datetime.datetime(2020, 3, 1))
+    return simulator
+
+
+@pytest.fixture(name="run_ranks")
+def make_run_ranks(monkeypatch):
+    """
+    Returns a function that runs ``ranks.py`` with ``n_ranks`` ranks under mpirun.
+    """
+    monkeypatch.setenv("OMPI_ALLOW_RUN_AS_ROOT", "1")
+    monkeypatch.setenv("OMPI_ALLOW_RUN_AS_ROOT_CONFIRM", "1")
+
+    def run_ranks(n_ranks, world_files, output_path, days=2, seed=0):
+        command = [
+            "mpirun",
+            "--oversubscribe",
+            "-np",
+            str(n_ranks),
+            sys.executable,
+            str(Path(__file__).parent / "ranks.py"),
+            *[str(world_file) for world_file in world_files],
+            str(output_path),
+            "--days",
+            str(days),
+            "--seed",
+            str(seed),
+        ]
+        subprocess.run(command, check=True, env=dict(os.environ))
+
+    return run_ranks
@@ -0,0 +1,139 @@
+import numpy as np
+import pytest
+
+from june.demography import Person, Population
+from june.geography import Area, SuperArea, Region
+from june.epidemiology.infection import Immunity
+
+
+@pytest.fixture(name="population")
+def make_population():
+    regions = [Region(name="north"), Region(name="south")]
+    areas = []
+    for region in regions:
+        super_area = SuperArea(region=region)
+        areas.append(Area(super_area=super_area))
+    people = []
+    for i in range(10):
+        person = Person.from_attributes(age=i, sex="f" if i % 2 else "m")
+        person.area = areas[i % 2]
+        person.immunity = Immunity(susceptibility_dict={0: 0.5})
+        people.append(person)
+    population = Population(people)
+    population.build_store(infection_ids=[0, 1])
+    return population
+
+
+class MockInfection:
+    class transmission:
+        probability = 0.3
+
+    @classmethod
+    def infection_id(cls):
+        return 1
+
+
+class TestPopulationStore:
+    def test__static_columns(self, population):
+        store = population.store
+        assert len(store) == 10
+        assert list(store.ages) == list(range(10))
+        assert list(store.sexes) == [i % 2 for i in range(10)]
+        assert store.region_names == ["north", "south"]
+        assert list(store.region_indices) == [i % 2 for i in range(10)]
+        assert np.allclose(store.susceptibility[:, 0], 0.5)
+        assert np.allclose(store.susceptibility[:, 1], 1.0)
+
+    def test__write_through(self, population):
+        store = population.store
+        assert population.infected == []
+        infected = population[3]
+        infected.infection = MockInfection()
+        population.update_state(infected)
+        dead = population[4]
+        dead.dead = True
+        population.update_state(dead)
+        assert population.infected == [infected]
+        assert population.dead == [dead]
+        assert store.infection[3] == 1
+        assert store.transmission_probability[3] == pytest.approx(0.3)
+        assert store.count_per_region(store.infected) == {"north": 0, "south": 1}
+        infected.infection = None
+        population.update_state(infected)
+        assert population.infected == []
+
+    def test__add_and_remove(self, population):
+        store = population.store
+        person = population[2]
+        population.remove(person)
+        assert len(store) == 9
+        assert person.id not in store.row_by_id
+        assert list(store.ids) == [person.id for person in population]
+        population.add(person)
+        assert len(store) == 10
+        assert store.ids[-1] == person.id
+        person.vaccinated = True
+        population.update_state(person)
+        assert population.vaccinated == [person]
+
+    def test__many_adds_and_removes(self, population):
+        store = population.store
+        newcomers = [Person.from_attributes(age=50) for _ in range(100)]
+        population.extend(newcomers)
+        assert len(store) == 110
+        # capacity grows geometrically, not one row per person
+        assert len(store._deleted) < 2 * 110
+        for person in newcomers[::2] + population[:3]:
+            population.remove(person)
+        newcomers[1].dead = True
+        population.update_state(newcomers[1])
+        assert len(store) == 57
+        assert list(store.ids) == [person.id for person in population]
+        assert population.dead == [newcomers[1]]
+        assert store.row_by_id == {
+            person.id: row for row, person in enumerate(population)
+        }
+
+
+class TestInfectedIndex:
+    def test__counters(self, population):
+        assert population.infected_ids == []
+        for person in population[:4]:
+            person.infection = MockInfection()
+            population.update_state(person)
+        assert population.infected_ids == [person.id for person in population[:4]]
+        assert population.infected_per_region == {"north": 2, "south": 2}
+        assert sum(population.infected_per_super_area.values()) == 4
+        recovered = population[0]
+        recovered.infection = None
+        population.update_state(recovered)
+        assert population.infected == population[1:4]
+        assert population.infected_per_region["north"] == 1
+        population.remove(population[1])
+        assert population.infected_per_region["south"] == 1
+
+    def test__population_order(self, population):
+        for person in reversed(population[:6]):
+            person.infection = MockInfection()
+            population.update_state(person)
+        assert population.infected == population[:6]
+        assert population.infected_ids == [person.id for person in population[:6]]
+
+    def test__same_draws_as_without_store(self, population):
+        list_population = Population(list(population))
+        for person in reversed(population[::2]):
+            person.infection = MockInfection()
+            population.update_state(person)
+        np.random.seed(3)
+        draws = [(person.id, np.random.random()) for person in population.infected]
+        np.random.seed(3)
+        list_draws = [
+            (person.id, np.random.random()) for person in list_population.infected
+        ]
+        assert draws == list_draws
+
+    def test__people_from_other_populations_ignored(self, population):
+        outsider = Person.from_attributes()
+        outsider.infection = MockInfection()
+        population.update_state(outsider)
+        assert population.infected == []
@@ -19,6 +19,7 @@ from june.epidemiology.infection import (
     InfectionSelectors,
     transmission,
     SymptomTag,
+    TrajectoryMakers,
 )
 
 path_pwd = Path(__file__)
@@ -281,3 +282,99 @@ class TestMultipleVirus:
         assert person.immunity.is_immune(Covid19.infection_id())
         assert person.immunity.is_immune(B117.infection_id())
         assert person.infected
+
+
+class TestBatchedInfections:
+    @pytest.mark.parametrize(
+        "transmission_config, transmission_class",
+        [
+            ("covid19.yaml", transmission.TransmissionGamma),
+            ("XNExp.yaml", transxnexp.TransmissionXNExp),
+            ("TransmissionConstant.yaml", transmission.TransmissionConstant),
+        ],
+    )
+    def test__infect_people_at_time(self, transmission_config, transmission_class):
+        selector = make_selector(
+            "severe",
+            transmission_config_path=paths.configs_path
+            / "defaults/epidemiology/infection/transmission"
+            / transmission_config,
+        )
+        people = [Person.from_attributes(sex="f", age=26) for _ in range(500)]
+        selector.infect_people_at_time(people, time=0.3)
+        for person in people:
+            assert person.infection.start_time == 0.3
+            assert person.infection.max_tag == SymptomTag.severe
+            assert person.infection.symptoms.trajectory[0] == (
+                0.0,
+                SymptomTag.exposed,
+            )
+            assert isinstance(person.infection.transmission, transmission_class)
+            assert person.immunity.is_immune(Covid19.infection_id())
+        times_exposed = [person.infection.symptoms.time_exposed for person in people]
+        assert len(set(times_exposed)) == len(people)
+        if transmission_class == transmission.TransmissionGamma:
+            batch_peaks = [
+                person.infection.transmission.time_at_maximum_infectivity
+                - person.infection.symptoms.time_exposed
+                for person in people
+            ]
+            single_peaks = []
+            for _ in range(500):
+                infection = selector._make_infection(people[0], 0.0)
+                single_peaks.append(
+                    infection.transmission.time_at_maximum_infectivity
+                    - infection.symptoms.time_exposed
+                )
+            assert np.mean(batch_peaks) == pytest.approx(
+                np.mean(single_peaks), abs=0.2
+            )
+
+    def test__infect_people_with_several_infections(self):
+        health_index_generator = MockHealthIndexGenerator("mild")
+        selector1 = InfectionSelector(health_index_generator=health_index_generator)
+        selector2 = InfectionSelector(
+            infection_class=MockInfection,
+            health_index_generator=health_index_generator,
+        )
+        infection_selectors = InfectionSelectors([selector1, selector2])
+        people = [Person.from_attributes() for _ in range(10)]
+        infection_ids = [
+            Covid19.infection_id() if i % 2 else MockInfection.infection_id()
+            for i in range(10)
+        ]
+        infection_selectors.infect_people_at_time(
+            people, time=1.0, infection_ids=infection_ids
+        )
+        for person, infection_id in zip(people, infection_ids):
+            assert person.infection.infection_id() == infection_id
+            assert person.infection.max_tag == SymptomTag.mild
+
+    def test__same_trajectories_as_single_infections(self):
+        trajectory_maker = TrajectoryMakers.from_list(
+            [
+                {
+                    "stages": [
+                        {
+                            "symptom_tag": tag,
+                            "completion_time": {"type": "constant", "value": value},
+                        }
+                        for tag, value in (("exposed", 2), ("mild", 5), ("recovered", 0))
+                    ]
+                }
+            ]
+        )
+        selector = InfectionSelector(
+            health_index_generator=MockHealthIndexGenerator("mild"),
+            trajectory_maker=trajectory_maker,
+        )
+        people = [Person.from_attributes() for _ in range(3)]
+        selector.infect_people_at_time(people[:2], time=0.0)
+        selector.infect_person_at_time(people[2], time=0.0)
+        trajectories = [person.infection.symptoms.trajectory for person in people]
+        assert trajectories[0] == trajectories[1] == trajectories[2]
+        assert [tag for _, tag in trajectories[0]] == [
+            SymptomTag.exposed,
+            SymptomTag.mild,
+            SymptomTag.recovered,
+        ]
@@ -0,0 +1,86 @@
+from copy import deepcopy
+
+import numpy as np
+import pytest
+
+from june import paths
+from june.demography import Person
+from june.epidemiology.infection import InfectionSelector, InfectionTable
+
+transmission_path = paths.configs_path / "defaults/epidemiology/infection/transmission"
+
+
+class MockHealthIndexGenerator:
+    def __call__(self, person, infection_id):
+        return np.array([0.1, 0.3, 0.5, 0.6, 0.7, 0.8, 0.9])
+
+
+def make_infected_people(transmission_config, n=200):
+    selector = InfectionSelector(
+        health_index_generator=MockHealthIndexGenerator(),
+        transmission_config_path=transmission_path / transmission_config,
+    )
+    people = [Person.from_attributes() for _ in range(n)]
+    selector.infect_people_at_time(people, time=0.5)
+    return people
+
+
+class TestInfectionTable:
+    @pytest.mark.parametrize(
+        "transmission_config",
+        ["covid19.yaml", "XNExp.yaml", "TransmissionConstant.yaml"],
+    )
+    def test__update_matches_infections(self, transmission_config):
+        people = make_infected_people(transmission_config)
+        reference = deepcopy(people)
+        table = InfectionTable(people)
+        for time in np.arange(0.0, 30.0, 0.5):
+            previous_tags = [person.infection.tag for person in reference]
+            for person in reference:
+                person.infection.update_symptoms_and_transmission(time)
+            table_people, tag_changed = table.update(time)
+            assert table_people == people
+            for person, reference_person, changed, previous_tag in zip(
+                people, reference, tag_changed, previous_tags
+            ):
+                assert person.infection.transmission.probability == pytest.approx(
+                    reference_person.infection.transmission.probability, nan_ok=True
+                )
+                assert person.infection.symptoms.stage == (
+                    reference_person.infection.symptoms.stage
+                )
+                assert person.infection.tag == reference_person.infection.tag
+                assert changed == (previous_tag != reference_person.infection.tag)
+            for person in people:
+                if person.infection.status != "infected":
+                    person.infection = None
+                    table.update_person(person)
+            for person in reference:
+                if person.infection.status != "infected":
+                    person.infection = None
+            people = [person for person in people if person.infection is not None]
+            reference = [
+                person for person in reference if person.infection is not None
+            ]
+            assert len(table) == len(people)
+            assert set(table.people) == set(people)
+            people = list(table.people)
+            reference_by_id = {person.id: person for person in reference}
+            reference = [reference_by_id[person.id] for person in people]
+
+    def test__grows_and_removes(self):
+        people = make_infected_people("covid19.yaml", n=10)
+        table = InfectionTable(people[:5], capacity=2)
+        for person in people[5:]:
+            table.update_person(person)
+        assert len(table) == 10
+        assert table.capacity >= 10
+        removed = people[2]
+        removed.infection = None
+        table.update_person(removed)
+        assert len(table) == 9
+        assert removed not in table.people
+        for row, person in enumerate(table.people):
+            assert table.row_by_id[person.id] == row
+            assert table.start_times[row] == person.infection.start_time
+            assert table.shifts[row] == person.infection.transmission.shift
@@ -44,6 +44,17 @@ class TestCompletionTime:
         completion_time = BetaCompletionTime(1.0, 1.0)
         assert 0.0 <= completion_time() <= 1.0
 
+    def test_completion_time_sample(self):
+        completion_time = ExponentialCompletionTime(loc=1.0, scale=2.0)
+        samples = completion_time.sample(100000)
+        assert len(set(samples)) == 100000
+        assert samples.min() >= 1.0
+        assert samples.mean() == pytest.approx(3.0, rel=0.02)
+
+    def test_constant_sample(self):
+        completion_time = ConstantCompletionTime(value=2.0)
+        assert list(completion_time.sample(3)) == [2.0, 2.0, 2.0]
+
 
 class TestParse:
     def test_symptoms_tag_for_string(self):
@@ -218,3 +229,33 @@ class TestSymptoms:
         assert infection.symptoms.tag == SymptomTag.mild
         infection.update_symptoms_and_transmission(float(50.0))
         assert infection.symptoms.tag == SymptomTag.recovered
+
+
+class TestBatchedTrajectories:
+    def test__generate_trajectories(self):
+        trajectory_maker = TrajectoryMaker(
+            Stage(
+                symptoms_tag=SymptomTag.exposed,
+                completion_time=ConstantCompletionTime(value=2.0),
+            ),
+            Stage(
+                symptoms_tag=SymptomTag.mild,
+                completion_time=ExponentialCompletionTime(loc=1.0, scale=1.0),
+            ),
+            Stage(
+                symptoms_tag=SymptomTag.recovered,
+                completion_time=ConstantCompletionTime(value=0.0),
+            ),
+        )
+        trajectories = trajectory_maker.generate_trajectories(100)
+        assert len(trajectories) == 100
+        for trajectory in trajectories:
+            assert [tag for _, tag in trajectory] == [
+                SymptomTag.exposed,
+                SymptomTag.mild,
+                SymptomTag.recovered,
+            ]
+            assert trajectory[0][0] == 0.0
+            assert trajectory[1][0] == 2.0
+            assert trajectory[2][0] >= 3.0
+        assert len({trajectory[2][0] for trajectory in trajectories}) == 100
@@ -5,6 +5,7 @@ from june import paths
 from june.geography import Geography, Area
 from june.demography import Person
 from june.groups.care_home import CareHome, CareHomes
+from june.policy import Quarantine
 
 default_config_file = paths.configs_path / "defaults/groups/carehome.yaml"
 
@@ -26,3 +27,9 @@ class TestCareHome:
         assert carehome.area == "asd"
         assert carehome.n_workers == 8
 
+    def test__residents_stay_home_under_quarantine(self, carehome):
+        person = Person.from_attributes(age=80)
+        carehome.add(person)
+        assert person.residence.group is carehome
+        assert Quarantine().check_stay_home_condition(person, days_from_start=0)
+
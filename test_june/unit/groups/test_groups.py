@@ -1,4 +1,5 @@
 from june.demography.person import Person
+from june.epoch import Epoch
 from june.groups.care_home import CareHome
 from june.groups.household import Household
 
@@ -23,3 +24,37 @@ class TestGroup:
 
         assert care_home_2.id == care_home_1.id + 1
         assert care_home_1.name == f"CareHome_{care_home_1.id:05d}"
+
+    def test_memberships_expire_with_the_epoch(self):
+        epoch = Epoch()
+        household = Household()
+        household.epoch = epoch
+        person = Person.from_attributes()
+        person.epoch = epoch
+        household.add(person, Household.SubgroupType.adults)
+        person.leisure = household[Household.SubgroupType.adults]
+        household.being_visited = True
+        assert person.busy
+        assert household.size == 1
+        assert person.iter_subgroups()[-1] is household[Household.SubgroupType.adults]
+        epoch.advance()
+        assert not person.busy
+        assert person.leisure is None
+        assert person.iter_subgroups()[-1] is None
+        assert not household.being_visited
+        assert household.size == 0
+        assert person not in household[Household.SubgroupType.adults]
+        household.add(person, Household.SubgroupType.kids)
+        assert person.busy
+        assert household[Household.SubgroupType.kids].people == [person]
+
+    def test_epochs_are_independent(self):
+        household = Household()
+        household.epoch = Epoch()
+        other_household = Household()
+        other_household.epoch = Epoch()
+        household.add(Person.from_attributes(), Household.SubgroupType.adults)
+        other_household.add(Person.from_attributes(), Household.SubgroupType.adults)
+        household.epoch.advance()
+        assert household.size == 0
+        assert other_household.size == 1
@@ -1,7 +1,13 @@
 from june.interaction import Interaction, interaction
+from june.interaction.vectorized_interaction import (
+    FlattenedGroups,
+    FlattenedHouseholds,
+    infect_flattened_groups_parallel,
+)
+from june.exc import InteractionError
 from june.epidemiology.infection.infection_selector import InfectionSelector
 from june.epidemiology.infection import Immunity
-from june.groups import School
+from june.groups import School, Schools, Household
 from june.demography import Person
 from june import paths
 from june.geography import Geography
@@ -13,6 +19,7 @@ from june.policy import Policies
 from june.simulator import Simulator
 
 import pytest
+import numba as nb
 import numpy as np
 import os
 import pandas as pd
@@ -219,6 +226,104 @@ def test__average_time_to_infect(n_teachers, mode, selector):
     )
 
 
+@pytest.mark.parametrize("engine", ["python", "vectorized", "parallel"])
+def test__super_group_time_step(engine, selector):
+    n_teachers = 4
+    n_schools = 2000
+    delta_time = 0.5
+    contact_matrices = {
+        "contacts": [[n_teachers - 1, 1], [1, 0]],
+        "proportion_physical": [[0, 0], [0, 0]],
+        "xi": 1.0,
+        "characteristic_time": 24,
+    }
+    interaction = Interaction(
+        betas={"school": 1},
+        alpha_physical=1,
+        contact_matrices={"school": contact_matrices},
+        engine=engine,
+    )
+    schools = []
+    susceptible_ids = set()
+    for _ in range(n_schools):
+        people, school = create_school(n_students=1, n_teachers=n_teachers)
+        for person in people[:-1]:
+            selector.infect_person_at_time(person, time=0)
+        susceptible_ids.add(people[-1].id)
+        schools.append(school)
+    schools.append(create_school(n_students=1, n_teachers=n_teachers)[1])
+    infected_ids, infection_ids, n_people = interaction.time_step_for_super_group(
+        super_group=Schools(schools), delta_time=delta_time
+    )
+    assert n_people == (n_schools + 1) * (n_teachers + 1)
+    assert set(infected_ids) <= susceptible_ids
+    assert set(infection_ids) == {selector.infection_id}
+    expected = 1 - np.exp(-0.1 * n_teachers * delta_time)
+    np.testing.assert_allclose(len(infected_ids) / n_schools, expected, rtol=0.1)
+
+
+
+@pytest.mark.parametrize("engine", ["python", "vectorized", "parallel"])
+def test__super_group_time_step_subset_of_groups(engine, selector):
+    interaction = Interaction(
+        betas={"school": 1},
+        alpha_physical=1,
+        contact_matrices={
+            "school": {
+                "contacts": [[3, 1], [1, 0]],
+                "proportion_physical": [[0, 0], [0, 0]],
+                "xi": 1.0,
+                "characteristic_time": 24,
+            }
+        },
+        engine=engine,
+    )
+    schools = []
+    susceptible_ids = []
+    for _ in range(10):
+        people, school = create_school(n_students=1, n_teachers=4)
+        for person in people[:-1]:
+            selector.infect_person_at_time(person, time=0)
+        susceptible_ids.append(people[-1].id)
+        schools.append(school)
+    infected_ids, _, n_people = interaction.time_step_for_super_group(
+        super_group=Schools(schools), delta_time=10, groups=schools[:3]
+    )
+    assert n_people == 3 * 5
+    assert set(infected_ids) <= set(susceptible_ids[:3])
+
+
+def test__vectorized_records_infections_at_their_groups(selector, monkeypatch):
+    interaction = Interaction(
+        betas={"school": 1000},
+        alpha_physical=1,
+        contact_matrices={
+            "school": {
+                "contacts": [[3, 1], [1, 0]],
+                "proportion_physical": [[0, 0], [0, 0]],
+                "xi": 1.0,
+                "characteristic_time": 24,
+            }
+        },
+        engine="vectorized",
+    )
+    # no infectors, skipped
+    _, quiet_school = create_school(n_students=1, n_teachers=4)
+    people, school = create_school(n_students=1, n_teachers=4)
+    for person in people[1:]:
+        selector.infect_person_at_time(person, time=0)
+    logged = []
+    monkeypatch.setattr(
+        interaction,
+        "_log_infections_to_record",
+        lambda infected_ids, group, **kwargs: logged.append((group, infected_ids)),
+    )
+    infected_ids, _, _ = interaction.time_step_for_super_group(
+        super_group=Schools([quiet_school, school]), delta_time=10, record=True
+    )
+    assert infected_ids == [people[0].id]
+    assert logged == [(school, [people[0].id])]
+
 def test__infection_is_isolated(epidemiology, selectors):
     geography = Geography.from_file({"area": ["E00002559"]})
     world = generate_world_from_geography(geography, include_households=True)
@@ -307,3 +412,219 @@ def test__super_spreaders(selector):
             expected,
             rtol=0.25,
         )
+
+
+@pytest.mark.parametrize("engine", ["python", "vectorized", "parallel"])
+def test__workload_counters(engine, selector):
+    interaction = Interaction(
+        betas={"school": 1},
+        alpha_physical=1,
+        contact_matrices={
+            "school": {
+                "contacts": [[3, 1], [1, 0]],
+                "proportion_physical": [[0, 0], [0, 0]],
+                "xi": 1.0,
+                "characteristic_time": 24,
+            }
+        },
+        engine=engine,
+    )
+    schools = []
+    for _ in range(4):
+        people, school = create_school(n_students=1, n_teachers=4)
+        for person in people[:-1]:
+            selector.infect_person_at_time(person, time=0)
+        schools.append(school)
+    # nobody infected, skipped
+    schools.append(create_school(n_students=1, n_teachers=4)[1])
+    infected_ids, _, _ = interaction.time_step_for_super_group(
+        super_group=Schools(schools), delta_time=10
+    )
+    counters = interaction.workload.counters["school"]
+    assert counters["n_groups"] == 5
+    assert counters["n_skipped"] == 1
+    assert counters["n_people"] == 5 * 5
+    assert counters["n_pairs"] == 4 * 4
+    assert counters["n_infections"] == len(infected_ids)
+    assert counters["time"] > 0
+    interaction.workload.reset()
+    assert interaction.workload.counters == {}
+
+
+def test__contact_matrix_cache():
+    interaction = Interaction.from_file(config_filename=test_config)
+    cache = interaction.contact_matrix_cache
+    contact_matrix_raw = interaction.contact_matrices["school"]
+    _, school = create_school(n_students=2, n_teachers=1)
+    _, other_school = create_school(n_students=2, n_teachers=1)
+    interactive_school = school.get_interactive_group()
+    contact_matrix = cache.get(interactive_school, contact_matrix_raw)
+    np.testing.assert_allclose(
+        contact_matrix,
+        interactive_school.get_processed_contact_matrix(contact_matrix_raw),
+    )
+    assert not contact_matrix.flags.writeable
+    assert cache.get(other_school.get_interactive_group(), contact_matrix_raw) is (
+        contact_matrix
+    )
+    assert cache.hits["school"] == 1
+    assert cache.misses["school"] == 1
+    assert cache.hit_rates() == {"school": 0.5}
+    # a new raw matrix invalidates the entry
+    interaction.contact_matrices["school"] = contact_matrix_raw.copy()
+    cache.get(interactive_school, interaction.contact_matrices["school"])
+    assert cache.misses["school"] == 2
+    assert contact_matrix_raw.flags.writeable
+
+
+def test__beta_table():
+    interaction = Interaction.from_file(config_filename=test_config)
+    _, school = create_school(n_students=2, n_teachers=1)
+    _, other_school = create_school(n_students=2, n_teachers=1)
+    interactive_school = school.get_interactive_group()
+    beta = interaction._get_interactive_group_beta(interactive_school)
+    assert beta == interactive_school.get_processed_beta(
+        betas=interaction.betas, beta_reductions=interaction.beta_reductions
+    )
+    assert interaction.beta_table == {(interactive_school.beta_key, None): beta}
+    assert (
+        interaction._get_interactive_group_beta(other_school.get_interactive_group())
+        == beta
+    )
+    assert len(interaction.beta_table) == 1
+    # new policies empty the table
+    interaction.beta_reductions = {interactive_school.beta_key: 0.5}
+    assert interaction.beta_table == {}
+    assert interaction._get_interactive_group_beta(interactive_school) < beta
+
+
+def test__parallel_kernel_uses_the_given_draws(selector):
+    interaction = Interaction.from_file(config_filename=test_config)
+    interactive_groups = []
+    for _ in range(5):
+        people, school = create_school(n_students=3, n_teachers=1)
+        selector.infect_person_at_time(people[-1], time=0)
+        interactive_groups.append(school.get_interactive_group())
+    flattened_groups = FlattenedGroups(
+        interactive_groups=interactive_groups,
+        betas=[1.0] * len(interactive_groups),
+        contact_matrices=[
+            interaction.contact_matrix_cache.get(
+                interactive_group, interaction.contact_matrices["school"]
+            )
+            for interactive_group in interactive_groups
+        ],
+    )
+    arguments = dict(
+        betas=flattened_groups.betas,
+        delta_time=1.0,
+        contact_matrices=flattened_groups.contact_matrices,
+        contact_matrix_offsets=flattened_groups.contact_matrix_offsets,
+        n_subgroups=flattened_groups.n_subgroups,
+        subgroup_offsets=flattened_groups.subgroup_offsets,
+        subgroup_sizes=flattened_groups.subgroup_sizes,
+        infector_transmissions=flattened_groups.infector_transmissions,
+        susceptible_groups=flattened_groups.susceptible_groups,
+        susceptible_subgroups=flattened_groups.susceptible_subgroups,
+        susceptibilities=flattened_groups.susceptibilities,
+    )
+    n_susceptibles = len(flattened_groups.susceptible_ids)
+    assert n_susceptibles == 5 * 3
+    infection_indices, blamed_subgroups = infect_flattened_groups_parallel(
+        random_numbers=np.zeros((n_susceptibles, 3)), **arguments
+    )
+    assert (infection_indices == 0).all()
+    # the only infector is a teacher
+    assert (blamed_subgroups == 0).all()
+    infection_indices, blamed_subgroups = infect_flattened_groups_parallel(
+        random_numbers=np.full((n_susceptibles, 3), 1 - 1e-12), **arguments
+    )
+    assert (infection_indices == -1).all()
+    assert (blamed_subgroups == -1).all()
+    # same results whatever the number of threads, ie. of chunks
+    random_numbers = np.random.random((n_susceptibles, 3))
+    n_threads = nb.get_num_threads()
+    results = []
+    for n_kernel_threads in (1, nb.config.NUMBA_NUM_THREADS):
+        nb.set_num_threads(n_kernel_threads)
+        results.append(
+            infect_flattened_groups_parallel(random_numbers=random_numbers, **arguments)
+        )
+    nb.set_num_threads(n_threads)
+    for single_thread_result, result in zip(*results):
+        np.testing.assert_array_equal(single_thread_result, result)
+    with pytest.raises(InteractionError):
+        Interaction(betas={}, alpha_physical=1, contact_matrices={}, n_threads=0)
+
+
+def test__parallel_engine_keeps_the_number_of_threads(selector):
+    n_threads = nb.get_num_threads()
+    interaction = Interaction.from_file(config_filename=test_config)
+    interaction.engine = "parallel"
+    interaction.n_threads = 1
+    people, school = create_school(n_students=3, n_teachers=1)
+    selector.infect_person_at_time(people[-1], time=0)
+    interaction.time_step_for_super_group(super_group=Schools([school]), delta_time=1)
+    assert nb.get_num_threads() == n_threads
+
+
+def test__flattened_households_match_flattened_groups(selector):
+    interaction = Interaction.from_file(config_filename=test_config)
+    households = []
+    for n_residents in range(2, 8):
+        household = Household()
+        for i in range(n_residents):
+            person = Person.from_attributes(age=10 * i + 5)
+            household.add(person, subgroup_type=i % 4)
+            if i % 3 == 0:
+                selector.infect_person_at_time(person, time=0)
+        households.append(household)
+    contact_matrix = interaction.contact_matrices["household"]
+    betas = [1.0 + 0.1 * i for i in range(len(households))]
+    interactive_households = [
+        household.get_interactive_group() for household in households
+    ]
+    flattened_groups = FlattenedGroups(
+        interactive_groups=interactive_households,
+        betas=betas,
+        contact_matrices=[contact_matrix] * len(households),
+    )
+    flattened_households = FlattenedHouseholds(
+        households=households, betas=betas, contact_matrix=contact_matrix
+    )
+    assert len(flattened_households) == len(flattened_groups)
+    for attribute in (
+        "betas",
+        "n_subgroups",
+        "subgroup_offsets",
+        "subgroup_sizes",
+        "infection_ids",
+        "infector_transmissions",
+        "susceptible_ids",
+        "susceptible_groups",
+        "susceptible_subgroups",
+        "susceptibilities",
+        "susceptible_offsets",
+    ):
+        np.testing.assert_array_equal(
+            getattr(flattened_households, attribute),
+            getattr(flattened_groups, attribute),
+        )
+    assert (flattened_households.contact_matrix_offsets == 0).all()
+    np.testing.assert_array_equal(
+        flattened_households.contact_matrices, np.ravel(contact_matrix)
+    )
+    assert flattened_households.n_infectious_pairs == (
+        flattened_groups.n_infectious_pairs
+    )
+    for g, interactive_household in enumerate(interactive_households):
+        assert flattened_households.get_infectors(g) == {
+            infection_id: {
+                subgroup_id: dict(infectors)
+                for subgroup_id, infectors in infectors_per_subgroup.items()
+            }
+            for (
+                infection_id,
+                infectors_per_subgroup,
+            ) in interactive_household.infectors_per_infection_per_subgroup.items()
+        }
@@ -23,6 +23,15 @@ class TestVaccination:
         vaccine_policy.apply(person=person, date=date)
         assert person.vaccine_plan is None
 
+    def test__vaccinated_column_updated(self):
+        people = Population([Person.from_attributes(age=30, sex="f")])
+        people.build_store()
+        vaccine_policy = VaccineDistribution(group_by="age", group_type="20-40")
+        vaccine_policy.vaccinate(
+            person=people[0], date=datetime.datetime(2100, 1, 1), people=people
+        )
+        assert people.vaccinated == [people[0]]
+
     def test__process_target_population_care_home(
         self,
     ):
@@ -0,0 +1,140 @@
+"""
+Runs a simulation on the domain of each rank, to be launched under ``mpirun`` by the
+``run_ranks`` fixture:
+
+    mpirun -np 2 python ranks.py world.hdf5 centroids.csv adjacency.json output_path
+
+The random numbers are drawn from counter based streams, so runs with different
+numbers of ranks can be compared through the infections recorded by each rank to
+``output_path / june_record.{rank}.h5``.
+"""
+import argparse
+import datetime
+import logging
+
+import h5py
+
+from june import paths
+from june.domains import Domain, DomainSplitter
+from june.ensemble import set_random_seed
+from june.epidemiology.epidemiology import Epidemiology
+from june.epidemiology.infection import (
+    ImmunitySetter,
+    InfectionSelector,
+    InfectionSelectors,
+)
+from june.epidemiology.infection_seed import InfectionSeed, InfectionSeeds
+from june.exc import SimulatorError
+from june.groups.leisure import generate_leisure_for_world
+from june.interaction import Interaction
+from june.mpi_setup import mpi_comm, mpi_rank, mpi_size
+from june.policy import Policies
+from june.records import Record
+from june.simulator import Simulator
+from june.utils.random_streams import RandomStreams
+
+config_path = paths.configs_path / "tests/test_simulator_synthetic.yaml"
+leisure_groups = [
+    "pubs",
+    "cinemas",
+    "groceries",
+    "gyms",
+    "household_visits",
+    "care_home_visits",
+]
+
+
+def health_index_generator(person, infection_id):
+    return [0.4, 0.5, 0.7, 0.74, 0.85, 0.90, 0.95]
+
+
+def split_world(world_path, centroids_path, adjacency_graph_path):
+    """
+    Returns the domain of each super area id, the same for every rank.
+    """
+    super_areas_to_domain_dict = None
+    if mpi_rank == 0:
+        with h5py.File(world_path, "r") as f:
+            super_area_name_to_id = {
+                name.decode(): int(super_area_id)
+                for name, super_area_id in zip(
+                    f["geography"]["super_area_name"], f["geography"]["super_area_id"]
+                )
+            }
+        if mpi_size == 1:
+            super_areas_per_domain = {0: list(super_area_name_to_id)}
+        else:
+            super_areas_per_domain, _ = DomainSplitter.generate_world_split(
+                number_of_domains=mpi_size,
+                world_path=world_path,
+                super_area_centroids_path=centroids_path,
+                super_area_adjacency_graph_path=adjacency_graph_path,
+            )
+        super_areas_to_domain_dict = {
+            super_area_name_to_id[name]: domain_id
+            for domain_id, names in super_areas_per_domain.items()
+            for name in names
+        }
+    super_areas_to_domain_dict = mpi_comm.bcast(super_areas_to_domain_dict, root=0)
+    # raised by every rank, otherwise the others would wait forever
+    if set(super_areas_to_domain_dict.values()) != set(range(mpi_size)):
+        raise SimulatorError(f"The world can't be split in {mpi_size} domains.")
+    return super_areas_to_domain_dict
+
+
+def run_rank(world_path, centroids_path, adjacency_graph_path, output_path, days, seed):
+    if mpi_rank > 0:
+        logging.disable(logging.CRITICAL)
+    domain = Domain.from_hdf5(
+        domain_id=mpi_rank,
+        super_areas_to_domain_dict=split_world(
+            world_path, centroids_path, adjacency_graph_path
+        ),
+        hdf5_file_path=world_path,
+    )
+    # the seed of the run is mixed into the streams, so it is the same for every rank
+    set_random_seed(0)
+    interaction = Interaction.from_file()
+    interaction.engine = "vectorized"
+    interaction.random_streams = RandomStreams(seed=seed)
+    selector = InfectionSelector(health_index_generator=health_index_generator)
+    infection_seed = InfectionSeed.from_uniform_cases(
+        domain, selector, cases_per_capita=0.01, date="2020-03-01"
+    )
+    simulator = Simulator.from_file(
+        world=domain,
+        interaction=interaction,
+        epidemiology=Epidemiology(
+            infection_selectors=InfectionSelectors([selector]),
+            infection_seeds=InfectionSeeds([infection_seed]),
+            immunity_setter=ImmunitySetter(susceptibility_mode="individual"),
+        ),
+        config_filename=config_path,
+        leisure=generate_leisure_for_world(leisure_groups, domain),
+        policies=Policies([]),
+        record=Record(record_path=output_path, mpi_rank=mpi_rank),
+    )
+    simulator.timer.total_days = days
+    simulator.timer.final_date = simulator.timer.initial_date + datetime.timedelta(
+        days=days
+    )
+    simulator.run()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("world_path")
+    parser.add_argument("centroids_path")
+    parser.add_argument("adjacency_graph_path")
+    parser.add_argument("output_path")
+    parser.add_argument("--days", type=float, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run_rank(
+        args.world_path,
+        args.centroids_path,
+        args.adjacency_graph_path,
+        args.output_path,
+        days=args.days,
+        seed=args.seed,
+    )
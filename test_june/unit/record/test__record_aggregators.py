@@ -91,11 +91,11 @@ def create_dummy_world():
     return world
 
 
-def test__prepend_checkpoint_hdf5(dummy_world):
+def test__prepend_checkpoint_hdf5(dummy_world, tmp_path):
 
-    pre_checkpoint_record_path = Path("./pre_checkpoint_results/june_record.h5")
+    pre_checkpoint_record_path = tmp_path / "pre_checkpoint_results" / "june_record.h5"
     pre_checkpoint_record = Record(
-        record_path="pre_checkpoint_results", record_static_data=True
+        record_path=tmp_path / "pre_checkpoint_results", record_static_data=True
     )
     pre_checkpoint_record.static_data(dummy_world)
     for i in range(1, 15):
@@ -125,9 +125,9 @@ def test__prepend_checkpoint_hdf5(dummy_world):
                 )
         pre_checkpoint_record.time_step(timestamp)
 
-    post_checkpoint_record_path = Path("./post_checkpoint_results/june_record.h5")
+    post_checkpoint_record_path = tmp_path / "post_checkpoint_results" / "june_record.h5"
     post_checkpoint_record = Record(
-        record_path="post_checkpoint_results", record_static_data=True
+        record_path=tmp_path / "post_checkpoint_results", record_static_data=True
     )
     post_checkpoint_record.static_data(dummy_world)
     for i in range(11, 21):
@@ -157,7 +157,9 @@ def test__prepend_checkpoint_hdf5(dummy_world):
                 )
         post_checkpoint_record.time_step(timestamp)
 
-    merged_record_path = Path("./post_checkpoint_results/merged_checkpoint_record.h5")
+    merged_record_path = (
+        tmp_path / "post_checkpoint_results" / "merged_checkpoint_record.h5"
+    )
     prepend_checkpoint_hdf5(
         pre_checkpoint_record_path,
         post_checkpoint_record_path,
@@ -195,3 +197,45 @@ def test__prepend_checkpoint_hdf5(dummy_world):
                 assert row["dead_person_ids"] % 2 == 0
             else:
                 assert row["dead_person_ids"] % 2 == 1
+
+
+def test__prepend_checkpoint_hdf5_with_missing_tables(tmp_path):
+    records = {}
+    for name, day in (("pre_checkpoint_results", 1), ("post_checkpoint_results", 11)):
+        record = Record(record_path=tmp_path / name)
+        with open_file(record.record_path / record.filename, mode="a") as f:
+            record.file = f
+            record.accumulate(
+                table_name="infections",
+                location_spec="household",
+                region_name="over_here",
+                location_id=0,
+                infected_ids=[day],
+                infector_ids=[day + 1],
+                infection_ids=[0],
+            )
+            record.accumulate(
+                table_name="workload",
+                spec="household",
+                n_groups=day,
+                n_skipped=0,
+                n_people=2,
+                n_pairs=1.0,
+                n_infections=1,
+                time=0.0,
+            )
+        record.time_step(datetime.datetime(2020, 3, day))
+        records[name] = record.record_path / record.filename
+    # records written before the workload table existed
+    with open_file(records["pre_checkpoint_results"], mode="a") as f:
+        f.remove_node(f.root, "workload")
+    merged_record_path = tmp_path / "merged_checkpoint_record.h5"
+    prepend_checkpoint_hdf5(
+        records["pre_checkpoint_results"],
+        records["post_checkpoint_results"],
+        merged_record_path=merged_record_path,
+        checkpoint_date=datetime.datetime(2020, 3, 11),
+    )
+    with open_file(merged_record_path) as merged_record:
+        assert list(merged_record.root.infections[:]["infected_ids"]) == [1, 11]
+        assert list(merged_record.root.workload[:]["n_groups"]) == [11]
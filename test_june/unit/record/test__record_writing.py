@@ -13,7 +13,7 @@ from june.groups import Hospital, Hospitals, Household, Households, CareHome, Ca
 from june.policy import Policies
 from june.activity import ActivityManager
 from june.demography import Person, Population
-from june.interaction import Interaction
+from june.interaction import Interaction, InteractionWorkload
 from june.epidemiology.epidemiology import Epidemiology
 from june.epidemiology.infection import InfectionSelector, HealthIndexGenerator
 from june.epidemiology.infection_seed import InfectionSeed, InfectionSeeds
@@ -499,7 +499,7 @@ def test__parameters(dummy_world, selector, selectors):
 
         #policies = policies.replace("array", "np.array")
         #policies = eval(policies)
-    interaction_attributes = ["betas", "alpha_physical"]
+    interaction_attributes = ["betas", "alpha_physical", "engine"]
     for attribute in interaction_attributes:
         assert parameters["interaction"][attribute] == getattr(interaction, attribute)
     for key, value in interaction.contact_matrices.items():
@@ -515,3 +515,35 @@ def test__parameters(dummy_world, selector, selectors):
     assert "Covid19" in parameters["infections"]
     inf_parameters = parameters["infections"]["Covid19"]
     assert inf_parameters["transmission_type"] == selector.transmission_type
+
+
+def test__summarise_workload(tmp_path):
+    record = Record(record_path=tmp_path)
+    workload = InteractionWorkload()
+    for day in range(1, 4):
+        workload.add("household", n_groups=10, n_people=25, n_pairs=40)
+        workload.add("company", n_groups=2, n_skipped=3, n_infections=1)
+        record.summarise_workload(
+            timestamp=datetime.datetime(2020, 3, day), workload=workload
+        )
+        workload.reset()
+    summary = pd.read_csv(tmp_path / record.workload_summary_filename)
+    assert len(summary) == 6
+    assert set(summary["spec"]) == {"household", "company"}
+    assert list(summary["time_stamp"].unique()) == [
+        "2020-03-01",
+        "2020-03-02",
+        "2020-03-03",
+    ]
+    households = summary[summary["spec"] == "household"]
+    assert (households["n_groups"] == 10).all()
+    assert (households["n_pairs"] == 40).all()
+    assert households["n_infections"].sum() == 0
+    companies = summary[summary["spec"] == "company"]
+    assert (companies["n_skipped"] == 3).all()
+    assert companies["n_infections"].sum() == 3
+    record.time_step(timestamp=datetime.datetime(2020, 3, 3))
+    with open_file(record.record_path / record.filename) as f:
+        table = pd.DataFrame.from_records(f.root.workload.read())
+    assert len(table) == 6
+    assert table["n_infections"].sum() == 3
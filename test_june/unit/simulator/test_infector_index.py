@@ -0,0 +1,69 @@
+import datetime
+
+import numpy as np
+
+residence_activities = ["medical_facility", "residence"]
+
+
+def move_people(simulator, activities):
+    simulator.clear_world()
+    simulator.activity_manager.move_people_to_active_subgroups(
+        activities, date=datetime.datetime(2020, 3, 2, 8), days_from_start=1
+    )
+
+
+def test__index_tracks_groups_with_infectors(synthetic_simulator):
+    simulator = synthetic_simulator
+    move_people(simulator, residence_activities)
+    households = simulator.world.households
+    with_infectors = {
+        household.id
+        for household in households
+        if any(person.infection is not None for person in household.people)
+    }
+    assert with_infectors
+    infector_index = simulator.infector_index
+    assert set(infector_index.groups_with_infectors["household"]) == with_infectors
+    simulator.clear_world()
+    assert infector_index.get_groups_with_infectors("household") == []
+
+
+def test__same_infections_as_scanning_all_groups(synthetic_simulator):
+    simulator = synthetic_simulator
+    move_people(simulator, residence_activities)
+    interaction = simulator.interaction
+    households = simulator.world.households
+    groups = simulator._groups_with_infectors(households)
+    assert len(groups) < len(households)
+    state = np.random.get_state()
+    all_infected, _, all_size = interaction.time_step_for_super_group(
+        households, delta_time=8
+    )
+    np.random.set_state(state)
+    infected, _, size = interaction.time_step_for_super_group(
+        households, delta_time=8, groups=groups
+    )
+    assert infected == all_infected
+    assert simulator._count_people(households) == all_size
+    assert size <= all_size
+    simulator.clear_world()
+
+
+def test__people_are_conserved(synthetic_simulator):
+    simulator = synthetic_simulator
+    world = simulator.world
+    move_people(simulator, residence_activities)
+    n_people = 0
+    for super_group in (world.households, world.care_homes, world.hospitals):
+        group_sizes = sum(
+            len(subgroup.people)
+            for group in super_group
+            for subgroup in group.subgroups
+        )
+        assert simulator._count_people(super_group) == group_sizes
+        n_people += group_sizes
+    assert n_people == len(world.people)
+    # do_timestep raises if the people counted in the groups are not conserved
+    for _ in range(4):
+        simulator.do_timestep()
+        next(simulator.timer)
@@ -20,12 +20,14 @@ from june.geography import Geography
 from june.geography import Areas
 from june.hdf5_savers import generate_world_from_hdf5
 from june.groups.travel import Travel
-from june.policy import Policies
+from june.policy import Policies, Quarantine, SchoolQuarantine, SocialDistancing
 from june.interaction import Interaction
 from june.simulator import Simulator
+from june.ensemble import set_random_seed
 from june.epidemiology.epidemiology import Epidemiology
 from june.epidemiology.infection import SymptomTag, TransmissionXNExp, TransmissionGamma
 from june.epidemiology.infection_seed import InfectionSeed
+from june.synthetic_world import generate_synthetic_world
 from june import paths
 
 test_config = paths.configs_path / "tests/test_checkpoint_config.yaml"
@@ -213,3 +215,113 @@ class TestCheckpointForReseeding:
         # clean up
         os.remove(checkpoint_folder / "checkpoint_2020-03-25.hdf5")
         # gotta delete, else it passes any time it should have failed...
+
+
+class TestSnapshot:
+    def test__restore_after_run(self, selectors, test_results):
+        world = create_world()
+        sim = Simulator.from_file(
+            world=world,
+            interaction=Interaction.from_file(config_filename=config_interaction),
+            epidemiology=Epidemiology(infection_selectors=selectors),
+            config_filename=test_config,
+            leisure=None,
+            policies=Policies([]),
+            checkpoint_save_path=test_results / "checkpoint_tests",
+        )
+        seed = InfectionSeed.from_uniform_cases(
+            sim.world,
+            selectors[0],
+            cases_per_capita=50 / len(world.people),
+            date="2020-03-01",
+        )
+        seed.unleash_virus_per_day(time=0, date=pd.to_datetime("2020-03-01"))
+        initial_infected = {
+            person.id: person.infection.start_time
+            for person in world.people.infected
+        }
+        initial_residents = {
+            household.id: household.residents for household in world.households
+        }
+        initial_date = sim.timer.date
+        snapshot = sim.snapshot()
+        sim.run()
+        assert len(world.people.dead) > 0
+        sim.restore(snapshot)
+        assert sim.timer.date == initial_date
+        assert world.people.dead == []
+        assert len(world.cemeteries[0][0].people) == 0
+        assert {
+            person.id: person.infection.start_time
+            for person in world.people.infected
+        } == initial_infected
+        assert set(world.people.infection_table.row_by_id) == set(initial_infected)
+        for person in world.people:
+            assert person.residence is not None
+            assert person.medical_facility is None
+            if person.id not in initial_infected:
+                assert person.immunity.susceptibility_dict == {}
+        for household in world.households:
+            assert household.residents == initial_residents[household.id]
+        # the infections of the snapshot are copies, so it can be restored again
+        sim.run()
+        assert len(world.people.dead) > 0
+        sim.restore(snapshot)
+        assert world.people.dead == []
+        assert len(world.people.infected) == len(initial_infected)
+
+    def test__restore_equals_continue_with_active_policies(
+        self, make_synthetic_simulator
+    ):
+        world = generate_synthetic_world(n_people=2000, seed=5)
+        policies = Policies(
+            [
+                Quarantine(n_days=7, n_days_household=14),
+                SchoolQuarantine(n_days=7),
+                SocialDistancing(
+                    start_time="2020-03-01",
+                    end_time="2020-04-01",
+                    beta_factors={"household": 0.8, "school": 0.5},
+                ),
+            ]
+        )
+        sim = make_synthetic_simulator(world, policies=policies)
+        sim.timer.final_date = sim.timer.initial_date + datetime.timedelta(days=12)
+        seed = InfectionSeed.from_uniform_cases(
+            world,
+            sim.epidemiology.infection_selectors[0],
+            cases_per_capita=0.05,
+            date="2020-03-01",
+        )
+        seed.unleash_virus_per_day(time=0, date=datetime.datetime(2020, 3, 1))
+        sim.run(until=datetime.datetime(2020, 3, 6))
+        # the policies are active, and some households are quarantined already
+        assert any(
+            household.quarantine_starting_date != -99 for household in world.households
+        )
+        snapshot = sim.snapshot()
+        set_random_seed(7)
+
+        def continue_run():
+            sim.run()
+            return (
+                {
+                    person.id: person.infection.start_time
+                    for person in world.people.infected
+                },
+                [person.id for person in world.people.dead],
+                [
+                    household.quarantine_starting_date
+                    for household in world.households
+                ],
+                [
+                    [subgroup.quarantine_starting_date for subgroup in school.subgroups]
+                    for school in world.schools
+                ],
+            )
+
+        continued = continue_run()
+        assert len(continued[0]) > len(snapshot.world.infections)
+        sim.restore(snapshot)
+        set_random_seed(7)
+        assert continue_run() == continued
@@ -3,7 +3,7 @@ from datetime import datetime
 import pytest
 
 from june import paths
-from june.demography import Person, Population
+from june.demography import Person, Population, Activities
 from june.geography import Geography, Area, SuperArea, Areas, SuperAreas
 from june.world import World
 from june.groups import Hospitals, Schools, Companies, CareHomes, Universities
@@ -43,6 +43,7 @@ from june.groups import (
 from june.groups.leisure import leisure, Cinemas, Pubs, Cinema, Pub, Grocery, Groceries
 from june.simulator import Simulator, activity_hierarchy
 from june.world import generate_world_from_geography
+from june.synthetic_world import generate_synthetic_world
 
 constant_config = (
     paths.configs_path
@@ -170,6 +171,27 @@ def test__clear_world(sim: Simulator):
         assert person.busy == False
 
 
+def test__clear_world_only_clears_its_world(synthetic_simulator, make_synthetic_simulator):
+    world = synthetic_simulator.world
+    other_world = generate_synthetic_world(n_people=200, seed=1)
+    other_simulator = make_synthetic_simulator(other_world)
+    for simulator in (synthetic_simulator, other_simulator):
+        simulator.clear_world()
+        simulator.activity_manager.leisure.generate_leisure_probabilities_for_timestep(
+            delta_time=3, working_hours=False, day_type="weekday"
+        )
+        simulator.activity_manager.move_people_to_active_subgroups(
+            ["leisure", "residence"]
+        )
+    assert any(person.leisure is not None for person in world.people)
+    synthetic_simulator.clear_world()
+    leisure_index = Activities.__fields__.index("leisure")
+    for person in world.people:
+        assert not person.busy
+        assert person.iter_subgroups()[leisure_index] is None
+    assert all(person.busy for person in other_world.people)
+
+
 def test__move_to_active_subgroup(sim: Simulator):
     sim.activity_manager.move_to_active_subgroup(
         ["residence"], sim.world.people.members[0]
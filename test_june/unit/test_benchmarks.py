@@ -0,0 +1,65 @@
+import json
+
+from test_june.benchmarks import compare_results
+from test_june.benchmarks.__main__ import main
+from test_june.benchmarks.benchmark import time_case
+
+
+def make_results(median, peak_memory_mb):
+    return {
+        "meta": {},
+        "benchmarks": {
+            "interaction": {"median": median, "peak_memory_mb": peak_memory_mb}
+        },
+    }
+
+
+def test__time_case():
+    calls = []
+    result = time_case(
+        setup=lambda: calls.append("setup"), run=lambda: calls.append("run"), repeat=3
+    )
+    assert calls == ["setup", "run"] * 4
+    assert result["repeat"] == 3
+    assert 0 <= result["min"] <= result["median"]
+    assert result["peak_memory_mb"] >= 0
+
+
+def test__compare_results():
+    baseline = make_results(median=1.0, peak_memory_mb=10.0)
+    assert compare_results(baseline, make_results(1.05, 10.5)) == []
+    regressions = compare_results(baseline, make_results(1.5, 10.0))
+    assert [(r["name"], r["metric"]) for r in regressions] == [
+        ("interaction", "median")
+    ]
+    assert regressions[0]["ratio"] == 1.5
+    regressions = compare_results(baseline, make_results(1.0, 20.0))
+    assert [r["metric"] for r in regressions] == ["peak_memory_mb"]
+    # too fast to compare
+    assert compare_results(make_results(1e-6, 1), make_results(1e-5, 1)) == []
+
+
+def test__run_and_compare(tmp_path):
+    output = tmp_path / "benchmarks.json"
+    args = ["--n_people", "2000", "--repeat", "1", "--only", "leisure", "record"]
+    assert main(args + ["--output", str(output)]) == 0
+    with open(output) as f:
+        results = json.load(f)
+    assert results["meta"]["n_people"] == 2000
+    assert set(results["benchmarks"]) == {
+        "leisure.generate_leisure_probabilities_for_timestep[weekday]",
+        "leisure.generate_leisure_probabilities_for_timestep[weekend]",
+        "record.time_step[10000]",
+        "record.time_step[100000]",
+    }
+    for name in results["benchmarks"]:
+        results["benchmarks"][name]["median"] /= 10
+    with open(tmp_path / "baseline.json", "w") as f:
+        json.dump(results, f)
+    assert (
+        main(
+            args
+            + ["--output", str(output), "--compare", str(tmp_path / "baseline.json")]
+        )
+        == 1
+    )
@@ -0,0 +1,163 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from june import paths
+from june.demography import Person, Population
+from june.ensemble import Branch, BranchRunner, EnsembleRunner, set_random_seed
+from june.epidemiology.epidemiology import Epidemiology
+from june.epidemiology.infection import InfectionSelector, InfectionSelectors
+from june.epidemiology.infection_seed import InfectionSeed
+from june.geography import Area, Areas, Region, Regions, SuperArea, SuperAreas
+from june.groups import Cemeteries, Hospital, Hospitals, Household, Households
+from june.interaction import Interaction
+from june.policy import Policies
+from june.records import Record
+from june.simulator import Simulator
+from june.utils.random_streams import RandomStreams
+from june.world import World
+
+test_config = paths.configs_path / "tests/test_checkpoint_config.yaml"
+config_interaction = paths.configs_path / "tests/interaction.yaml"
+
+
+def test__reseeding_gives_the_same_trajectories(selector):
+    def infect():
+        people = [Person.from_attributes(age=age) for age in range(0, 100, 10)]
+        for person in people:
+            selector.infect_person_at_time(person, time=0)
+        return [
+            (person.infection.symptoms.trajectory, person.infection.time_of_infection)
+            for person in people
+        ]
+
+    set_random_seed(5)
+    trajectories = infect()
+    infect()
+    set_random_seed(5)
+    assert infect() == trajectories
+
+
+class MockSimulator:
+    def __init__(self, world, record):
+        self.world = world
+        self.record = record
+
+    def run(self):
+        # mutating the world in a realization must not leak to the other ones
+        self.world.people[0].age += 1
+        with open(self.record.record_path / "draw.txt", "w") as f:
+            f.write(f"{np.random.random()} {self.world.people[0].age}")
+
+
+def test__ensemble_runner(tmp_path):
+    world = World()
+    world.people = Population([Person.from_attributes(age=30)])
+    runner = EnsembleRunner(
+        world=world,
+        simulator_factory=MockSimulator,
+        record_path=tmp_path,
+        n_processes=2,
+    )
+    results = runner.run(seeds=[1, 2, 3])
+    assert results["n_runs"] == 3
+    assert set(results["run_times"]) == {1, 2, 3}
+    assert results["runs_per_hour"] > 0
+    assert world.people[0].age == 30
+    draws = {}
+    for seed in [1, 2, 3]:
+        with open(tmp_path / f"run_{seed:03d}" / "draw.txt") as f:
+            draw, age = f.read().split()
+        assert age == "31"
+        draws[seed] = float(draw)
+    assert len(set(draws.values())) == 3
+    np.random.seed(1)
+    assert draws[1] == np.random.random()
+
+
+def make_simulator(selectors, record):
+    region = Region(name="London")
+    super_area = SuperArea(name="E02000001", region=region)
+    region.super_areas = [super_area]
+    area = Area(super_area=super_area)
+    super_area.areas = [area]
+    world = World()
+    world.areas = Areas([area], ball_tree=False)
+    world.super_areas = SuperAreas([super_area], ball_tree=False)
+    world.regions = Regions([region])
+    people = []
+    households = []
+    for i in range(10):
+        household = Household(area=area)
+        for _ in range(3):
+            person = Person.from_attributes(age=20 + i)
+            person.area = area
+            area.people.append(person)
+            household.add(person)
+            people.append(person)
+        households.append(household)
+    world.people = Population(people)
+    world.households = Households(households)
+    world.hospitals = Hospitals(
+        [Hospital(n_beds=100, n_icu_beds=100, area=area, coordinates=None)],
+        ball_tree=False,
+    )
+    world.cemeteries = Cemeteries()
+    simulator = Simulator.from_file(
+        world=world,
+        interaction=Interaction.from_file(config_filename=config_interaction),
+        epidemiology=Epidemiology(infection_selectors=selectors),
+        config_filename=test_config,
+        policies=Policies([]),
+        record=record,
+        checkpoint_save_path=record.record_path / "checkpoints",
+    )
+    seed = InfectionSeed.from_uniform_cases(
+        world, selectors[0], cases_per_capita=0.3, date="2020-03-01"
+    )
+    seed.unleash_virus_per_day(time=0, date=pd.to_datetime("2020-03-01"))
+    return simulator
+
+
+def test__branch_runner(selectors, tmp_path):
+    simulator = make_simulator(selectors, Record(record_path=tmp_path / "common"))
+    no_contacts = Interaction.from_file(config_filename=config_interaction)
+    no_contacts.betas = {spec: 0.0 for spec in no_contacts.betas}
+    runner = BranchRunner(simulator, record_path=tmp_path, n_processes=2)
+    results = runner.run(
+        branch_date="2020-03-10",
+        branches=[Branch("baseline"), Branch("no_contacts", interaction=no_contacts)],
+    )
+    assert set(results["branch_times"]) == {"baseline", "no_contacts"}
+    # the parent stays at the branching date
+    assert simulator.timer.date == datetime.datetime(2020, 3, 10)
+    common_summary = pd.read_csv(tmp_path / "common" / "summary.csv")
+    assert common_summary["time_stamp"].max() < "2020-03-10"
+    for name in ["baseline", "no_contacts"]:
+        summary = pd.read_csv(tmp_path / name / "summary.csv")
+        assert summary["time_stamp"].min() >= "2020-03-10"
+        with open(tmp_path / name / "config.yaml") as f:
+            config = yaml.safe_load(f)
+        assert config["scenario_branch"]["date"] == "2020-03-10"
+        assert config["scenario_branch"]["pre_branch_record_path"] == str(
+            tmp_path / "common"
+        )
+    with open(tmp_path / "no_contacts" / "config.yaml") as f:
+        assert set(yaml.safe_load(f)["interaction"]["betas"].values()) == {0.0}
+    no_contacts_summary = pd.read_csv(tmp_path / "no_contacts" / "summary.csv")
+    assert no_contacts_summary["daily_infected"].sum() == 0
+
+
+def test__branch_draws_from_its_interaction_streams(selector, tmp_path):
+    selectors = InfectionSelectors(
+        [InfectionSelector(health_index_generator=selector.health_index_generator)]
+    )
+    simulator = make_simulator(selectors, Record(record_path=tmp_path))
+    interaction = Interaction.from_file(config_filename=config_interaction)
+    interaction.engine = "vectorized"
+    interaction.random_streams = RandomStreams(seed=7)
+    Branch("streams", interaction=interaction).apply(simulator)
+    assert simulator.random_source.streams is interaction.random_streams
+    assert selectors[0].random_source is simulator.random_source
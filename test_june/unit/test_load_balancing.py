@@ -0,0 +1,284 @@
+import datetime
+import json
+
+import pandas as pd
+import pytest
+
+from june.domains import Domain, DomainRebalancer, DomainSplitter, SuperAreaCosts
+from june.epidemiology.infection_seed import InfectionSeed
+from june.event import Events
+from june.geography import Area, SuperArea
+from june.groups import ExternalGroup, Household
+from june.demography import Person
+from june.hdf5_savers import save_world_to_hdf5
+from june.interaction import Interaction
+from june.policy import CloseSchools, Policies, VaccineDistribution
+from june.synthetic_world import SyntheticWorldGenerator
+from june.utils.random_streams import RandomStreams
+
+
+@pytest.fixture(name="super_areas")
+def make_super_areas():
+    return [SuperArea(name=f"E0000000{i}") for i in range(4)]
+
+
+def make_household(super_area, n_people):
+    household = Household(area=Area(super_area=super_area))
+    for _ in range(n_people):
+        household.add(Person.from_attributes())
+    return household
+
+
+class TestSuperAreaCosts:
+    def test__costs_shared_by_size(self, super_areas):
+        costs = SuperAreaCosts()
+        groups = [
+            make_household(super_areas[0], 3),
+            make_household(super_areas[1], 1),
+            ExternalGroup(id=1, spec="household", domain_id=1),
+        ]
+        costs.add(groups, elapsed=2.0)
+        assert costs.costs[super_areas[0].name] == pytest.approx(1.5)
+        assert costs.costs[super_areas[1].name] == pytest.approx(0.5)
+        gathered, super_area_ids = costs.gather(super_areas)
+        assert gathered[super_areas[0].name] == pytest.approx(1.5)
+        # super areas without interaction get the smallest measured cost
+        assert gathered[super_areas[3].name] == pytest.approx(0.5)
+        assert super_area_ids[super_areas[2].name] == super_areas[2].id
+        costs.reset()
+        assert len(costs.costs) == 0
+
+
+def test__splitter_uses_measured_scores(super_areas, tmp_path):
+    names = [super_area.name for super_area in super_areas]
+    centroids_path = tmp_path / "centroids.csv"
+    # 2x2 grid of super areas
+    pd.DataFrame(
+        {"X": [0.0, 0.0, 1.0, 1.0], "Y": [0.0, 1.0, 0.0, 1.0]}, index=names
+    ).to_csv(centroids_path)
+    adjacency_path = tmp_path / "adjacency.json"
+    with open(adjacency_path, "w") as f:
+        adjacency = [[0, 1, 1, 0], [1, 0, 0, 1], [1, 0, 0, 1], [0, 1, 1, 0]]
+        json.dump(dict(zip(names, adjacency)), f)
+    scores = dict(zip(names, [3.0, 1.0, 1.0, 1.0]))
+    domain_splitter = DomainSplitter(
+        number_of_domains=2,
+        super_area_data=scores,
+        super_area_scores=scores,
+        super_area_centroids_path=centroids_path,
+        super_area_adjacency_graph_path=adjacency_path,
+    )
+    assert domain_splitter.super_area_df["score"].to_dict() == scores
+
+
+@pytest.fixture(name="make_simulator")
+def make_simulator_factory(make_synthetic_simulator):
+    def make_simulator(domain, interaction=None, policies=None, events=None):
+        simulator = make_synthetic_simulator(
+            domain, interaction=interaction, policies=policies, events=events
+        )
+        simulator.timer.final_date = simulator.timer.initial_date + datetime.timedelta(
+            days=3
+        )
+        return simulator
+
+    return make_simulator
+
+
+class TestDomainRebalancer:
+    @pytest.fixture(name="world_files", scope="class")
+    def make_world_files(self, tmp_path_factory):
+        tmp_path = tmp_path_factory.mktemp("rebalance")
+        generator = SyntheticWorldGenerator.from_file()
+        generator.geography["areas_per_super_area"] = 5
+        world = generator.generate(n_people=3000, seed=4)
+        paths = {
+            "world_path": tmp_path / "world.hdf5",
+            "super_area_centroids_path": tmp_path / "centroids.csv",
+            "super_area_adjacency_graph_path": tmp_path / "adjacency.json",
+        }
+        save_world_to_hdf5(world, paths["world_path"])
+        generator.save_domain_decomposition_inputs(
+            world,
+            paths["super_area_centroids_path"],
+            paths["super_area_adjacency_graph_path"],
+        )
+        super_areas_to_domain_dict = {
+            super_area.id: 0 for super_area in world.super_areas
+        }
+        return paths, super_areas_to_domain_dict
+
+    def make_seeded_simulator(self, world_files, make_simulator):
+        paths, super_areas_to_domain_dict = world_files
+        domain = Domain.from_hdf5(
+            domain_id=0,
+            super_areas_to_domain_dict=super_areas_to_domain_dict,
+            hdf5_file_path=paths["world_path"],
+        )
+        simulator = make_simulator(domain)
+        seed = InfectionSeed.from_uniform_cases(
+            domain,
+            simulator.epidemiology.infection_selectors[0],
+            cases_per_capita=0.05,
+            date="2020-03-01",
+        )
+        seed.unleash_virus_per_day(time=0, date=pd.to_datetime("2020-03-01"))
+        return simulator
+
+    def test__domain_split_covers_all_super_areas(self, world_files, make_simulator):
+        paths, super_areas_to_domain_dict = world_files
+        simulator = self.make_seeded_simulator(world_files, make_simulator)
+        rebalancer = DomainRebalancer(
+            world_path=paths["world_path"],
+            simulator_factory=make_simulator,
+            super_area_centroids_path=paths["super_area_centroids_path"],
+            super_area_adjacency_graph_path=paths["super_area_adjacency_graph_path"],
+        )
+        simulator.set_rebalancer(rebalancer)
+        simulator.clear_world()
+        simulator.do_timestep()
+        assert rebalancer.generate_domain_split(
+            simulator.super_area_costs, simulator.world.super_areas
+        ) == super_areas_to_domain_dict
+
+    def test__rebalance_at_checkpoint(self, world_files, make_simulator, tmp_path):
+        paths, _ = world_files
+        reference = self.make_seeded_simulator(world_files, make_simulator)
+        reference_dates = []
+        reference_do_timestep = reference.do_timestep
+
+        def do_reference_timestep():
+            reference_dates.append(reference.timer.date)
+            reference_do_timestep()
+
+        reference.do_timestep = do_reference_timestep
+        reference.run()
+
+        simulator = self.make_seeded_simulator(world_files, make_simulator)
+        domain = simulator.world
+        interaction = simulator.interaction
+        checkpoint_date = datetime.date(2020, 3, 2)
+        simulator.checkpoint_save_dates = (checkpoint_date,)
+        simulator.checkpoint_save_path = tmp_path
+        simulator.set_rebalancer(
+            DomainRebalancer(
+                world_path=paths["world_path"],
+                simulator_factory=make_simulator,
+                super_area_centroids_path=paths["super_area_centroids_path"],
+                super_area_adjacency_graph_path=paths[
+                    "super_area_adjacency_graph_path"
+                ],
+            )
+        )
+        dates = []
+        do_timestep = simulator.do_timestep
+
+        def do_timestep_and_log():
+            dates.append(simulator.timer.date)
+            do_timestep()
+
+        simulator.do_timestep = do_timestep_and_log
+        states = []
+        rebalance = simulator.rebalance
+
+        def rebalance_and_compare(saving_date):
+            people = simulator.world.people
+            states.append(
+                ({person.id for person in people}, set(people.infected_ids))
+            )
+            rebalance(saving_date)
+            people = simulator.world.people
+            states.append(
+                ({person.id for person in people}, set(people.infected_ids))
+            )
+
+        simulator.rebalance = rebalance_and_compare
+        simulator.run()
+        assert simulator.world is not domain
+        assert simulator.interaction is interaction
+        assert simulator.activity_manager.world is simulator.world
+        # people and infections are carried over
+        assert len(states) == 2
+        assert states[0] == states[1]
+        assert len(states[1][0]) == len(domain.people)
+        assert states[1][1]
+        # the timer resumes at the start of the next day, and the run finishes
+        assert dates == reference_dates
+        assert datetime.datetime(2020, 3, 3) in dates
+        assert simulator.timer.date == simulator.timer.final_date
+
+
+    def test__rebalance_does_not_change_results(
+        self, world_files, make_simulator, tmp_path
+    ):
+        paths, super_areas_to_domain_dict = world_files
+
+        def make_simulator_with_policies(domain):
+            interaction = Interaction.from_file()
+            interaction.engine = "vectorized"
+            interaction.random_streams = RandomStreams(seed=2)
+            policies = Policies(
+                [
+                    VaccineDistribution(
+                        start_time="2020-03-01",
+                        end_time="2020-03-10",
+                        group_type="0-100",
+                        group_coverage=0.5,
+                        effective_after_first_dose=1,
+                    ),
+                    CloseSchools(
+                        start_time="2020-03-01",
+                        end_time="2020-03-10",
+                        years_to_close="all",
+                    ),
+                ]
+            )
+            return make_simulator(
+                domain, interaction=interaction, policies=policies, events=Events([])
+            )
+
+        def run(rebalance):
+            domain = Domain.from_hdf5(
+                domain_id=0,
+                super_areas_to_domain_dict=super_areas_to_domain_dict,
+                hdf5_file_path=paths["world_path"],
+            )
+            simulator = make_simulator_with_policies(domain)
+            policies = simulator.activity_manager.policies
+            events = simulator.events
+            simulator.epidemiology.infection_selectors[0].infect_people_at_time(
+                [person for person in domain.people if person.id % 20 == 0], time=0
+            )
+            if rebalance:
+                simulator.checkpoint_save_dates = (datetime.date(2020, 3, 2),)
+                simulator.checkpoint_save_path = tmp_path
+                simulator.set_rebalancer(
+                    DomainRebalancer(
+                        world_path=paths["world_path"],
+                        simulator_factory=make_simulator_with_policies,
+                        super_area_centroids_path=paths["super_area_centroids_path"],
+                        super_area_adjacency_graph_path=paths[
+                            "super_area_adjacency_graph_path"
+                        ],
+                    )
+                )
+            simulator.run()
+            assert simulator.activity_manager.policies is policies
+            assert simulator.events is events
+            people = simulator.world.people
+            return (
+                {person.id: person.infection.tag for person in people.infected},
+                {person.id for person in people if person.vaccinated},
+                policies.vaccine_distribution.policies[0].vaccinated_ids,
+                {
+                    person.id: person.immunity.susceptibility_dict.get(0, 1.0)
+                    for person in people
+                },
+            )
+
+        results = run(rebalance=False)
+        rebalanced_results = run(rebalance=True)
+        assert list(tmp_path.glob("checkpoint_*"))
+        # the vaccine campaign and the infections went on during the run
+        assert results[0] and results[1] and results[2]
+        assert rebalanced_results == results
@@ -0,0 +1,142 @@
+import numpy as np
+import pytest
+
+from june.demography import Person
+from june.groups import ExternalGroup, ExternalSubgroup, Pub
+from june.groups.group.interactive import InteractiveGroup
+from june.mpi_setup import (
+    _record_datatype,
+    MovablePeople,
+    ForeignPeople,
+    PendingRecords,
+    move_records,
+    movable_person_dtype,
+    mpi_rank,
+    mpi_size,
+)
+
+
+class MockInfection:
+    class transmission:
+        probability = 0.4
+
+    @classmethod
+    def infection_id(cls):
+        return 7
+
+
+@pytest.fixture(name="movable_people")
+def make_movable_people():
+    movable_people = MovablePeople()
+    pub = ExternalGroup(id=3, spec="pub", domain_id=1)
+    company = ExternalGroup(id=5, spec="company", domain_id=1)
+    infected = Person.from_attributes()
+    infected.infection = MockInfection()
+    susceptible = Person.from_attributes()
+    susceptible.immunity.susceptibility_dict[7] = 0.25
+    susceptible.immunity.susceptibility_dict[8] = 0.5
+    worker = Person.from_attributes()
+    movable_people.add_person(infected, ExternalSubgroup(pub, subgroup_type=0))
+    movable_people.add_person(susceptible, ExternalSubgroup(pub, subgroup_type=0))
+    movable_people.add_person(worker, ExternalSubgroup(company, subgroup_type=1))
+    return movable_people, infected, susceptible, worker
+
+
+class TestMovablePeople:
+    def test__serialise(self, movable_people):
+        movable_people, infected, susceptible, worker = movable_people
+        keys, people, immunities, n_people = movable_people.serialise(1)
+        assert n_people == 3
+        assert people.dtype == movable_person_dtype
+        assert list(keys["spec"]) == [b"pub", b"company"]
+        assert list(keys["n_people"]) == [2, 1]
+        assert list(people["id"]) == [infected.id, susceptible.id, worker.id]
+        assert list(people["inf_id"]) == [7, 0, 0]
+        assert list(people["susc"]) == [False, True, True]
+        assert list(people["n_immunity"]) == [0, 2, 0]
+        assert list(immunities["inf_id"]) == [7, 8]
+        assert list(immunities["susc"]) == [0.25, 0.5]
+        keys, people, immunities, n_people = movable_people.serialise(2)
+        assert n_people == 0
+        assert len(keys) == len(people) == len(immunities) == 0
+
+    def test__update(self, movable_people):
+        movable_people, infected, susceptible, worker = movable_people
+        keys, people, immunities, _ = movable_people.serialise(1)
+        receiver = MovablePeople()
+        receiver.update(1, keys, people, immunities)
+        pub_people = receiver.skinny_in["pub"][3][0]
+        assert isinstance(pub_people, ForeignPeople)
+        assert list(pub_people.ids) == [infected.id, susceptible.id]
+        assert pub_people.has_infectors and pub_people.has_susceptible
+        assert pub_people.susceptibility_dict(0) == {}
+        assert pub_people.susceptibility_dict(1) == {7: 0.25, 8: 0.5}
+        company_people = receiver.skinny_in["company"][5][1]
+        assert list(company_people.ids) == [worker.id]
+        assert not company_people.has_infectors
+        # people from another rank going to the same subgroup are appended
+        receiver.update(2, keys[:1], people[:2], immunities)
+        pub_people = receiver.skinny_in["pub"][3][0]
+        assert len(pub_people) == 4
+        assert pub_people.susceptibility_dict(3) == {7: 0.25, 8: 0.5}
+
+    def test__interactive_group_from_abroad(self, movable_people):
+        movable_people, infected, susceptible, worker = movable_people
+        keys, people, immunities, _ = movable_people.serialise(1)
+        receiver = MovablePeople()
+        receiver.update(1, keys, people, immunities)
+        pub = Pub()
+        local = Person.from_attributes()
+        pub.add(local)
+        interactive_group = InteractiveGroup(pub, receiver.skinny_in["pub"][3])
+        assert interactive_group.infectors_per_infection_per_subgroup[7][0] == {
+            "ids": [infected.id],
+            "trans_probs": [0.4],
+        }
+        assert interactive_group.susceptibles_per_subgroup[0][susceptible.id] == {
+            7: 0.25,
+            8: 0.5,
+        }
+        assert local.id in interactive_group.susceptibles_per_subgroup[0]
+        assert interactive_group.size == 3
+
+
+def test__move_records():
+    records = [np.zeros(0, dtype=movable_person_dtype) for _ in range(mpi_size)]
+    records[mpi_rank] = np.array(
+        [(1, 0.5, 7, False, mpi_rank, True, 0), (2, 0.0, 0, True, mpi_rank, True, 3)],
+        dtype=movable_person_dtype,
+    )
+    received, n_receiving = move_records(records)
+    assert n_receiving == 2
+    assert received[mpi_rank].dtype == movable_person_dtype
+    assert list(received[mpi_rank]["id"]) == [1, 2]
+    assert list(received[mpi_rank]["n_immunity"]) == [0, 3]
+
+
+def test__records_are_counted_in_records():
+    datatype = _record_datatype(movable_person_dtype.itemsize)
+    assert datatype.Get_size() == movable_person_dtype.itemsize
+    assert datatype is _record_datatype(movable_person_dtype.itemsize)
+
+
+def test__pending_records():
+    records = [np.zeros(0, dtype=movable_person_dtype) for _ in range(mpi_size)]
+    records[mpi_rank] = np.array(
+        [(1, 0.5, 7, False, mpi_rank, True, 0)], dtype=movable_person_dtype
+    )
+    pending = PendingRecords(records)
+    assert pending.n_receiving == 1
+    received, n_receiving = pending.wait()
+    assert n_receiving == 1
+    assert list(received[mpi_rank]["id"]) == [1]
+
+
+def test__start_exchange(movable_people):
+    movable_people, infected, susceptible, worker = movable_people
+    # on a single rank nobody is sent, nothing is visited
+    exchange = movable_people.start_exchange()
+    assert exchange.n_people_going_abroad == 0
+    assert exchange.n_people_from_abroad == 0
+    assert not exchange.is_visited(Pub())
+    assert exchange.wait() == {}
@@ -0,0 +1,184 @@
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+import tables
+
+from june.demography import Person
+from june.epidemiology.infection import InfectionSelector
+from june.groups import School, Schools
+from june.hdf5_savers import save_world_to_hdf5
+from june.interaction import Interaction
+from june.synthetic_world import SyntheticWorldGenerator
+from june.ensemble import set_random_seed
+from june.utils.random_streams import RandomSource, RandomStreams, philox4x32
+
+
+def make_school(selector, n_infected_teachers=4):
+    school = School(
+        n_pupils_max=1, age_min=6, age_max=6, coordinates=(1.0, 1.0), sector="primary"
+    )
+    school.add(Person.from_attributes(age=6))
+    for _ in range(n_infected_teachers):
+        teacher = Person.from_attributes(age=40)
+        school.add(teacher, subgroup_type=school.SubgroupType.teachers)
+        selector.infect_person_at_time(teacher, time=0)
+    return school
+
+
+def test__philox_known_answers():
+    # known answer tests of the Random123 library
+    assert philox4x32(0, 0, 0, 0, 0, 0) == (
+        0x6627E8D5,
+        0xE169C58D,
+        0xBC57AC4C,
+        0x9B00DBD8,
+    )
+    assert philox4x32(
+        0x243F6A88, 0x85A308D3, 0x13198A2E, 0x03707344, 0xA4093822, 0x299F31D0
+    ) == (0xD16CFE09, 0x94FDCCEB, 0x5001E420, 0x24126EA1)
+
+
+def test__draws_only_depend_on_their_keys():
+    streams = RandomStreams(seed=3)
+    draws = streams.uniforms(
+        "infection.school",
+        timestep=5,
+        group_ids=[1, 1, 2],
+        person_ids=[10, 11, 10],
+        n_draws=3,
+    )
+    assert draws.shape == (3, 3)
+    assert ((draws >= 0) & (draws < 1)).all()
+    # same keys in another order and batch
+    np.testing.assert_array_equal(
+        streams.uniforms(
+            "infection.school", timestep=5, group_ids=[2], person_ids=[10], n_draws=3
+        )[0],
+        draws[2],
+    )
+    for other in (
+        RandomStreams(seed=4).uniforms("infection.school", 5, [1], [10], 3),
+        streams.uniforms("infection.pub", 5, [1], [10], 3),
+        streams.uniforms("infection.school", 6, [1], [10], 3),
+    ):
+        assert not np.any(other[0] == draws[0])
+    many = streams.uniforms("test", 0, np.zeros(100000), np.arange(100000), 2)
+    np.testing.assert_allclose(many.mean(axis=0), 0.5, atol=0.01)
+
+
+def test__run_seed_changes_the_streams():
+    random_source = RandomSource(RandomStreams(seed=3))
+    draws = random_source.uniforms("test", [1, 2, 3])
+    set_random_seed(1)
+    reseeded = random_source.uniforms("test", [1, 2, 3])
+    assert not np.any(reseeded == draws)
+    set_random_seed(2)
+    assert not np.any(random_source.uniforms("test", [1, 2, 3]) == reseeded)
+    set_random_seed(1)
+    np.testing.assert_array_equal(random_source.uniforms("test", [1, 2, 3]), reseeded)
+
+
+@pytest.mark.parametrize("engine", ["vectorized", "parallel"])
+def test__infections_do_not_depend_on_how_groups_are_split(engine, selector):
+    interaction = Interaction(
+        betas={"school": 1},
+        alpha_physical=1,
+        contact_matrices={
+            "school": {
+                "contacts": [[3, 1], [1, 0]],
+                "proportion_physical": [[0, 0], [0, 0]],
+                "xi": 1.0,
+                "characteristic_time": 24,
+            }
+        },
+        engine=engine,
+        random_streams=RandomStreams(seed=1),
+    )
+    schools = [make_school(selector) for _ in range(200)]
+    super_group = Schools(schools)
+    interaction.timestep = 7
+    infected_ids, _, _ = interaction.time_step_for_super_group(
+        super_group, delta_time=1
+    )
+    assert 0 < len(infected_ids) < len(schools)
+    np.random.seed(0)
+    split_infected_ids = []
+    for groups in (schools[1::2], schools[::2]):
+        split_infected_ids += interaction.time_step_for_super_group(
+            super_group, delta_time=1, groups=groups
+        )[0]
+    assert sorted(split_infected_ids) == sorted(infected_ids)
+    interaction.timestep = 8
+    assert (
+        interaction.time_step_for_super_group(super_group, delta_time=1)[0]
+        != infected_ids
+    )
+
+
+def test__infection_outcomes_do_not_depend_on_earlier_draws(selector, monkeypatch):
+    # gamma transmission, with all its parameters drawn
+    selector = InfectionSelector(
+        health_index_generator=selector.health_index_generator
+    )
+    selector.random_source = RandomSource(RandomStreams(seed=2))
+    selector.random_source.timestep = 3
+    people = [Person.from_attributes(age=40) for _ in range(3)]
+    selector.infect_people_at_time(people, time=0)
+    # infected on their own, after other draws
+    np.random.seed(1)
+    alone = Person.from_attributes(age=40)
+    monkeypatch.setattr(alone, "id", people[1].id)
+    selector.infect_person_at_time(alone, time=0)
+    for attribute in ("max_severity", "trajectory"):
+        assert getattr(alone.infection.symptoms, attribute) == getattr(
+            people[1].infection.symptoms, attribute
+        )
+    for attribute in ("shape", "shift", "scale", "norm"):
+        assert getattr(alone.infection.transmission, attribute) == getattr(
+            people[1].infection.transmission, attribute
+        )
+    assert people[0].infection.symptoms.max_severity != (
+        people[1].infection.symptoms.max_severity
+    )
+
+
+def read_infections(record_path):
+    infections = []
+    for record_file in sorted(record_path.glob("june_record.*.h5")):
+        with tables.open_file(record_file, mode="r") as f:
+            rank_infections = f.root.infections.read()
+        if len(rank_infections) > 0:
+            infections.append(pd.DataFrame.from_records(rank_infections))
+    infections = pd.concat(infections)
+    return infections.sort_values(["timestamp", "infected_ids"]).reset_index(
+        drop=True
+    )
+
+
+@pytest.mark.skipif(shutil.which("mpirun") is None, reason="needs mpirun")
+def test__infections_do_not_depend_on_the_number_of_ranks(tmp_path, run_ranks):
+    generator = SyntheticWorldGenerator.from_file()
+    generator.geography["areas_per_super_area"] = 1
+    world = generator.generate(n_people=3000, seed=4)
+    world_files = [
+        tmp_path / "world.hdf5",
+        tmp_path / "centroids.csv",
+        tmp_path / "adjacency.json",
+    ]
+    save_world_to_hdf5(world, world_files[0])
+    generator.save_domain_decomposition_inputs(world, *world_files[1:])
+    infections = []
+    for n_ranks in (1, 2, 3):
+        run_ranks(
+            n_ranks,
+            world_files,
+            tmp_path / f"ranks_{n_ranks}",
+            days=6,
+            seed=5,
+        )
+        infections.append(read_infections(tmp_path / f"ranks_{n_ranks}"))
+    assert len(infections[0]) > 10
+    for other in infections[1:]:
+        pd.testing.assert_frame_equal(infections[0], other)
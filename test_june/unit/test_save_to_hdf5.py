@@ -3,7 +3,7 @@ import h5py
 import pytest
 from collections import defaultdict
 from itertools import count
-from june.groups.leisure import generate_leisure_for_world, Pubs, Groceries, Cinemas
+from june.groups.leisure import generate_leisure_for_world, Pub, Pubs, Groceries, Cinemas
 from june.demography import Demography, Person, Population
 from june.geography import Geography, Area, SuperArea
 from june.geography.station import CityStation, InterCityStation
@@ -12,6 +12,7 @@ from june.groups import (
     Households,
     Companies,
     Hospitals,
+    School,
     Schools,
     CareHomes,
     Group,
@@ -94,6 +95,37 @@ class TestSavePeople:
                 == person2.mode_of_transport.is_public
             )
 
+    def test__load_domain_population(self, test_results):
+        super_areas = [SuperArea(), SuperArea(), SuperArea()]
+        areas = [Area(super_area=super_area) for super_area in super_areas]
+        people = []
+        for i in range(30):
+            person = Person.from_attributes(age=i)
+            # interleaved on purpose, the saver sorts them by super area
+            person.area = areas[i % 3]
+            people.append(person)
+        save_population_to_hdf5(
+            Population(people), test_results / "test.hdf5", chunk_size=7
+        )
+        with h5py.File(test_results / "test.hdf5", "r") as f:
+            index = f["population"]["super_area_index"]
+            assert list(index["id"][:]) == [sa.id for sa in super_areas]
+            assert list(index["offset"][:]) == [0, 10, 20, 30]
+            first_rows = f["population"]["super_area"][:10]
+            assert list(first_rows) == [super_areas[0].id] * 10
+        domain_super_areas = {super_areas[0].id, super_areas[2].id}
+        pop_recovered = load_population_from_hdf5(
+            test_results / "test.hdf5",
+            chunk_size=4,
+            domain_super_areas=domain_super_areas,
+        )
+        expected = [
+            person.id
+            for person in people
+            if person.area.super_area.id in domain_super_areas
+        ]
+        assert sorted(person.id for person in pop_recovered) == sorted(expected)
+
 
 class TestSaveHouses:
     def test__save_households(self, full_world, test_results):
@@ -183,6 +215,41 @@ class TestSaveSchools:
             assert school.coordinates[0] == school2.coordinates[0]
             assert school.coordinates[1] == school2.coordinates[1]
 
+    def test__load_domain_schools(self, test_results):
+        super_areas = [SuperArea(), SuperArea(), SuperArea()]
+        areas = [Area(super_area=super_area) for super_area in super_areas]
+        # the schools are not reordered, each run of schools in the same super
+        # area gets an entry in the index
+        school_super_areas = [0, 0, 1, 1, 2, 2, 0, 0, 1, 1]
+        schools = Schools(
+            [
+                School(
+                    coordinates=(0.0, float(i)),
+                    n_pupils_max=100,
+                    area=areas[i_super_area],
+                    n_classrooms=2,
+                    years=[5, 6],
+                )
+                for i, i_super_area in enumerate(school_super_areas)
+            ]
+        )
+        save_schools_to_hdf5(schools, test_results / "test.hdf5")
+        with h5py.File(test_results / "test.hdf5", "r") as f:
+            index = f["schools"]["super_area_index"]
+            assert list(index["id"][:]) == [
+                super_areas[i].id for i in [0, 1, 2, 0, 1]
+            ]
+            assert list(index["offset"][:]) == [0, 2, 4, 6, 8, 10]
+        domain_super_areas = {super_areas[0].id, super_areas[2].id}
+        schools_recovered = load_schools_from_hdf5(
+            test_results / "test.hdf5",
+            chunk_size=1,
+            domain_super_areas=domain_super_areas,
+        )
+        assert [school.id for school in schools_recovered] == [
+            schools[i].id for i in [0, 1, 4, 5, 6, 7]
+        ]
+
 
 class TestSaveCarehomes:
     def test__save_carehomes(self, full_world, test_results):
@@ -343,6 +410,29 @@ class TestSaveLeisure:
                 assert sv1.coordinates[1] == sv2.coordinates[1]
                 assert sv1.id == sv2.id
 
+    def test__load_domain_social_venues(self, test_results):
+        super_area = SuperArea()
+        areas = [Area(super_area=super_area) for _ in range(3)]
+        pubs = []
+        for i in range(9):
+            pub = Pub()
+            pub.coordinates = np.array([0.0, float(i)])
+            pub.area = areas[i // 3]
+            pubs.append(pub)
+        save_social_venues_to_hdf5(
+            social_venues_list=[Pubs(pubs)], file_path=test_results / "test.hdf5"
+        )
+        with h5py.File(test_results / "test.hdf5", "r") as f:
+            index = f["social_venues"]["pubs"]["area_index"]
+            assert list(index["id"][:]) == [area.id for area in areas]
+            assert list(index["offset"][:]) == [0, 3, 6, 9]
+        social_venues_dict = load_social_venues_from_hdf5(
+            test_results / "test.hdf5", domain_areas={areas[0].id, areas[2].id}
+        )
+        assert [pub.id for pub in social_venues_dict["pubs"]] == [
+            pubs[i].id for i in [0, 1, 2, 6, 7, 8]
+        ]
+
 
 class TestSaveWorld:
     @fixture(name="full_world_loaded", scope="module")
@@ -0,0 +1,85 @@
+import json
+import shutil
+
+import pandas as pd
+import pytest
+
+from test_june.benchmarks.scaling import run_scaling, scaling_table, summarise_run
+
+
+def write_run(path, run_times, spans):
+    path.mkdir()
+    with open(path / "ranks.json", "w") as f:
+        json.dump(
+            [
+                {"rank": rank, "n_people": 100, "run_time": run_time}
+                for rank, run_time in enumerate(run_times)
+            ],
+            f,
+        )
+    for rank in range(len(run_times)):
+        pd.DataFrame(
+            [
+                {
+                    "rank": rank,
+                    "date": "2020-03-01",
+                    "name": name,
+                    "category": "mpi",
+                    "start": 0.0,
+                    "duration": duration,
+                }
+                for name, duration in spans[rank]
+            ],
+            columns=["rank", "date", "name", "category", "start", "duration"],
+        ).to_csv(path / f"trace.{rank}.csv", index=False)
+
+
+def test__summarise_run(tmp_path):
+    write_run(
+        tmp_path / "run",
+        run_times=[10.0, 8.0],
+        spans=[
+            [("people_comms", 1.0), ("people_comms", 1.0), ("interaction_waiting", 0)],
+            [("infection_comms", 2.0), ("interaction_waiting", 2.0)],
+        ],
+    )
+    summary = summarise_run(tmp_path / "run")
+    assert summary["n_ranks"] == 2
+    assert summary["n_people"] == 200
+    assert summary["wall_time"] == 10.0
+    assert summary["people_comms_max"] == 2.0
+    assert summary["comm_fraction"] == pytest.approx((2 / 10 + 2 / 8) / 2)
+    assert summary["wait_fraction"] == pytest.approx((0 + 2 / 8) / 2)
+    # compute times are 8 and 4
+    assert summary["imbalance"] == pytest.approx(8 / 6)
+
+
+def test__scaling_table():
+    summaries = [
+        {"n_ranks": 4, "n_people": 4, "wall_time": 5.0},
+        {"n_ranks": 1, "n_people": 1, "wall_time": 10.0},
+    ]
+    for column in ["comm_fraction", "wait_fraction", "imbalance"]:
+        for summary in summaries:
+            summary[column] = 0.0
+    strong = scaling_table(summaries, mode="strong")
+    assert list(strong["n_ranks"]) == [1, 4]
+    assert list(strong["speedup"]) == [1, 2]
+    assert list(strong["efficiency"]) == [1, 0.5]
+    weak = scaling_table(summaries, mode="weak")
+    assert list(weak["efficiency"]) == [1, 2]
+    assert list(weak["speedup"]) == [1, 8]
+
+
+@pytest.mark.skipif(shutil.which("mpirun") is None, reason="needs mpirun")
+def test__run_scaling(tmp_path, monkeypatch):
+    monkeypatch.setenv("OMPI_ALLOW_RUN_AS_ROOT", "1")
+    monkeypatch.setenv("OMPI_ALLOW_RUN_AS_ROOT_CONFIRM", "1")
+    table = run_scaling(
+        mode="weak", ranks=[1], n_people=3000, output_path=tmp_path, days=1
+    )
+    assert list(table["n_ranks"]) == [1]
+    assert table["n_people"][0] == 3000
+    assert table["efficiency"][0] == 1
+    assert table["interaction.households_max"][0] > 0
+    assert (tmp_path / "scaling_weak.csv").exists()
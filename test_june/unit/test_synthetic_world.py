@@ -0,0 +1,117 @@
+from collections import Counter
+
+import pytest
+
+from june.domains import Domain, DomainSplitter
+from june.hdf5_savers import generate_world_from_hdf5, save_world_to_hdf5
+from june.synthetic_world import SyntheticWorldGenerator
+
+
+@pytest.fixture(name="generator", scope="module")
+def make_generator():
+    return SyntheticWorldGenerator.from_file()
+
+
+@pytest.fixture(name="synthetic_world", scope="module")
+def make_world(generator):
+    return generator.generate(n_people=20000, seed=1)
+
+
+class TestSyntheticWorld:
+    def test__geography(self, synthetic_world):
+        assert len(synthetic_world.people) == 20000
+        assert len(synthetic_world.areas) == 67
+        assert len(synthetic_world.super_areas) == 3
+        assert sum(len(area.people) for area in synthetic_world.areas) == 20000
+        for super_area in synthetic_world.super_areas:
+            assert super_area.region is synthetic_world.regions[0]
+
+    def test__everyone_has_a_residence(self, synthetic_world):
+        residences = Counter(
+            person.residence.group.spec for person in synthetic_world.people
+        )
+        assert set(residences) == {"household", "care_home"}
+        for care_home in synthetic_world.care_homes:
+            assert all(person.age >= 75 for person in care_home.residents)
+        for household in synthetic_world.households:
+            assert 0 < household.size <= household.max_size
+        mean_size = residences["household"] / len(synthetic_world.households)
+        assert 2 < mean_size < 3
+
+    def test__primary_activities(self, synthetic_world):
+        for person in synthetic_world.people:
+            if 4 <= person.age < 18:
+                assert person.primary_activity.group.spec == "school"
+            elif person.age >= 65:
+                assert person.primary_activity is None
+        workers = [person for person in synthetic_world.people if person.work_super_area]
+        assert 0.6 < len(workers) / sum(
+            18 <= person.age < 65 for person in synthetic_world.people
+        ) < 0.8
+        for person in workers:
+            assert person in person.work_super_area.workers
+        specs = Counter(person.primary_activity.group.spec for person in workers)
+        assert set(specs) == {"company", "school", "care_home", "hospital"}
+        for school in synthetic_world.schools:
+            assert school.n_teachers > 0
+            assert school.n_pupils == school.n_pupils_max
+
+    def test__social_venues(self, synthetic_world):
+        for spec in ["pubs", "groceries", "cinemas", "gyms"]:
+            assert len(getattr(synthetic_world, spec)) > 0
+        for area in synthetic_world.areas:
+            assert len(area.social_venues["pub"]) == 5
+            assert len(area.social_venues["cinema"]) == 1
+
+    def test__same_seed_same_world(self, generator):
+        world_1 = generator.generate(n_people=2000, seed=3)
+        world_2 = generator.generate(n_people=2000, seed=3)
+        assert [person.age for person in world_1.people] == [
+            person.age for person in world_2.people
+        ]
+        assert [household.size for household in world_1.households] == [
+            household.size for household in world_2.households
+        ]
+
+
+def test__save_load_and_split(tmp_path):
+    generator = SyntheticWorldGenerator.from_file()
+    # small super areas, so that there are enough of them to split
+    generator.geography["areas_per_super_area"] = 5
+    synthetic_world = generator.generate(n_people=10000, seed=2)
+    world_path = tmp_path / "synthetic_world.hdf5"
+    centroids_path = tmp_path / "centroids.csv"
+    adjacency_path = tmp_path / "adjacency.json"
+    save_world_to_hdf5(synthetic_world, world_path)
+    generator.save_domain_decomposition_inputs(
+        synthetic_world, centroids_path, adjacency_path
+    )
+    world = generate_world_from_hdf5(world_path)
+    assert len(world.people) == len(synthetic_world.people)
+    assert len(world.households) == len(synthetic_world.households)
+    assert len(world.companies) == len(synthetic_world.companies)
+    assert len(world.pubs) == len(synthetic_world.pubs)
+    super_areas_per_domain, _ = DomainSplitter.generate_world_split(
+        number_of_domains=2,
+        world_path=world_path,
+        super_area_centroids_path=centroids_path,
+        super_area_adjacency_graph_path=adjacency_path,
+    )
+    super_area_name_to_id = {
+        super_area.name: super_area.id for super_area in synthetic_world.super_areas
+    }
+    super_areas_to_domain_dict = {
+        super_area_name_to_id[name]: domain_id
+        for domain_id, names in super_areas_per_domain.items()
+        for name in names
+    }
+    assert len(super_areas_to_domain_dict) == len(synthetic_world.super_areas)
+    n_people = 0
+    for domain_id in range(2):
+        domain = Domain.from_hdf5(
+            domain_id=domain_id,
+            super_areas_to_domain_dict=super_areas_to_domain_dict,
+            hdf5_file_path=world_path,
+        )
+        n_people += len(domain.people)
+    assert n_people == len(synthetic_world.people)
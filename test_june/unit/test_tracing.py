@@ -0,0 +1,43 @@
+import csv
+import json
+
+from june.utils.tracing import Tracer, _null_span
+
+
+def test__disabled_tracer_records_nothing():
+    tracer = Tracer()
+    assert tracer.span("move_people") is _null_span
+    with tracer.span("move_people"):
+        pass
+    assert tracer.spans == []
+
+
+def test__trace_files(tmp_path):
+    tracer = Tracer()
+    tracer.start(tmp_path)
+    tracer.set_date("2020-03-01 00:00:00")
+    with tracer.span("move_people"):
+        with tracer.span("people_comms", category="mpi", n_people=3):
+            pass
+    tracer.stop()
+    with tracer.span("clear_world"):
+        pass
+    assert [span[0] for span in tracer.spans] == ["people_comms", "move_people"]
+    tracer.save()
+    with open(tmp_path / "trace.0.csv") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["name"] for row in rows] == ["people_comms", "move_people"]
+    assert rows[0]["category"] == "mpi"
+    assert rows[0]["date"] == "2020-03-01 00:00:00"
+    assert float(rows[1]["duration"]) >= float(rows[0]["duration"])
+    with open(tmp_path / "trace.json") as f:
+        events = json.load(f)["traceEvents"]
+    assert events[0]["ph"] == "M"
+    comms = events[1]
+    assert comms["ph"] == "X"
+    assert comms["pid"] == 0
+    assert comms["args"] == {"n_people": 3, "date": "2020-03-01 00:00:00"}
+    # the inner span lies within the outer one
+    move_people = events[2]
+    assert move_people["ts"] <= comms["ts"]
+    assert comms["ts"] + comms["dur"] <= move_people["ts"] + move_people["dur"]